@@ -1,4 +1,18 @@
 from .config import Config
-from .game import Game
 
-__all__ = ["Config", "Game"]
+__all__ = ["Config", "Game", "HeadlessSim", "Command"]
+
+_LAZY = {
+    "Game": ".game",
+    "HeadlessSim": ".headless",
+    "Command": ".headless",
+}
+
+
+def __getattr__(name):
+    # Resolved on first access: Game pulls in pygame, and importing submodules
+    # here would keep `python -m Simulation.<module>` from running cleanly.
+    if name in _LAZY:
+        from importlib import import_module
+        return getattr(import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1 @@
+"""Force-based (rigid-body) variant of the simulation and its batched/multi-body backends."""
@@ -0,0 +1,353 @@
+"""Batched rigid-body backend: N robot/target pairs from phys_sim stepped with NumPy.
+
+Each slot mirrors one `phys_sim.Robot.update` (controller, stun, drag, semi-implicit
+Euler, optional swept contacts, wall impulses, robot-target impulse, FSM) on contiguous arrays. Controller
+gains and FMAX are per-slot arrays so a whole gain grid can run as one batch.
+"""
+import argparse
+
+import numpy as np
+
+from .phys_sim import Config, Robot, Target
+
+ORBIT, INWARD, OUTWARD = 0, 1, 2
+STATE_NAMES = ("ORBIT", "INWARD", "OUTWARD")
+STATE_CODES = {name: code for code, name in enumerate(STATE_NAMES)}
+
+def norm(ax: np.ndarray, ay: np.ndarray):
+    """Vector form of phys_sim.norm: ((ux, uy), length) with (1, 0) for degenerate vectors."""
+    d = np.hypot(ax, ay)
+    ok = d > 1e-9
+    ds = np.where(ok, d, 1.0)
+    return (np.where(ok, ax / ds, 1.0), np.where(ok, ay / ds, 0.0)), np.where(ok, d, 0.0)
+
+def clamp_mag(Fx: np.ndarray, Fy: np.ndarray, Fmax):
+    mag = np.hypot(Fx, Fy)
+    k = np.where(mag > Fmax, Fmax / np.where(mag > 0, mag, 1.0), 1.0)
+    return Fx * k, Fy * k
+
+class BatchPhysics:
+    """N independent robot/target pairs held as parallel arrays."""
+
+    def __init__(self, cfg: Config, n: int):
+        if cfg.INTEGRATOR != "euler":
+            raise ValueError("BatchPhysics implements the semi-implicit Euler step only")
+        self.cfg = cfg
+        self.n = n
+        cx, cy = cfg.WIDTH * 0.5, cfg.HEIGHT * 0.5
+
+        # Robot bodies
+        self.x = np.full(n, cx + cfg.ORBIT_RADIUS)
+        self.y = np.full(n, cy)
+        self.vx = np.zeros(n)
+        self.vy = np.full(n, (cfg.TANGENTIAL_SPEED / cfg.ORBIT_RADIUS) * cfg.ORBIT_RADIUS)
+        self.m = np.ones(n)
+        self.r = np.full(n, float(cfg.DOT_RADIUS))
+
+        # Target bodies (kinematic, but collisions still push them like phys_sim does)
+        self.tx = np.full(n, cx)
+        self.ty = np.full(n, cy)
+        self.tvx = np.zeros(n)
+        self.tvy = np.zeros(n)
+        self.tm = np.full(n, 9999.0)
+        self.tr = np.full(n, cfg.DOT_RADIUS + 2.0)
+
+        self.state = np.full(n, ORBIT, dtype=np.int8)
+        self.orbit_dir = np.ones(n, dtype=np.int8)
+        self.stun = np.zeros(n)
+        self.dives = np.zeros(n, dtype=np.int64)
+
+        # Per-slot controller gains for gain studies
+        self.k_pr = np.full(n, cfg.K_PR)
+        self.k_dr = np.full(n, cfg.K_DR)
+        self.k_pt = np.full(n, cfg.K_PT)
+        self.fmax = np.full(n, cfg.FMAX)
+
+        # Contacts reported by the last step
+        self.hit_wall = np.zeros(n, dtype=bool)
+        self.hit_target = np.zeros(n, dtype=bool)
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        m = self.cfg.SAFETY_MARGIN
+        return m, self.cfg.WIDTH - m, m, self.cfg.HEIGHT - m
+
+    # ---- commands ----
+    def command_dive(self, mask: np.ndarray):
+        go = mask & (self.state == ORBIT)
+        self.state[go] = INWARD
+        self.dives += go
+
+    def flip_orbit(self, mask: np.ndarray):
+        self.orbit_dir[mask] *= -1
+
+    def step_targets(self, dt: float, ix: np.ndarray, iy: np.ndarray):
+        """Vector form of Target.step."""
+        left, right, top, bottom = self.bounds
+        np.clip(self.tx + ix * self.cfg.TARGET_SPEED * dt, left, right, out=self.tx)
+        np.clip(self.ty + iy * self.cfg.TARGET_SPEED * dt, top, bottom, out=self.ty)
+
+    # ---- scalar interop ----
+    def load_robot(self, i: int, robot: Robot):
+        b, t = robot.body, robot.target.body
+        self.x[i], self.y[i], self.vx[i], self.vy[i], self.m[i], self.r[i] = b.x, b.y, b.vx, b.vy, b.m, b.r
+        self.tx[i], self.ty[i], self.tvx[i], self.tvy[i], self.tm[i], self.tr[i] = t.x, t.y, t.vx, t.vy, t.m, t.r
+        self.state[i] = STATE_CODES[robot.state]
+        self.orbit_dir[i] = robot.orbit_dir
+        self.stun[i] = robot.stun
+        self.dives[i] = robot.dives
+
+    def store_robot(self, i: int, robot: Robot):
+        b, t = robot.body, robot.target.body
+        b.x, b.y, b.vx, b.vy = float(self.x[i]), float(self.y[i]), float(self.vx[i]), float(self.vy[i])
+        t.x, t.y, t.vx, t.vy = float(self.tx[i]), float(self.ty[i]), float(self.tvx[i]), float(self.tvy[i])
+        robot.state = STATE_NAMES[self.state[i]]
+        robot.orbit_dir = int(self.orbit_dir[i])
+        robot.stun = float(self.stun[i])
+        robot.dives = int(self.dives[i])
+
+    def load_snapshot(self, snap: tuple, slots=slice(None)):
+        """Broadcast one Robot.snapshot() into `slots` (all by default)."""
+        (self.x[slots], self.y[slots], self.vx[slots], self.vy[slots],
+         self.tx[slots], self.ty[slots], self.tvx[slots], self.tvy[slots],
+         state, self.orbit_dir[slots], self.stun[slots], self.dives[slots], _) = snap
+        self.state[slots] = STATE_CODES[state]
+
+    # ---- physics ----
+    def orbit_dive_force(self):
+        """Vector form of phys_sim.orbit_dive_force (feedforward on)."""
+        cfg = self.cfg
+        (erx, ery), dist = norm(self.x - self.tx, self.y - self.ty)
+        ccw = self.orbit_dir >= 0
+        etx = np.where(ccw, -ery, ery)
+        ety = np.where(ccw, erx, -erx)
+
+        v_r = self.vx * erx + self.vy * ery
+        v_t = self.vx * etx + self.vy * ety
+
+        inward = self.state == INWARD
+        R_des = np.where(inward, 0.0, cfg.ORBIT_RADIUS)
+        v_t_set = np.where(inward, 0.0, cfg.TANGENTIAL_SPEED)
+
+        Fr = -self.k_pr * (dist - R_des) - self.k_dr * v_r
+        Ft = -self.k_pt * (v_t - v_t_set)
+        use_ff = (dist > 1e-3) & ~inward
+        Fff = np.where(use_ff, -(v_t_set ** 2) / np.where(use_ff, dist, 1.0), 0.0)
+
+        Fx = (Fr + Fff) * erx + Ft * etx
+        Fy = (Fr + Fff) * ery + Ft * ety
+        return clamp_mag(Fx, Fy, self.fmax)
+
+    def _wall(self, p, vn, vt, bound: float, side: float, hit):
+        """One wall of resolve_wall_collision along an axis; side=+1 for the low wall, -1 for the high one.
+
+        p/vn are the position and velocity along the wall normal's axis, vt the other velocity component.
+        """
+        cfg = self.cfg
+        pen = side * (bound - p) + self.r
+        touching = pen > 0
+        vrel_n = side * vn
+        impact = touching & (vrel_n < 0)
+        j = -(1 + cfg.RESTITUTION) * vrel_n * self.m
+        vn = np.where(impact, vn + side * (j / self.m), vn)
+        lim = cfg.FRICTION * np.abs(j)
+        jt = np.clip(-vt * self.m, -lim, lim)
+        vt = np.where(impact, vt + jt / self.m, vt)
+        p = np.where(touching, p + side * cfg.BETA * np.maximum(pen - cfg.SLOP, 0.0), p)
+        return p, vn, vt, hit | impact
+
+    def resolve_wall_collision(self):
+        left, right, top, bottom = self.bounds
+        hit = np.zeros(self.n, dtype=bool)
+        self.x, self.vx, self.vy, hit = self._wall(self.x, self.vx, self.vy, left, 1.0, hit)
+        self.x, self.vx, self.vy, hit = self._wall(self.x, self.vx, self.vy, right, -1.0, hit)
+        self.y, self.vy, self.vx, hit = self._wall(self.y, self.vy, self.vx, top, 1.0, hit)
+        self.y, self.vy, self.vx, hit = self._wall(self.y, self.vy, self.vx, bottom, -1.0, hit)
+        return hit
+
+    def resolve_dynamic_collision(self):
+        """Robot (a) against its target (b), as phys_sim.resolve_dynamic_collision."""
+        cfg = self.cfg
+        (nx, ny), dist = norm(self.x - self.tx, self.y - self.ty)
+        pen = (self.r + self.tr) - dist
+        touching = pen > 0
+
+        rvx, rvy = self.vx - self.tvx, self.vy - self.tvy
+        vrel_n = rvx * nx + rvy * ny
+        invM = 1.0 / self.m + 1.0 / self.tm
+        impact = touching & (vrel_n < 0)
+
+        j = np.where(impact, -(1.0 + cfg.RESTITUTION) * vrel_n / invM, 0.0)
+        tnx, tny = -ny, nx
+        vrel_t = rvx * tnx + rvy * tny
+        lim = cfg.FRICTION * np.abs(j)
+        jt = np.where(impact, np.clip(-vrel_t / invM, -lim, lim), 0.0)
+
+        self.vx = self.vx + (j / self.m) * nx + (jt / self.m) * tnx
+        self.vy = self.vy + (j / self.m) * ny + (jt / self.m) * tny
+        self.tvx = self.tvx - (j / self.tm) * nx - (jt / self.tm) * tnx
+        self.tvy = self.tvy - (j / self.tm) * ny - (jt / self.tm) * tny
+
+        corr = np.where(touching, cfg.BETA * np.maximum(pen - cfg.SLOP, 0.0) / invM, 0.0)
+        self.x = self.x + (corr / self.m) * nx
+        self.y = self.y + (corr / self.m) * ny
+        self.tx = self.tx - (corr / self.tm) * nx
+        self.ty = self.ty - (corr / self.tm) * ny
+        return impact
+
+    def sweep(self, dt: float):
+        """Vector form of Robot.sweep: move by dt, stopping at each time of impact to apply its impulse."""
+        cfg = self.cfg
+        left, right, top, bottom = self.bounds
+        e, mu = cfg.RESTITUTION, cfg.FRICTION
+        remaining = np.full(self.n, dt)
+        hit_wall = np.zeros(self.n, dtype=bool)
+        hit_target = np.zeros(self.n, dtype=bool)
+        for _ in range(cfg.MAX_SUBSTEPS):
+            # walls, first one wins on ties (as phys_sim.wall_toi)
+            toi = np.full(self.n, np.inf)
+            wnx = np.zeros(self.n)
+            wny = np.zeros(self.n)
+            for gap, v, nx, ny in ((self.x - self.r - left, -self.vx, 1.0, 0.0),
+                                   (right - self.x - self.r, self.vx, -1.0, 0.0),
+                                   (self.y - self.r - top, -self.vy, 0.0, 1.0),
+                                   (bottom - self.y - self.r, self.vy, 0.0, -1.0)):
+                ok = (gap >= 0) & (v > 0)
+                t = np.where(ok, gap / np.where(ok, v, 1.0), np.inf)
+                take = (t <= remaining) & (t < toi)
+                toi = np.where(take, t, toi)
+                wnx = np.where(take, nx, wnx)
+                wny = np.where(take, ny, wny)
+
+            # own target (phys_sim.circle_toi)
+            px, py = self.x - self.tx, self.y - self.ty
+            rr = self.r + self.tr
+            c = px * px + py * py - rr * rr
+            pv = px * self.vx + py * self.vy
+            vv = self.vx * self.vx + self.vy * self.vy
+            disc = pv * pv - vv * c
+            ok = (c > 0) & (pv < 0) & (disc >= 0)
+            tt = np.where(ok, (-pv - np.sqrt(np.where(ok, disc, 0.0))) / np.where(ok, vv, 1.0), np.inf)
+            on_target = ok & (tt <= remaining) & (tt < toi)
+            toi = np.where(on_target, tt, toi)
+            impact = np.isfinite(toi)
+            if not impact.any():
+                break
+            s = np.where(impact, toi, 0.0)
+            nx = np.where(on_target, (px + self.vx * tt) / rr, wnx)
+            ny = np.where(on_target, (py + self.vy * tt) / rr, wny)
+            self.x = self.x + self.vx * s
+            self.y = self.y + self.vy * s
+            remaining = remaining - s
+
+            # target impulse (phys_sim.contact_impulse)
+            rvx, rvy = self.vx - self.tvx, self.vy - self.tvy
+            vrel_n = rvx * nx + rvy * ny
+            on_t = on_target & (vrel_n < 0)
+            invM = 1.0 / self.m + 1.0 / self.tm
+            j = np.where(on_t, -(1.0 + e) * vrel_n / invM, 0.0)
+            tnx, tny = -ny, nx
+            lim = mu * np.abs(j)
+            jt = np.where(on_t, np.clip(-(rvx * tnx + rvy * tny) / invM, -lim, lim), 0.0)
+            vx = np.where(on_t, self.vx + (j / self.m) * nx, self.vx)
+            vy = np.where(on_t, self.vy + (j / self.m) * ny, self.vy)
+            self.tvx = np.where(on_t, self.tvx - (j / self.tm) * nx, self.tvx)
+            self.tvy = np.where(on_t, self.tvy - (j / self.tm) * ny, self.tvy)
+            vx = np.where(on_t, vx + (jt / self.m) * tnx, vx)
+            vy = np.where(on_t, vy + (jt / self.m) * tny, vy)
+            self.tvx = np.where(on_t, self.tvx - (jt / self.tm) * tnx, self.tvx)
+            self.tvy = np.where(on_t, self.tvy - (jt / self.tm) * tny, self.tvy)
+            hit_target |= on_t
+
+            # wall impulse (phys_sim.wall_impulse)
+            vrel_n = vx * nx + vy * ny
+            on_w = impact & ~on_target & (vrel_n < 0)
+            j = -(1 + e) * vrel_n * self.m
+            vx = np.where(on_w, vx + (j / self.m) * nx, vx)
+            vy = np.where(on_w, vy + (j / self.m) * ny, vy)
+            lim = mu * np.abs(j)
+            jt = np.clip(-(vx * tnx + vy * tny) * self.m, -lim, lim)
+            self.vx = np.where(on_w, vx + (jt / self.m) * tnx, vx)
+            self.vy = np.where(on_w, vy + (jt / self.m) * tny, vy)
+            hit_wall |= on_w
+        self.x = self.x + self.vx * remaining
+        self.y = self.y + self.vy * remaining
+        return hit_wall, hit_target
+
+    def step(self, dt: float):
+        cfg = self.cfg
+        Fx, Fy = self.orbit_dive_force()
+        stunned = self.stun > 0
+        scale = np.where(stunned, cfg.STUN_FORCE_SCALE, 1.0)
+        Fx, Fy = Fx * scale, Fy * scale
+        self.stun = np.where(stunned, np.maximum(0.0, self.stun - dt), self.stun)
+
+        Fx += -cfg.DRAG * self.vx
+        Fy += -cfg.DRAG * self.vy
+
+        self.vx = self.vx + (Fx / self.m) * dt
+        self.vy = self.vy + (Fy / self.m) * dt
+        if cfg.CCD:
+            swept_wall, swept_target = self.sweep(dt)
+        else:
+            self.x = self.x + self.vx * dt
+            self.y = self.y + self.vy * dt
+            swept_wall = swept_target = False
+
+        self.hit_wall = self.resolve_wall_collision() | swept_wall
+        self.hit_target = self.resolve_dynamic_collision() | swept_target
+        self.stun = np.where(self.hit_wall | self.hit_target, cfg.STUN_TIME, self.stun)
+
+        (erx, ery), r_now = norm(self.x - self.tx, self.y - self.ty)
+        inward = self.state == INWARD
+        outward = self.state == OUTWARD
+        self.state[inward & (r_now <= 4.0)] = OUTWARD
+        self.state[outward & (r_now >= cfg.ORBIT_RADIUS - cfg.EPS)] = ORBIT
+
+        etx, ety = -ery, erx  # CCW tangent
+        vt_cw = self.vx * (-etx) + self.vy * (-ety)
+        vt_ccw = self.vx * etx + self.vy * ety
+        self.orbit_dir = np.where(vt_ccw >= vt_cw, 1, -1).astype(np.int8)
+
+def max_deviation(cfg: Config, n: int = 64, steps: int = 2000, seed: int = 0, dt: float | None = None) -> float:
+    """Step N scalar robots and the batch on the same random inputs; return the largest position error."""
+    rng = np.random.default_rng(seed)
+    dt = dt if dt is not None else cfg.PHYSICS_DT
+    robots = [Robot(cfg, Target(cfg)) for _ in range(n)]
+    batch = BatchPhysics(cfg, n)
+    ix = np.zeros(n)
+    iy = np.zeros(n)
+    worst = 0.0
+    for k in range(steps):
+        if k % 30 == 0:
+            ix = rng.integers(-1, 2, n).astype(float)
+            iy = rng.integers(-1, 2, n).astype(float)
+        dive = rng.random(n) < 0.01
+        batch.command_dive(dive)
+        batch.step_targets(dt, ix, iy)
+        batch.step(dt)
+        for i, robot in enumerate(robots):
+            if dive[i]:
+                robot.command_dive()
+            robot.target.step(dt, ix[i], iy[i])
+            robot.update(dt)
+        x = np.array([rb.body.x for rb in robots])
+        y = np.array([rb.body.y for rb in robots])
+        worst = max(worst, float(np.max(np.hypot(x - batch.x, y - batch.y))))
+        for i, robot in enumerate(robots):
+            batch.load_robot(i, robot)
+    return worst
+
+def main():
+    ap = argparse.ArgumentParser(description="Check the batched physics backend against phys_sim.Robot.")
+    ap.add_argument("--robots", type=int, default=64)
+    ap.add_argument("--steps", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--dt", type=float, default=None)
+    ap.add_argument("--ccd", action="store_true", help="swept contacts (Config.CCD)")
+    args = ap.parse_args()
+    err = max_deviation(Config(CCD=args.ccd), args.robots, args.steps, args.seed, args.dt)
+    print(f"max |batch - scalar| position error: {err:.3e} px")
+
+if __name__ == "__main__":
+    main()
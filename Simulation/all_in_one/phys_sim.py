@@ -1,6 +1,11 @@
-import sys, math, pygame
+import sys, math
 from dataclasses import dataclass
 
+try:
+    import pygame
+except ImportError:  # headless users (batch backends, sweeps) only need the physics below
+    pygame = None
+
 # ========== Config & utils ==========
 
 @dataclass
@@ -9,6 +14,10 @@ class Config:
     HEIGHT: int = 650
     FPS: int = 60
 
+    PHYSICS_HZ: int = 240           # fixed physics rate, independent of FPS
+    MAX_FRAME_TIME: float = 0.25    # cap on wall-clock time fed to the accumulator per frame
+    TIME_WARP_LEVELS: tuple = (1, 2, 4, 8, 16, 32, 64)
+
     ORBIT_RADIUS: float = 120.0
     TANGENTIAL_SPEED: float = 350.0
     DIVE_SPEED: float = 500.0
@@ -23,6 +32,19 @@ class Config:
     SLOP: float = 0.01
     FMAX: float = 1200.0
 
+    K_PR: float = 10.0
+    K_DR: float = 6.0
+    K_PT: float = 6.0
+
+    TARGET_SPEED: float = 220.0
+
+    CCD: bool = False               # swept wall/target contacts, for large dt
+    MAX_SUBSTEPS: int = 4           # impacts handled per step by CCD and the event integrators
+
+    INTEGRATOR: str = "euler"       # "euler" (semi-implicit), "verlet", or "rk45" (adaptive); see INTEGRATORS
+    RTOL: float = 1e-5              # rk45 error control
+    ATOL: float = 1e-3              # rk45 error control, px and px/s
+
     STUN_TIME: float = 0.3
     STUN_FORCE_SCALE: float = 0.5
 
@@ -35,6 +57,10 @@ class Config:
     GREY: tuple = (150, 150, 150)
     BOX: tuple = (60, 60, 70)
 
+    @property
+    def PHYSICS_DT(self) -> float:
+        return 1.0 / self.PHYSICS_HZ
+
 def clamp(v, lo, hi): return max(lo, min(hi, v))
 def dot(ax, ay, bx, by): return ax*bx + ay*by
 def norm(ax, ay):
@@ -50,6 +76,13 @@ class Body:
     m: float = 1.0
     r: float = 6.0
 
+    def snapshot(self) -> tuple[float, float, float, float]:
+        """Kinematic state (x, y, vx, vy); mass and radius are fixed."""
+        return self.x, self.y, self.vx, self.vy
+
+    def restore(self, s: tuple[float, float, float, float]):
+        self.x, self.y, self.vx, self.vy = s
+
 def clamp_mag(Fx, Fy, Fmax):
     mag = math.hypot(Fx, Fy)
     if mag == 0 or mag <= Fmax: return Fx, Fy
@@ -84,6 +117,8 @@ def resolve_dynamic_collision(a: Body, b: Body, e=0.25, mu=0.6, beta=0.2, slop=0
     b.x -= (corr/b.m)*nx; b.y -= (corr/b.m)*ny
     return collided
 
+# wall_impulse inlined per wall: this runs every step, and in contact the call costs more than the impulse
+# (benchmarks.hot_paths, phys.resolve_wall_collision/contact).
 def resolve_wall_collision(a: Body, left, right, top, bottom, e=0.2, mu=0.6, beta=0.2, slop=0.01):
     collided = False
     if a.x - a.r < left:
@@ -128,6 +163,109 @@ def resolve_wall_collision(a: Body, left, right, top, bottom, e=0.2, mu=0.6, bet
         a.y -= beta * max(pen - slop, 0.0)
     return collided
 
+# ========== Continuous collision (swept circles) ==========
+
+def wall_toi(a: Body, left, right, top, bottom, t_max):
+    """Earliest (t, nx, ny) in [0, t_max] at which a, moving at its velocity, touches a wall; None if it doesn't.
+
+    Walls a already overlaps are left to resolve_wall_collision.
+    """
+    best = None
+    for gap, v, nx, ny in ((a.x - a.r - left, -a.vx, 1.0, 0.0), (right - a.x - a.r, a.vx, -1.0, 0.0),
+                           (a.y - a.r - top, -a.vy, 0.0, 1.0), (bottom - a.y - a.r, a.vy, 0.0, -1.0)):
+        if gap >= 0 and v > 0:
+            t = gap / v
+            if t <= t_max and (best is None or t < best[0]):
+                best = (t, nx, ny)
+    return best
+
+def circle_toi(a: Body, b: Body, t_max):
+    """Earliest (t, nx, ny) in [0, t_max] at which a, moving at its velocity, touches the static b; n points b -> a."""
+    px, py = a.x - b.x, a.y - b.y
+    rr = a.r + b.r
+    c = px*px + py*py - rr*rr
+    pv = px*a.vx + py*a.vy
+    if c <= 0 or pv >= 0: return None
+    vv = a.vx*a.vx + a.vy*a.vy
+    disc = pv*pv - vv*c
+    if disc < 0: return None
+    t = (-pv - math.sqrt(disc)) / vv
+    if t > t_max: return None
+    return t, (px + a.vx*t) / rr, (py + a.vy*t) / rr
+
+def wall_impulse(a: Body, nx, ny, e=0.2, mu=0.6):
+    """resolve_wall_collision's restitution + friction impulse against a wall with normal n, without the push-out."""
+    vrel_n = a.vx*nx + a.vy*ny
+    if vrel_n >= 0: return False
+    j = -(1+e) * vrel_n * a.m
+    a.vx += (j/a.m)*nx; a.vy += (j/a.m)*ny
+    tx, ty = -ny, nx
+    jt = -(a.vx*tx + a.vy*ty) * a.m
+    jt = max(-mu*abs(j), min(mu*abs(j), jt))
+    a.vx += (jt/a.m)*tx; a.vy += (jt/a.m)*ty
+    return True
+
+def contact_impulse(a: Body, b: Body, nx, ny, e=0.25, mu=0.6):
+    """resolve_dynamic_collision's impulse for a contact normal n (b -> a), without the push-out."""
+    rvx, rvy = a.vx - b.vx, a.vy - b.vy
+    vrel_n = dot(rvx, rvy, nx, ny)
+    if vrel_n >= 0: return False
+    invM = (1.0/a.m + 1.0/b.m)
+    j = -(1.0 + e) * vrel_n / invM
+    a.vx += (j/a.m)*nx; a.vy += (j/a.m)*ny
+    b.vx -= (j/b.m)*nx; b.vy -= (j/b.m)*ny
+    tx, ty = -ny, nx
+    jt = -dot(rvx, rvy, tx, ty) / invM
+    jt = max(-mu*abs(j), min(mu*abs(j), jt))
+    a.vx += (jt/a.m)*tx; a.vy += (jt/a.m)*ty
+    b.vx -= (jt/b.m)*tx; b.vy -= (jt/b.m)*ty
+    return True
+
+# ========== Integrators ==========
+
+INTEGRATORS = ("euler", "verlet", "rk45")
+CONTACT_SKIN = 1e-6         # px; event integrators ignore gaps that start closer than this (resting contact)
+MIN_EVENT_FRACTION = 1e-3   # shortest contact split, as a fraction of the physics step
+
+@dataclass
+class StepStats:
+    steps: int = 0          # fixed physics steps
+    substeps: int = 0       # accepted internal steps
+    rejected: int = 0       # rk45 steps rejected by the error test
+    force_evals: int = 0    # controller evaluations
+    events: int = 0         # contacts and stun expiries located inside a step
+    h: float = 0.0          # last internal step size (event integrators)
+
+# Dormand-Prince 5(4) tableau
+_DP_C = (0.0, 1/5, 3/10, 4/5, 8/9, 1.0, 1.0)
+_DP_A = ((), (1/5,), (3/40, 9/40), (44/45, -56/15, 32/9),
+         (19372/6561, -25360/2187, 64448/6561, -212/729),
+         (9017/3168, -355/33, 46732/5247, 49/176, -5103/18656),
+         (35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84))
+_DP_B5 = (35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84, 0.0)
+_DP_B4 = (5179/57600, 0.0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40)
+
+def verlet_step(f, s, h):
+    """Velocity Verlet for a velocity-dependent force: f(state) -> (ax, ay), state = (x, y, vx, vy)."""
+    x, y, vx, vy = s
+    ax, ay = f(s)
+    x1, y1 = x + vx*h + 0.5*ax*h*h, y + vy*h + 0.5*ay*h*h
+    bx, by = f((x1, y1, vx + ax*h, vy + ay*h))
+    return x1, y1, vx + 0.5*(ax + bx)*h, vy + 0.5*(ay + by)*h
+
+def dopri_step(f, s, h):
+    """One Dormand-Prince step: (5th-order state, per-component |y5 - y4|)."""
+    k = []
+    for i in range(7):
+        st = s
+        if i:
+            st = tuple(s[c] + h*sum(a*k[j][c] for j, a in enumerate(_DP_A[i])) for c in range(4))
+        ax, ay = f(st)
+        k.append((st[2], st[3], ax, ay))
+    y5 = tuple(s[c] + h*sum(b*k[i][c] for i, b in enumerate(_DP_B5)) for c in range(4))
+    err = tuple(abs(h*sum((b5 - b4)*k[i][c] for i, (b5, b4) in enumerate(zip(_DP_B5, _DP_B4)))) for c in range(4))
+    return y5, err
+
 # ========== Controller ==========
 
 def orbit_dive_force(robot: Body, target: Body, state: str, orbit_dir: int,
@@ -165,13 +303,17 @@ class Target:
 
     def update(self, dt: float):
         keys = pygame.key.get_pressed()
-        tvx = (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * 220.0
-        tvy = (keys[pygame.K_DOWN]  - keys[pygame.K_UP])   * 220.0
+        self.step(dt, keys[pygame.K_RIGHT] - keys[pygame.K_LEFT], keys[pygame.K_DOWN] - keys[pygame.K_UP])
+
+    def step(self, dt: float, ix: float, iy: float):
+        tvx = ix * self.cfg.TARGET_SPEED
+        tvy = iy * self.cfg.TARGET_SPEED
         self.body.x = clamp(self.body.x + tvx*dt, self.cfg.SAFETY_MARGIN, self.cfg.WIDTH - self.cfg.SAFETY_MARGIN)
         self.body.y = clamp(self.body.y + tvy*dt, self.cfg.SAFETY_MARGIN, self.cfg.HEIGHT - self.cfg.SAFETY_MARGIN)
 
-    def draw(self, surf):
-        pygame.draw.circle(surf, self.cfg.RED, (int(self.body.x), int(self.body.y)), self.cfg.DOT_RADIUS)
+    def draw(self, surf, pos=None):
+        x, y = pos or (self.body.x, self.body.y)
+        return pygame.draw.circle(surf, self.cfg.RED, (int(x), int(y)), self.cfg.DOT_RADIUS)
 
 class Robot:
     def __init__(self, cfg: Config, target: Target):
@@ -187,19 +329,62 @@ class Robot:
         self.stun = 0.0
         self.dives = 0
 
+        self.stats = StepStats()
+        self._probe = Body(0.0, 0.0)  # scratch body for controller evaluations off the current state
+        self._h = None                # rk45 step size carried between physics steps
+
     def command_dive(self):
         if self.state == "ORBIT":
             self.state = "INWARD"
             self.dives += 1
 
+    def snapshot(self) -> tuple:
+        """Flat tuple of everything update() reads or writes: robot and target bodies, FSM, stun, rk45 step."""
+        return (*self.body.snapshot(), *self.target.body.snapshot(),
+                self.state, self.orbit_dir, self.stun, self.dives, self._h)
+
+    def restore(self, s: tuple):
+        b, t = self.body, self.target.body
+        b.x, b.y, b.vx, b.vy, t.x, t.y, t.vx, t.vy, self.state, self.orbit_dir, self.stun, self.dives, self._h = s
+
     def flip_orbit(self):
         self.orbit_dir *= -1
 
     def update(self, dt: float):
+        swept_wall, swept_target = self.integrate(dt)
+        hit_wall = self.resolve_walls()
+        hit_target = resolve_dynamic_collision(
+            self.body, self.target.body,
+            e=self.cfg.RESTITUTION, mu=self.cfg.FRICTION, beta=self.cfg.BETA, slop=self.cfg.SLOP
+        )
+        self.after_contacts(hit_wall or hit_target or swept_wall or swept_target)
+
+    # update() phases, split so multi-body worlds can run the broad phase in between
+
+    def integrate(self, dt: float) -> tuple[bool, bool]:
+        """Forces, velocity, then position; returns (wall, target) impacts found inside the step.
+
+        "euler" finds them with the CCD sweep (if enabled); "verlet" and "rk45"
+        locate contacts and stun expiry as events and split the step there.
+        """
+        st = self.stats
+        st.steps += 1
+        if self.cfg.INTEGRATOR != "euler":
+            return self.integrate_events(dt)
+        st.substeps += 1
+        st.force_evals += 1
+        self.accelerate(dt)
+        if self.cfg.CCD:
+            return self.sweep(dt)
+        self.body.x  += self.body.vx * dt
+        self.body.y  += self.body.vy * dt
+        return False, False
+
+    def accelerate(self, dt: float):
         Fx, Fy = orbit_dive_force(
             self.body, self.target.body, self.state, self.orbit_dir,
             self.cfg.ORBIT_RADIUS, self.cfg.TANGENTIAL_SPEED,
-            k_pr=10.0, k_dr=6.0, k_pt=6.0, feedforward=True, Fmax=self.cfg.FMAX
+            k_pr=self.cfg.K_PR, k_dr=self.cfg.K_DR, k_pt=self.cfg.K_PT, feedforward=True, Fmax=self.cfg.FMAX
         )
         if self.stun > 0:
             Fx *= self.cfg.STUN_FORCE_SCALE
@@ -211,21 +396,157 @@ class Robot:
 
         self.body.vx += (Fx / self.body.m) * dt
         self.body.vy += (Fy / self.body.m) * dt
-        self.body.x  += self.body.vx * dt
-        self.body.y  += self.body.vy * dt
 
+    def accel(self, s, scale: float = 1.0):
+        """Acceleration at state s = (x, y, vx, vy): controller (scaled while stunned) plus drag."""
+        p = self._probe
+        p.x, p.y, p.vx, p.vy = s
+        Fx, Fy = orbit_dive_force(
+            p, self.target.body, self.state, self.orbit_dir,
+            self.cfg.ORBIT_RADIUS, self.cfg.TANGENTIAL_SPEED,
+            k_pr=self.cfg.K_PR, k_dr=self.cfg.K_DR, k_pt=self.cfg.K_PT, feedforward=True, Fmax=self.cfg.FMAX
+        )
+        self.stats.force_evals += 1
+        m = self.body.m
+        return (Fx*scale - self.cfg.DRAG*s[2]) / m, (Fy*scale - self.cfg.DRAG*s[3]) / m
+
+    def _first_contact(self, s0, s1):
+        """Earliest approaching contact crossed between states s0 and s1 as (fraction, is_target).
+
+        Located by linear gap interpolation. Only gaps that start above
+        CONTACT_SKIN and are closing at s1 count: a body resting on (or just
+        bounced off) a surface would otherwise re-trigger on every substep, and
+        resting contact is the discrete resolvers' job.
+        """
+        cfg, r, t = self.cfg, self.body.r, self.target.body
+        left, right = cfg.SAFETY_MARGIN, cfg.WIDTH - cfg.SAFETY_MARGIN
+        top, bottom = cfg.SAFETY_MARGIN, cfg.HEIGHT - cfg.SAFETY_MARGIN
+        (nx, ny), d1 = norm(s1[0] - t.x, s1[1] - t.y)
+        best = None
+        for g0, g1, closing, on_target in ((s0[0] - r - left, s1[0] - r - left, -s1[2], False),
+                                           (right - s0[0] - r, right - s1[0] - r, s1[2], False),
+                                           (s0[1] - r - top, s1[1] - r - top, -s1[3], False),
+                                           (bottom - s0[1] - r, bottom - s1[1] - r, s1[3], False),
+                                           (math.hypot(s0[0] - t.x, s0[1] - t.y) - r - t.r, d1 - r - t.r,
+                                            -dot(s1[2] - t.vx, s1[3] - t.vy, nx, ny), True)):
+            if g0 > CONTACT_SKIN and g1 < 0 and closing > 0:
+                frac = g0 / (g0 - g1)
+                if best is None or frac < best[0]:
+                    best = (frac, on_target)
+        return best
+
+    def integrate_events(self, dt: float) -> tuple[bool, bool]:
+        """Advance by dt with INTEGRATOR, splitting internal steps at contacts and at stun expiry.
+
+        Like sweep(), at most MAX_SUBSTEPS contacts are located per step, and no
+        split is shorter than MIN_EVENT_FRACTION of dt; the rest of the step runs
+        without contact events and leaves any overlap to update()'s resolvers.
+        """
+        cfg, b, st = self.cfg, self.body, self.stats
+        adaptive = cfg.INTEGRATOR == "rk45"
+        if cfg.INTEGRATOR not in INTEGRATORS:
+            raise ValueError(f"unknown integrator {cfg.INTEGRATOR!r}")
+        hit_wall = hit_target = False
+        remaining = dt
+        h_min = dt * MIN_EVENT_FRACTION
+        contacts = 0
+        while remaining > 1e-12:
+            scale = cfg.STUN_FORCE_SCALE if self.stun > 0 else 1.0
+            f = lambda s: self.accel(s, scale)
+            h = min(self._h or dt, remaining) if adaptive else remaining
+            if self.stun > 0 and self.stun < h:
+                h = self.stun  # the force changes when the stun runs out
+                st.events += 1
+            s0 = (b.x, b.y, b.vx, b.vy)
+            if adaptive:
+                while True:
+                    s1, err = dopri_step(f, s0, h)
+                    scale_err = max(e / (cfg.ATOL + cfg.RTOL*max(abs(a), abs(c))) for e, a, c in zip(err, s0, s1))
+                    grow = min(5.0, max(0.2, 0.9 * scale_err ** -0.2)) if scale_err > 0 else 5.0
+                    if scale_err <= 1.0 or h < 1e-9:
+                        self._h = h * grow
+                        break
+                    st.rejected += 1
+                    h *= grow
+            else:
+                s1 = verlet_step(f, s0, h)
+            contact = self._first_contact(s0, s1) if contacts < cfg.MAX_SUBSTEPS else None
+            if contact is not None:
+                contacts += 1
+                h_contact = max(h * contact[0], min(h_min, h))
+                if h_contact < h:
+                    h = h_contact
+                    s1 = dopri_step(f, s0, h)[0] if adaptive else verlet_step(f, s0, h)
+            b.x, b.y, b.vx, b.vy = s1
+            remaining -= h
+            self.stun = max(0.0, self.stun - h)
+            st.substeps += 1
+            st.h = h
+            if contact is not None:
+                st.events += 1
+                if contact[1]:
+                    (nx, ny), _ = norm(b.x - self.target.body.x, b.y - self.target.body.y)
+                    hit = contact_impulse(b, self.target.body, nx, ny, e=cfg.RESTITUTION, mu=cfg.FRICTION)
+                    hit_target |= hit
+                else:
+                    hit = self._wall_event()
+                    hit_wall |= hit
+                if hit:
+                    self.stun = cfg.STUN_TIME
+        return hit_wall, hit_target
+
+    def _wall_event(self) -> bool:
+        """Impulse against whichever wall the body is (within rounding) touching."""
+        cfg, b = self.cfg, self.body
+        left, right = cfg.SAFETY_MARGIN, cfg.WIDTH - cfg.SAFETY_MARGIN
+        top, bottom = cfg.SAFETY_MARGIN, cfg.HEIGHT - cfg.SAFETY_MARGIN
+        gaps = ((b.x - b.r - left, 1.0, 0.0), (right - b.x - b.r, -1.0, 0.0),
+                (b.y - b.r - top, 0.0, 1.0), (bottom - b.y - b.r, 0.0, -1.0))
+        _, nx, ny = min(gaps)
+        return wall_impulse(b, nx, ny, e=cfg.RESTITUTION, mu=cfg.FRICTION)
+
+    def sweep(self, dt: float) -> tuple[bool, bool]:
+        """Move by dt, stopping at each time of impact with a wall or the target to apply its impulse.
+
+        Up to MAX_SUBSTEPS impacts per step; whatever is left over (and resting
+        contact) falls through to the discrete resolvers in update().
+        """
+        b, t = self.body, self.target.body
+        cfg = self.cfg
+        left, right = cfg.SAFETY_MARGIN, cfg.WIDTH - cfg.SAFETY_MARGIN
+        top, bottom = cfg.SAFETY_MARGIN, cfg.HEIGHT - cfg.SAFETY_MARGIN
+        hit_wall = hit_target = False
+        remaining = dt
+        for _ in range(cfg.MAX_SUBSTEPS):
+            toi = wall_toi(b, left, right, top, bottom, remaining)
+            toi_t = circle_toi(b, t, remaining)
+            on_target = toi_t is not None and (toi is None or toi_t[0] < toi[0])
+            if on_target:
+                toi = toi_t
+            if toi is None:
+                break
+            s, nx, ny = toi
+            b.x += b.vx * s
+            b.y += b.vy * s
+            remaining -= s
+            if on_target:
+                hit_target |= contact_impulse(b, t, nx, ny, e=cfg.RESTITUTION, mu=cfg.FRICTION)
+            else:
+                hit_wall |= wall_impulse(b, nx, ny, e=cfg.RESTITUTION, mu=cfg.FRICTION)
+        b.x += b.vx * remaining
+        b.y += b.vy * remaining
+        return hit_wall, hit_target
+
+    def resolve_walls(self) -> bool:
         left, right = self.cfg.SAFETY_MARGIN, self.cfg.WIDTH - self.cfg.SAFETY_MARGIN
         top, bottom = self.cfg.SAFETY_MARGIN, self.cfg.HEIGHT - self.cfg.SAFETY_MARGIN
-
-        hit_wall = resolve_wall_collision(
+        return resolve_wall_collision(
             self.body, left, right, top, bottom,
             e=self.cfg.RESTITUTION, mu=self.cfg.FRICTION, beta=self.cfg.BETA, slop=self.cfg.SLOP
         )
-        hit_target = resolve_dynamic_collision(
-            self.body, self.target.body,
-            e=self.cfg.RESTITUTION, mu=self.cfg.FRICTION, beta=self.cfg.BETA, slop=self.cfg.SLOP
-        )
-        if hit_wall or hit_target:
+
+    def after_contacts(self, hit: bool):
+        if hit:
             self.stun = self.cfg.STUN_TIME
 
         er_vec, r_now = norm(self.body.x - self.target.body.x, self.body.y - self.target.body.y)
@@ -240,13 +561,16 @@ class Robot:
         vt_ccw = self.body.vx*( etx) + self.body.vy*( ety)
         self.orbit_dir = 1 if vt_ccw >= vt_cw else -1
 
-    def draw(self, surf):
-        pygame.draw.circle(surf, self.cfg.GREEN, (int(self.body.x), int(self.body.y)), self.cfg.DOT_RADIUS)
+    def draw(self, surf, pos=None):
+        x, y = pos or (self.body.x, self.body.y)
+        return pygame.draw.circle(surf, self.cfg.GREEN, (int(x), int(y)), self.cfg.DOT_RADIUS)
 
 # ========== App / Game loop ==========
 
+HELP = "SPACE: dive   C: flip dir   [ ]: time warp   D: HUD   P: profiler   ESC: quit"
+
 class App:
-    def __init__(self, cfg=Config()):
+    def __init__(self, cfg=Config(), record_path=None, profile_path=None):
         pygame.init()
         self.cfg = cfg
         self.screen = pygame.display.set_mode((cfg.WIDTH, cfg.HEIGHT))
@@ -255,34 +579,103 @@ class App:
         self.font = pygame.font.SysFont(None, 18)
         self.debug = True
 
+        # Shared render layer: static background drawn once, cached HUD text, dirty-rect updates.
+        from Simulation.render import FrameRenderer, TextCache
+        self.text = TextCache(self.font)
+        self.renderer = FrameRenderer(self.screen, self.background())
+
         self.target = Target(cfg)
         self.robot = Robot(cfg, self.target)
 
+        # Fixed-rate physics fed by an accumulator; drawing interpolates the last two steps.
+        self.accumulator = 0.0
+        self.warp_index = 0
+        self.prev_target = (self.target.body.x, self.target.body.y)
+        self.prev_robot = (self.robot.body.x, self.robot.body.y)
+        self.physics_steps = 0
+
+        # Optional trajectory recording, same file format as the kinematic Game.
+        self.recorder = None
+        self.buttons = 0
+        if record_path:
+            from Simulation.recorder import Header, Recorder
+            self.recorder = Recorder(record_path, Header.from_cfg(cfg, "phys"))
+
+        # Loop-phase timings and sim counters (P toggles them and their HUD page).
+        from Simulation.profiler import FrameProfiler, SimStats
+        self.profiler = FrameProfiler(("wait", "events", "target", "robot", "bookkeeping", "draw", "present"),
+                                      enabled=profile_path is not None)
+        self.stats = SimStats(cfg.ORBIT_RADIUS, cfg.PHYSICS_DT)
+        self.profile_path = profile_path
+
+    @property
+    def time_warp(self):
+        return self.cfg.TIME_WARP_LEVELS[self.warp_index]
+
     def handle_events(self):
         for e in pygame.event.get():
             if e.type == pygame.QUIT: return False
+            if e.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE): self.renderer.invalidate()
             if e.type == pygame.KEYDOWN:
                 if e.key == pygame.K_ESCAPE: return False
-                if e.key == pygame.K_SPACE: self.robot.command_dive()
-                if e.key == pygame.K_c: self.robot.flip_orbit()
-                if e.key == pygame.K_d: self.debug = not self.debug
+                if e.key == pygame.K_SPACE: self.robot.command_dive(); self.buttons |= 1  # recorder.BTN_DIVE
+                if e.key == pygame.K_c: self.robot.flip_orbit(); self.buttons |= 2        # recorder.BTN_FLIP
+                if e.key == pygame.K_d:
+                    self.debug = not self.debug
+                    self.renderer.set_background(self.background())
+                if e.key == pygame.K_p: self.profiler.toggle()
+                if e.key == pygame.K_RIGHTBRACKET:
+                    self.warp_index = min(self.warp_index + 1, len(self.cfg.TIME_WARP_LEVELS) - 1)
+                if e.key == pygame.K_LEFTBRACKET: self.warp_index = max(self.warp_index - 1, 0)
         return True
 
-    def draw(self):
-        self.screen.fill(self.cfg.BLACK)
+    def advance(self, frame_dt, ix, iy):
+        dt = self.cfg.PHYSICS_DT
+        prof = self.profiler
+        self.accumulator += min(frame_dt, self.cfg.MAX_FRAME_TIME) * self.time_warp
+        while self.accumulator >= dt:
+            self.prev_target = (self.target.body.x, self.target.body.y)
+            self.prev_robot = (self.robot.body.x, self.robot.body.y)
+            self.target.step(dt, ix, iy)
+            prof.lap("target")
+            self.robot.update(dt)
+            prof.lap("robot")
+            if prof.enabled:
+                b, t = self.robot.body, self.target.body
+                self.stats.step(self.robot.state, math.hypot(b.x - t.x, b.y - t.y), self.robot.orbit_dir,
+                                self.robot.stun, flipped=bool(self.buttons & 2))
+            if self.recorder:
+                self.recorder.record_robot(self.physics_steps, self.target, self.robot, ix, iy, self.buttons)
+            self.buttons = 0
+            self.physics_steps += 1
+            self.accumulator -= dt
+            prof.lap("bookkeeping")
+
+    def lerp(self, prev, body):
+        a = self.accumulator / self.cfg.PHYSICS_DT
+        return prev[0] + (body.x - prev[0])*a, prev[1] + (body.y - prev[1])*a
+
+    def background(self):
+        from Simulation.render import static_layer
+        def bounds(surf):
+            pygame.draw.rect(surf, self.cfg.BOX,
+                             (self.cfg.SAFETY_MARGIN, self.cfg.SAFETY_MARGIN,
+                              self.cfg.WIDTH - 2*self.cfg.SAFETY_MARGIN, self.cfg.HEIGHT - 2*self.cfg.SAFETY_MARGIN), 1)
+        def help_line(surf):
+            surf.blit(self.font.render(HELP, True, self.cfg.GREY), (10, 10 + 18*2))
+        return static_layer(self.screen.get_size(), self.cfg.BLACK, bounds, *([help_line] if self.debug else []))
 
-        pygame.draw.rect(
-            self.screen, self.cfg.BOX,
-            (self.cfg.SAFETY_MARGIN, self.cfg.SAFETY_MARGIN,
-             self.cfg.WIDTH - 2*self.cfg.SAFETY_MARGIN, self.cfg.HEIGHT - 2*self.cfg.SAFETY_MARGIN), 1
-        )
+    def draw(self):
+        out = self.renderer
+        out.begin()
 
-        pygame.draw.circle(self.screen, self.cfg.WHITE,
-                           (int(self.target.body.x), int(self.target.body.y)),
-                           int(self.cfg.ORBIT_RADIUS), 1)
+        tpos = self.lerp(self.prev_target, self.target.body)
+        out.mark(pygame.draw.circle(self.screen, self.cfg.WHITE,
+                                    (int(tpos[0]), int(tpos[1])),
+                                    int(self.cfg.ORBIT_RADIUS), 1))
 
-        self.target.draw(self.screen)
-        self.robot.draw(self.screen)
+        out.mark(self.target.draw(self.screen, tpos))
+        out.mark(self.robot.draw(self.screen, self.lerp(self.prev_robot, self.robot.body)))
 
         if self.debug:
             er_vec, r_now = norm(self.robot.body.x - self.target.body.x,
@@ -290,25 +683,45 @@ class App:
             ex, ey = er_vec
             angle = math.atan2(ey, ex) % (2*math.pi)
             lines = [
-                f"state={self.robot.state}  stun={self.robot.stun:.2f}s",
+                f"state={self.robot.state}  stun={self.robot.stun:.2f}s  warp=x{self.time_warp}",
                 f"r={r_now:6.1f}  angle={angle:.2f} rad  dir={'CCW' if self.robot.orbit_dir==1 else 'CW'}",
-                "SPACE: dive   C: flip dir   D: HUD   ESC: quit"
             ]
             for i, s in enumerate(lines):
-                self.screen.blit(self.font.render(s, True, self.cfg.GREY), (10, 10 + 18*i))
+                out.mark(self.text.blit(self.screen, s, self.cfg.GREY, (10, 10 + 18*i)))
+        if self.profiler.enabled:
+            for i, s in enumerate(self.profiler.page(self.stats)):
+                out.mark(self.text.blit(self.screen, s, self.cfg.GREY, (10, 10 + 18*(4 + i))))
 
-        pygame.display.flip()
+        self.profiler.lap("draw")
+        out.present()
 
     def run(self):
         running = True
         while running:
-            dt_ms = self.clock.tick(self.cfg.FPS)
-            dt = max(1e-3, dt_ms/1000.0)
+            frame_dt = self.clock.tick(self.cfg.FPS) / 1000.0
+            self.profiler.lap("wait")
             running = self.handle_events()
-            self.target.update(dt)
-            self.robot.update(dt)
+            keys = pygame.key.get_pressed()
+            self.profiler.lap("events")
+            self.advance(frame_dt,
+                         keys[pygame.K_RIGHT] - keys[pygame.K_LEFT],
+                         keys[pygame.K_DOWN] - keys[pygame.K_UP])
             self.draw()
+            self.profiler.lap("present")
+            self.profiler.end_frame()
+        if self.recorder: self.recorder.close()
+        if self.profile_path:
+            from Simulation.profiler import export
+            export(self.profile_path, self.profiler, self.stats)
         pygame.quit(); sys.exit()
 
 if __name__ == "__main__":
-    App().run()
+    import argparse, os
+    if not __package__:  # run as a script: make the Simulation package importable
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    ap = argparse.ArgumentParser(description="Physics orbit/dive simulation")
+    ap.add_argument("--record", metavar="FILE", help="record every physics step for `python -m Simulation.replay`")
+    ap.add_argument("--profile", metavar="FILE", help="profile from the start; write timings/counters (.json or .csv) on exit")
+    ap.add_argument("--integrator", choices=INTEGRATORS, default="euler")
+    args = ap.parse_args()
+    App(Config(INTEGRATOR=args.integrator), record_path=args.record, profile_path=args.profile).run()
@@ -0,0 +1,123 @@
+"""Multi-body arena for phys_sim: many robots and targets with a spatial-hash broad phase.
+
+Each step integrates every robot, resolves its walls, then hands only the
+candidate pairs from a uniform grid (cell sized from the largest Body.r) to
+resolve_dynamic_collision, in ascending (i, j) body order so runs are repeatable.
+"""
+import argparse
+import math
+import time
+from typing import Sequence
+
+from ..spatial import SpatialHash
+from .phys_sim import Config, Robot, Target, resolve_dynamic_collision
+
+class World:
+    """Robots and targets sharing one box; body index = robots first, then targets."""
+
+    def __init__(self, cfg: Config):
+        self.cfg = cfg
+        self.robots: list[Robot] = []
+        self.targets: list[Target] = []
+        self.grid: SpatialHash | None = None
+
+        # Stats from the last step
+        self.candidate_pairs = 0
+        self.contacts = 0
+
+    def add_target(self, x: float | None = None, y: float | None = None) -> Target:
+        target = Target(self.cfg)
+        if x is not None:
+            target.body.x = x
+        if y is not None:
+            target.body.y = y
+        self.targets.append(target)
+        self.grid = None
+        return target
+
+    def add_robot(self, target: Target, phase: float = 0.0, orbit_dir: int = 1) -> Robot:
+        """Robot on `target`'s orbit at angle `phase`, already moving at the tangential speed."""
+        robot = Robot(self.cfg, target)
+        ex, ey = math.cos(phase), math.sin(phase)
+        etx, ety = (-ey, ex) if orbit_dir >= 0 else (ey, -ex)
+        robot.body.x = target.body.x + ex * self.cfg.ORBIT_RADIUS
+        robot.body.y = target.body.y + ey * self.cfg.ORBIT_RADIUS
+        robot.body.vx = etx * self.cfg.TANGENTIAL_SPEED
+        robot.body.vy = ety * self.cfg.TANGENTIAL_SPEED
+        robot.orbit_dir = orbit_dir
+        self.robots.append(robot)
+        self.grid = None
+        return robot
+
+    @property
+    def bodies(self):
+        return [r.body for r in self.robots] + [t.body for t in self.targets]
+
+    def step(self, dt: float, inputs: Sequence[tuple[float, float]] | None = None):
+        """Advance everything by dt; `inputs` holds one (ix, iy) move axis per target."""
+        cfg = self.cfg
+        if inputs is not None:
+            for target, (ix, iy) in zip(self.targets, inputs):
+                target.step(dt, ix, iy)
+
+        # With cfg.CCD each robot sweeps against the walls and its own target; robot-robot stays discrete.
+        swept = [any(robot.integrate(dt)) for robot in self.robots]
+        hit = [robot.resolve_walls() or s for robot, s in zip(self.robots, swept)]
+
+        bodies = self.bodies
+        if self.grid is None:
+            self.grid = SpatialHash.for_radii(b.r for b in bodies)
+        self.grid.build([b.x for b in bodies], [b.y for b in bodies])
+
+        n_robots = len(self.robots)
+        pairs = self.grid.pairs()
+        contacts = 0
+        for i, j in pairs:
+            if i >= n_robots:
+                break  # remaining pairs are target-target; targets are scripted
+            if resolve_dynamic_collision(bodies[i], bodies[j], e=cfg.RESTITUTION, mu=cfg.FRICTION,
+                                         beta=cfg.BETA, slop=cfg.SLOP):
+                contacts += 1
+                hit[i] = True
+                if j < n_robots:
+                    hit[j] = True
+
+        for robot, h in zip(self.robots, hit):
+            robot.after_contacts(h)
+
+        self.candidate_pairs = len(pairs)
+        self.contacts = contacts
+
+def ring_world(cfg: Config, n_targets: int, robots_per_target: int) -> World:
+    """Targets on a grid, each with robots at evenly spaced phase offsets; direction alternates per target."""
+    world = World(cfg)
+    cols = max(1, math.ceil(math.sqrt(n_targets)))
+    rows = math.ceil(n_targets / cols)
+    for k in range(n_targets):
+        c, rr = k % cols, k // cols
+        world.add_target(cfg.WIDTH * (c + 0.5) / cols, cfg.HEIGHT * (rr + 0.5) / rows)
+    for t_idx, target in enumerate(world.targets):
+        for k in range(robots_per_target):
+            world.add_robot(target, 2 * math.pi * k / robots_per_target, 1 if t_idx % 2 == 0 else -1)
+    return world
+
+def main():
+    ap = argparse.ArgumentParser(description="Step cost of the multi-body world as the robot count grows.")
+    ap.add_argument("--steps", type=int, default=200)
+    ap.add_argument("--robots-per-target", type=int, default=8)
+    args = ap.parse_args()
+    dt = 1.0 / 60
+    for n_targets in (4, 16, 64, 256):
+        cfg = Config(WIDTH=900 * max(1, int(math.sqrt(n_targets / 4))),
+                     HEIGHT=650 * max(1, int(math.sqrt(n_targets / 4))))
+        world = ring_world(cfg, n_targets, args.robots_per_target)
+        t0 = time.perf_counter()
+        for _ in range(args.steps):
+            world.step(dt)
+        per_step = (time.perf_counter() - t0) / args.steps
+        n = len(world.robots)
+        print(f"{n:6d} robots  {per_step * 1e3:8.3f} ms/step  {per_step / n * 1e6:6.2f} us/robot  "
+              f"pairs={world.candidate_pairs}  contacts={world.contacts}")
+
+if __name__ == "__main__":
+    main()
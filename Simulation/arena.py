@@ -0,0 +1,171 @@
+"""Multi-target arena: many moving targets, many OrbitingAgents, each switching to the best target nearby.
+
+    arena = Arena(Config(), targets=50, agents=200, mode="nearest")
+    for _ in range(steps):
+        arena.step(cfg.PHYSICS_DT)
+
+    python -m Simulation.arena --sizes 10,100,1000 --seconds 5     # per-step cost as counts grow
+
+Targets random-walk (each holds a random arrow-key direction for `hold`
+seconds) and live in a SpatialHash that is updated incrementally: a target
+only changes buckets when it crosses a cell boundary. Agents re-evaluate their
+target every `retarget_every` steps, staggered so only a slice of them queries
+per step, and only while in ORBIT with no handoff under way:
+
+- nearest: the target closest to the agent, taken if it is closer than
+  `hysteresis` times the current one (so agents don't flap between two).
+- value: among targets within `sense_radius` (two grid cells by default, so
+  the candidate count stays flat as targets are added), the highest value / (1 + d / R),
+  taken if it beats the current one by 1 / `hysteresis`.
+
+A switch goes through OrbitingAgent.retarget, which slides the orbit centre to
+the new target at `handoff_speed` instead of jumping, so agent paths stay
+continuous. Each step costs O(targets + agents) plus the local grid queries.
+"""
+import argparse
+import math
+import random
+import time
+
+from .config import Config
+from .entities import OrbitingAgent, Target
+from .spatial import SpatialHash
+
+MODES = ("nearest", "value")
+
+class Arena:
+    """Targets, agents and the target index; see the module docstring."""
+
+    def __init__(self, cfg: Config, targets: int = 8, agents: int = 16, seed: int = 0, mode: str = "nearest",
+                 retarget_every: int = 6, hysteresis: float = 0.8, sense_radius: float | None = None,
+                 hold: float = 1.0, handoff_speed: float | None = None):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        if targets < 1:
+            raise ValueError("an arena needs at least one target")
+        self.cfg = cfg
+        self.mode = mode
+        self.retarget_every = max(1, retarget_every)
+        self.hysteresis = hysteresis
+        self.handoff_speed = handoff_speed
+        self.hold = max(1, round(hold / cfg.PHYSICS_DT))
+        self.rng = random.Random(seed)
+        rng, m = self.rng, cfg.SAFETY_MARGIN
+
+        self.targets: list[Target] = []
+        for _ in range(targets):
+            t = Target(cfg)
+            t.x, t.y = rng.uniform(m, cfg.WIDTH - m), rng.uniform(m, cfg.HEIGHT - m)
+            self.targets.append(t)
+        self.values = [rng.uniform(1.0, 5.0) for _ in range(targets)]
+        self._axes = [(0, 0)] * targets
+
+        # About two targets per cell, so a nearest query usually settles within one ring.
+        area = (cfg.WIDTH - 2 * m) * (cfg.HEIGHT - 2 * m)
+        self.index = SpatialHash(max(4.0 * cfg.DOT_RADIUS, math.sqrt(2.0 * area / targets)))
+        self.index.build([t.x for t in self.targets], [t.y for t in self.targets])
+        # Two cells' reach: a couple of dozen candidates on average at any target count.
+        self.sense_radius = sense_radius or 2.0 * self.index.cell
+
+        self.agents: list[OrbitingAgent] = []
+        self.assigned: list[int] = []  # target index each agent orbits (or is sliding towards)
+        for _ in range(agents):
+            j = rng.randrange(targets)
+            a = OrbitingAgent(cfg, self.targets[j])
+            a.orbit_direction = rng.choice((-1, 1))
+            self._place(a)
+            self.agents.append(a)
+            self.assigned.append(j)
+        self.steps = 0
+        self.retargets = 0
+
+    def _place(self, a: OrbitingAgent, tries: int = 16):
+        """Random orbit phase that puts the agent inside the box (else the phase facing the arena centre)."""
+        cfg, t, r = self.cfg, a.target, a.radial_distance
+        for _ in range(tries):
+            phase = self.rng.uniform(0, 2 * math.pi)
+            a.udx, a.udy = math.cos(phase), math.sin(phase)
+            if a._inside_box(t.x + a.udx * r, t.y + a.udy * r):
+                break
+        else:
+            dx, dy = cfg.WIDTH * 0.5 - t.x, cfg.HEIGHT * 0.5 - t.y
+            d = math.hypot(dx, dy) or 1.0
+            a.udx, a.udy = dx / d, dy / d
+        a.gx, a.gy = t.x + a.udx * r, t.y + a.udy * r
+
+    def _move_targets(self, dt: float):
+        rng, hold, index = self.rng, self.hold, self.index
+        for i, t in enumerate(self.targets):
+            if (self.steps + i) % hold == 0:
+                self._axes[i] = (rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1)))
+            ix, iy = self._axes[i]
+            if ix or iy:
+                t.step(dt, ix, iy)
+                index.move(i, t.x, t.y)
+
+    def choose(self, k: int) -> int:
+        """Target index agent k should orbit (its current one unless another is clearly better)."""
+        a, cur = self.agents[k], self.assigned[k]
+        x, y = a.gx, a.gy
+        xs, ys = self.index.xs, self.index.ys
+        d_cur = math.hypot(xs[cur] - x, ys[cur] - y)
+        if self.mode == "nearest":
+            j = self.index.nearest(x, y)
+            if j != cur and math.hypot(xs[j] - x, ys[j] - y) < self.hysteresis * d_cur:
+                return j
+            return cur
+        R, values = self.cfg.ORBIT_RADIUS, self.values
+        best, best_score = cur, values[cur] / (1.0 + d_cur / R) / self.hysteresis
+        for j in self.index.query(x, y, self.sense_radius):
+            score = values[j] / (1.0 + math.hypot(xs[j] - x, ys[j] - y) / R)
+            if score > best_score:
+                best, best_score = j, score
+        return best
+
+    def step(self, dt: float):
+        self._move_targets(dt)
+        every, phase = self.retarget_every, self.steps % self.retarget_every
+        for k in range(phase, len(self.agents), every):  # staggered: 1 / every of the agents per step
+            a = self.agents[k]
+            if a.state != "ORBIT" or a.next_target is not None:
+                continue  # settle the orbit (and any handoff in progress) before choosing again
+            j = self.choose(k)
+            if j != self.assigned[k]:
+                a.retarget(self.targets[j], self.handoff_speed)
+                self.assigned[k] = j
+                self.retargets += 1
+        for a in self.agents:
+            a.update(dt)
+        self.steps += 1
+
+    def within(self, x: float, y: float, radius: float) -> list[int]:
+        """Target indices within `radius` of (x, y), ascending."""
+        return self.index.query(x, y, radius)
+
+    def nearest(self, x: float, y: float) -> int:
+        return self.index.nearest(x, y)
+
+def main():
+    ap = argparse.ArgumentParser(description="Time arena steps as target/agent counts grow.")
+    ap.add_argument("--sizes", default="10,100,1000", help="comma-separated counts; targets = agents = size")
+    ap.add_argument("--agents-per-target", type=float, default=1.0)
+    ap.add_argument("--mode", choices=MODES, default="nearest")
+    ap.add_argument("--seconds", type=float, default=2.0, help="simulated time per size")
+    args = ap.parse_args()
+
+    cfg = Config()
+    dt = cfg.PHYSICS_DT
+    steps = int(args.seconds / dt)
+    print(f"{'targets':>8s} {'agents':>7s} {'us/step':>9s} {'ns/entity':>10s} {'retargets':>10s}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        n_agents = max(1, round(size * args.agents_per_target))
+        arena = Arena(cfg, size, n_agents, mode=args.mode)
+        t0 = time.perf_counter()
+        for _ in range(steps):
+            arena.step(dt)
+        per_step = (time.perf_counter() - t0) / steps
+        print(f"{size:8d} {n_agents:7d} {per_step * 1e6:9.0f} {per_step / (size + n_agents) * 1e9:10.0f} "
+              f"{arena.retargets:10d}")
+
+if __name__ == "__main__":
+    main()
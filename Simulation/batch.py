@@ -0,0 +1,290 @@
+"""Struct-of-arrays OrbitingAgent: N independent orbit/dive episodes stepped with NumPy.
+
+Every agent has its own target, so this is N copies of the (Target, OrbitingAgent)
+pair from entities.py, and `step` mirrors `OrbitingAgent.update` branch for branch.
+A pending OrbitingAgent.retarget() is carried per slot: (tx, ty) is then the
+handoff anchor and (next_tx, next_ty) the target it slides towards, which is
+the one `step_targets` moves.
+"""
+import argparse
+
+import numpy as np
+
+from .config import Config
+from .entities import OrbitingAgent
+
+ORBIT, INWARD, OUTWARD, WALL_GLIDE = 0, 1, 2, 3
+STATE_NAMES = ("ORBIT", "INWARD", "OUTWARD", "WALL_GLIDE")
+STATE_CODES = {name: code for code, name in enumerate(STATE_NAMES)}
+
+AXIS_NONE, AXIS_X, AXIS_Y = -1, 0, 1
+_AXIS_CODES = {None: AXIS_NONE, "x": AXIS_X, "y": AXIS_Y}
+_AXIS_NAMES = {AXIS_NONE: None, AXIS_X: "x", AXIS_Y: "y"}
+
+def normalize(x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Vector form of utils.normalize (degenerate vectors become (1, 0))."""
+    n = np.hypot(x, y)
+    small = n < 1e-9
+    n = np.where(small, 1.0, n)
+    return np.where(small, 1.0, x / n), np.where(small, 0.0, y / n)
+
+class BatchOrbitEngine:
+    """N orbiting agents (and their targets) held as parallel arrays."""
+
+    def __init__(self, cfg: Config, n: int):
+        self.cfg = cfg
+        self.n = n
+
+        self.tx = np.full(n, cfg.WIDTH * 0.5)
+        self.ty = np.full(n, cfg.HEIGHT * 0.5)
+
+        self.udx = np.ones(n)
+        self.udy = np.zeros(n)
+        self.radial_distance = np.full(n, cfg.ORBIT_RADIUS)
+        self.orbit_direction = np.ones(n, dtype=np.int8)
+        # Per-agent tangential speed so policies can speed up / slow down individually.
+        self.tangential_speed = np.full(n, cfg.TANGENTIAL_SPEED)
+
+        self.state = np.full(n, ORBIT, dtype=np.int8)
+        self.glide_axis = np.full(n, AXIS_NONE, dtype=np.int8)
+        self.glide_sign = np.zeros(n, dtype=np.int8)
+
+        self.gx = self.tx + self.udx * self.radial_distance
+        self.gy = self.ty + self.udy * self.radial_distance
+
+        self.dive_count = np.zeros(n, dtype=np.int64)
+
+        # Retargeting handoff (OrbitingAgent.next_target / handoff_speed)
+        self.handoff = np.zeros(n, dtype=bool)
+        self.next_tx = self.tx.copy()
+        self.next_ty = self.ty.copy()
+        self.handoff_speed = np.full(n, 1.5 * cfg.TARGET_SPEED)
+
+    # ---- bounds ----
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        m = self.cfg.SAFETY_MARGIN
+        return m, self.cfg.WIDTH - m, m, self.cfg.HEIGHT - m
+
+    # ---- commands ----
+    def trigger_dive(self, mask: np.ndarray):
+        go = mask & (self.state == ORBIT)
+        self.state[go] = INWARD
+        self.dive_count += go
+
+    def flip_orbit_dir(self, mask: np.ndarray):
+        self.orbit_direction[mask] *= -1
+
+    def step_targets(self, dt: float, ix: np.ndarray, iy: np.ndarray):
+        """Vector form of Target.step: ix/iy are per-agent input axes in [-1, 1].
+
+        Mid-handoff slots move their next target; the anchor only slides in step().
+        """
+        left, right, top, bottom = self.bounds
+        dx, dy = ix * self.cfg.TARGET_SPEED * dt, iy * self.cfg.TARGET_SPEED * dt
+        h = self.handoff
+        if h.any():
+            np.clip(np.where(h, self.next_tx + dx, self.next_tx), left, right, out=self.next_tx)
+            np.clip(np.where(h, self.next_ty + dy, self.next_ty), top, bottom, out=self.next_ty)
+            dx, dy = np.where(h, 0.0, dx), np.where(h, 0.0, dy)
+        np.clip(self.tx + dx, left, right, out=self.tx)
+        np.clip(self.ty + dy, top, bottom, out=self.ty)
+
+    # ---- scalar interop ----
+    def load_agent(self, i: int, agent: OrbitingAgent):
+        """Copy one scalar agent (and its target position, plus any pending handoff) into slot i."""
+        self.tx[i], self.ty[i] = agent.target.pos
+        self.handoff[i] = agent.next_target is not None
+        self.next_tx[i], self.next_ty[i] = (agent.next_target or agent.target).pos
+        self.handoff_speed[i] = agent.handoff_speed
+        self.udx[i], self.udy[i] = agent.udx, agent.udy
+        self.radial_distance[i] = agent.radial_distance
+        self.orbit_direction[i] = agent.orbit_direction
+        self.tangential_speed[i] = agent.cfg.TANGENTIAL_SPEED
+        self.state[i] = STATE_CODES[agent.state]
+        self.glide_axis[i] = _AXIS_CODES[agent.glide_axis]
+        self.glide_sign[i] = agent.glide_sign
+        self.gx[i], self.gy[i] = agent.gx, agent.gy
+        self.dive_count[i] = agent.dive_count
+
+    def store_agent(self, i: int, agent: OrbitingAgent):
+        """Write slot i back into a scalar agent (and its target).
+
+        A handoff the slot finished is finished on the agent too; the slot cannot
+        start one, since the agent would have no Target object to slide towards.
+        """
+        if agent.next_target is not None:
+            agent.next_target.x, agent.next_target.y = float(self.next_tx[i]), float(self.next_ty[i])
+            if not self.handoff[i]:
+                agent.target, agent.next_target = agent.next_target, None
+        elif self.handoff[i]:
+            raise ValueError(f"slot {i} is mid-handoff but the agent has no next_target")
+        agent.target.x, agent.target.y = float(self.tx[i]), float(self.ty[i])
+        agent.udx, agent.udy = float(self.udx[i]), float(self.udy[i])
+        agent.radial_distance = float(self.radial_distance[i])
+        agent.orbit_direction = int(self.orbit_direction[i])
+        agent.state = STATE_NAMES[self.state[i]]
+        agent.glide_axis = _AXIS_NAMES[int(self.glide_axis[i])]
+        agent.glide_sign = int(self.glide_sign[i])
+        agent.gx, agent.gy = float(self.gx[i]), float(self.gy[i])
+        agent.dive_count = int(self.dive_count[i])
+
+    def load_snapshot(self, snap: tuple, slots=slice(None)):
+        """Broadcast one OrbitingAgent.snapshot() into `slots` (all by default), pending handoff included."""
+        (self.tx[slots], self.ty[slots], self.udx[slots], self.udy[slots], self.radial_distance[slots],
+         self.orbit_direction[slots], state, axis, self.glide_sign[slots], self.gx[slots], self.gy[slots],
+         self.dive_count[slots], _, next_target, self.next_tx[slots], self.next_ty[slots],
+         self.handoff_speed[slots]) = snap
+        self.handoff[slots] = next_target is not None
+        self.state[slots] = STATE_CODES[state]
+        self.glide_axis[slots] = _AXIS_CODES[axis]
+        self.tangential_speed[slots] = self.cfg.TANGENTIAL_SPEED
+
+    # ---- stepping ----
+    def _phase_step(self, udx, udy, dt):
+        dtheta = (self.tangential_speed / self.cfg.ORBIT_RADIUS) * self.orbit_direction * dt
+        c, s = np.cos(dtheta), np.sin(dtheta)
+        return normalize(udx * c - udy * s, udx * s + udy * c)
+
+    def _slide_anchors(self, dt: float):
+        """Vector form of OrbitingAgent._slide_anchor for the slots mid-handoff."""
+        h = self.handoff
+        dx, dy = self.next_tx - self.tx, self.next_ty - self.ty
+        d = np.hypot(dx, dy)
+        step = self.handoff_speed * dt
+        arrive = h & (d <= step)
+        k = np.where(h & ~arrive, step / np.where(d > 0.0, d, 1.0), 0.0)
+        self.tx += dx * k
+        self.ty += dy * k
+        self.tx[arrive] = self.next_tx[arrive]
+        self.ty[arrive] = self.next_ty[arrive]
+        h[arrive] = False
+
+    def step(self, dt: float):
+        if self.handoff.any():
+            self._slide_anchors(dt)
+        cfg = self.cfg
+        R, eps = cfg.ORBIT_RADIUS, cfg.EPS
+        left, right, top, bottom = self.bounds
+        tx, ty = self.tx, self.ty
+        state = self.state
+        r = self.radial_distance
+
+        # Radial motion (diving in/out); masks are taken on the entry state like the if/elif chain.
+        inward = state == INWARD
+        outward = state == OUTWARD
+        orbit = state == ORBIT
+        glide = state == WALL_GLIDE
+
+        r_in = np.maximum(0.0, r - cfg.DIVE_SPEED * dt)
+        in_done = inward & (r_in <= eps)
+        r_out = np.minimum(R, r + cfg.DIVE_SPEED * dt)
+        out_done = outward & (r_out >= R - eps)
+        r = np.where(inward, np.where(in_done, eps, r_in), r)
+        r = np.where(outward, np.where(out_done, R, r_out), r)
+        r = np.where(orbit, R, r)
+        state[in_done] = OUTWARD
+        state[out_done] = ORBIT
+
+        cur_gx = tx + self.udx * r
+        cur_gy = ty + self.udy * r
+
+        # ---- ORBIT / INWARD / OUTWARD: predicted phase step, bounce or corner entry ----
+        move = ~glide
+        ndx, ndy = self._phase_step(self.udx, self.udy, dt)
+        gx_nom = tx + ndx * r
+        gy_nom = ty + ndy * r
+        lo_x, hi_x = gx_nom < left, gx_nom > right
+        lo_y, hi_y = gy_nom < top, gy_nom > bottom
+        hit_x = lo_x | hi_x
+        hit_y = lo_y | hi_y
+
+        free = move & ~hit_x & ~hit_y
+        bounce = move & (hit_x ^ hit_y)
+        corner = move & hit_x & hit_y
+
+        gx_ref = np.where(lo_x, 2 * left - gx_nom, np.where(hi_x, 2 * right - gx_nom, gx_nom))
+        gy_ref = np.where(lo_y, 2 * top - gy_nom, np.where(hi_y, 2 * bottom - gy_nom, gy_nom))
+        bdx, bdy = normalize(gx_ref - tx, gy_ref - ty)
+
+        d = self.orbit_direction
+        tx90 = np.where(d >= 0, -self.udy, self.udy)
+        ty90 = np.where(d >= 0, self.udx, -self.udx)
+        along_x = np.abs(tx90) >= np.abs(ty90)
+        cgx = np.where(along_x, cur_gx, np.where(lo_x, left, right))
+        cgy = np.where(along_x, np.where(lo_y, top, bottom), cur_gy)
+        cdx, cdy = normalize(cgx - tx, cgy - ty)
+
+        # ---- WALL_GLIDE: slide along the wall, rejoin the circle when a step fits ----
+        step = self.glide_sign * self.tangential_speed * dt
+        on_x = self.glide_axis == AXIS_X
+        ggx = np.where(on_x, np.clip(self.gx + step, left, right),
+                       np.where(np.abs(self.gx - left) < np.abs(self.gx - right), left, right))
+        ggy = np.where(on_x, np.where(np.abs(self.gy - top) < np.abs(self.gy - bottom), top, bottom),
+                       np.clip(self.gy + step, top, bottom))
+        gdx, gdy = normalize(ggx - tx, ggy - ty)
+        g_r = np.hypot(ggx - tx, ggy - ty)
+        test_dx, test_dy = self._phase_step(gdx, gdy, dt)
+        gx_test = tx + test_dx * R
+        gy_test = ty + test_dy * R
+        rejoin = glide & (left <= gx_test) & (gx_test <= right) & (top <= gy_test) & (gy_test <= bottom)
+        rdx, rdy = normalize(test_dx, test_dy)
+        gdx = np.where(rejoin, rdx, gdx)
+        gdy = np.where(rejoin, rdy, gdy)
+        g_r = np.where(rejoin, R, g_r)
+        ggx = np.where(rejoin, tx + gdx * R, ggx)
+        ggy = np.where(rejoin, ty + gdy * R, ggy)
+        stuck = glide & ((ggx == left) | (ggx == right)) & ((ggy == top) | (ggy == bottom))
+
+        # ---- commit ----
+        self.udx = np.select([free, bounce, corner, glide], [ndx, bdx, cdx, gdx], self.udx)
+        self.udy = np.select([free, bounce, corner, glide], [ndy, bdy, cdy, gdy], self.udy)
+        self.gx = np.select([free, bounce, corner, glide], [gx_nom, gx_ref, cgx, ggx], self.gx)
+        self.gy = np.select([free, bounce, corner, glide], [gy_nom, gy_ref, cgy, ggy], self.gy)
+        self.radial_distance = np.where(glide, g_r, r)
+
+        self.orbit_direction[bounce] *= -1
+        state[corner] = WALL_GLIDE
+        state[rejoin] = ORBIT
+        self.glide_axis[corner] = np.where(along_x[corner], AXIS_X, AXIS_Y)
+        self.glide_sign[corner] = np.where(np.where(along_x, tx90, ty90)[corner] >= 0, 1, -1)
+        self.glide_sign[stuck] *= -1
+
+def max_deviation(cfg: Config, n: int = 256, steps: int = 2000, seed: int = 0, dt: float | None = None) -> float:
+    """Run N scalar agents and the batch engine on the same random inputs; return the largest position error."""
+    from .headless import HeadlessSim, RandomWalk
+
+    dt = dt if dt is not None else cfg.PHYSICS_DT
+    sims = [HeadlessSim(cfg, dt, RandomWalk(seed + i, p_dive=0.01, p_flip=0.005)) for i in range(n)]
+    eng = BatchOrbitEngine(cfg, n)
+    ix, iy = np.zeros(n), np.zeros(n)
+    dive, flip = np.zeros(n, dtype=bool), np.zeros(n, dtype=bool)
+    worst = 0.0
+    for k in range(steps):
+        for i, sim in enumerate(sims):
+            cmd = sim.script(k)
+            ix[i], iy[i], dive[i], flip[i] = cmd.ix, cmd.iy, cmd.dive, cmd.flip
+            sim.step(cmd)
+        eng.trigger_dive(dive)
+        eng.flip_orbit_dir(flip)
+        eng.step_targets(dt, ix, iy)
+        eng.step(dt)
+        gx = np.array([s.agent.gx for s in sims])
+        gy = np.array([s.agent.gy for s in sims])
+        worst = max(worst, float(np.max(np.hypot(gx - eng.gx, gy - eng.gy))))
+        # Re-sync so float noise cannot flip a later branch decision and compound.
+        for i, sim in enumerate(sims):
+            eng.load_agent(i, sim.agent)
+    return worst
+
+def main():
+    ap = argparse.ArgumentParser(description="Check the batch engine against the scalar OrbitingAgent.")
+    ap.add_argument("--agents", type=int, default=256)
+    ap.add_argument("--steps", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    err = max_deviation(Config(), args.agents, args.steps, args.seed)
+    print(f"max |batch - scalar| position error: {err:.3e} px")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Off-thread frame capture: image sequences or a raw video stream, never blocking the game loop.
+
+    python -m Simulation.main --capture frames/            # frames/frame_000123.bmp (or --capture-format png)
+    python -m Simulation.main --capture run.rgb0           # raw RGBX stream + run.rgb0.json
+    python -m Simulation.main --capture run.mp4            # piped through ffmpeg, if installed
+
+`grab` copies the display surface into bytes (a fraction of a millisecond for
+a 32-bit 800x600 window) and hands it to a bounded queue drained by writer
+threads; the loop itself never waits on encoding or disk. When the queue is
+full the frame is dropped, and with `throttle` the capture interval doubles
+(every 2nd, 4th, ... frame) until the writers catch up, then relaxes again.
+Frame numbers are kept: image files are named by frame, and the raw stream's
+sidecar JSON lists which frames it holds. The physics runs on the fixed
+PHYSICS_DT accumulator, so capture load can shift how many steps land in a
+frame but never the step size or its outcome. BMP/TGA and raw streams are
+cheap to write; PNG/JPEG encoding is CPU-bound and on a single core competes
+with the game loop for time, so prefer them only with cores to spare.
+
+A failed write (disk full, ffmpeg gone) is kept in `error`: from then on
+`grab` drops every frame, the writers only drain the queue, and `close`
+raises it once everything is shut down.
+"""
+import json
+import os
+import queue
+import shutil
+import subprocess
+import threading
+from typing import Any
+
+import pygame
+
+IMAGE_FORMATS = ("bmp", "tga", "png", "jpg")
+
+class FrameCapture:
+    """Bounded-queue frame grabber with a pool of writer threads (one ordered writer for streams)."""
+
+    def __init__(self, path: str, size: tuple[int, int], fps: int = 60, image_format: str = "bmp",
+                 workers: int = 2, depth: int = 16, every: int = 1, throttle: bool = True):
+        self.path = path
+        self.size = size
+        self.fps = fps
+        self.every = every
+        self.base_every = every
+        self.throttle = throttle
+        self.frames = 0      # grab() calls
+        self.queued = 0
+        self.dropped = 0
+        self.written = 0
+        self.error: Exception | None = None  # first failed write, if any
+        self._index: list[int] = []
+        self._lock = threading.Lock()
+        self._q: queue.Queue = queue.Queue(maxsize=depth)
+        self._proc = self._file = None
+
+        ext = os.path.splitext(path)[1].lower()
+        if ext in (".rgb0", ".raw"):
+            self.mode = "raw"
+            self._file = open(path, "wb")
+        elif ext in (".mp4", ".mkv", ".webm", ".avi"):
+            ffmpeg = shutil.which("ffmpeg")
+            if not ffmpeg:
+                raise ValueError(f"writing {ext} needs ffmpeg on PATH; capture to a .rgb0 stream or an image directory")
+            self.mode = "raw"
+            w, h = size
+            self._proc = subprocess.Popen(
+                [ffmpeg, "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", "rgb0", "-s", f"{w}x{h}",
+                 "-r", str(fps), "-i", "-", "-pix_fmt", "yuv420p", path], stdin=subprocess.PIPE)
+            self._file = self._proc.stdin
+        else:
+            if image_format not in IMAGE_FORMATS:
+                raise ValueError(f"image format must be one of {IMAGE_FORMATS}")
+            self.mode = "images"
+            self.image_format = image_format
+            os.makedirs(path, exist_ok=True)
+        # A stream must stay in frame order, so it gets a single writer.
+        n = workers if self.mode == "images" else 1
+        self._threads = [threading.Thread(target=self._writer, name=f"capture-writer-{k}", daemon=True)
+                         for k in range(n)]
+        for t in self._threads:
+            t.start()
+
+    def grab(self, surf: pygame.Surface):
+        """Queue this frame (or count it as dropped); call once per presented frame."""
+        k = self.frames
+        self.frames += 1
+        if k % self.every:
+            return
+        if self.error is not None:
+            self.dropped += 1
+            return
+        try:
+            self._q.put_nowait((k, pygame.image.tobytes(surf, "RGBX")))
+        except queue.Full:
+            self.dropped += 1
+            if self.throttle:
+                self.every = min(self.every * 2, 64)
+            return
+        self.queued += 1
+        if self.every > self.base_every and self._q.qsize() <= self._q.maxsize // 4:
+            self.every = max(self.base_every, self.every // 2)
+
+    def _writer(self):
+        while True:
+            item = self._q.get()
+            if item is None:
+                return
+            if self.error is not None:
+                continue  # keep draining so neither grab() nor close() can block on a dead writer
+            k, data = item
+            try:
+                if self.mode == "images":
+                    surf = pygame.image.frombytes(data, self.size, "RGBX")
+                    pygame.image.save(surf, os.path.join(self.path, f"frame_{k:06d}.{self.image_format}"))
+                else:
+                    self._file.write(data)
+                    self._index.append(k)
+            except Exception as e:
+                self._fail(e)
+                continue
+            with self._lock:
+                self.written += 1
+
+    def _fail(self, e: Exception):
+        with self._lock:
+            if self.error is None:
+                self.error = e
+
+    def stats(self) -> dict[str, Any]:
+        d = {"frames": self.frames, "queued": self.queued, "dropped": self.dropped, "written": self.written,
+             "every": self.every}
+        if self.error is not None:
+            d["error"] = repr(self.error)
+        return d
+
+    def close(self):
+        """Flush the queue and stop the writers; raises RuntimeError if a write failed."""
+        stops = len(self._threads)
+        while stops:
+            try:
+                self._q.put(None, timeout=0.1)
+                stops -= 1
+            except queue.Full:
+                if not any(t.is_alive() for t in self._threads):
+                    break
+        for t in self._threads:
+            t.join()
+        self._threads = []
+        if self._file:
+            try:
+                self._file.close()
+            except OSError as e:  # e.g. ffmpeg exited: the final flush hits a broken pipe
+                self._fail(e)
+            self._file = None
+        if self._proc:
+            self._proc.wait()
+        if self.mode == "raw" and not self._proc:
+            w, h = self.size
+            with open(self.path + ".json", "w") as f:
+                json.dump({"width": w, "height": h, "fps": self.fps, "pix_fmt": "rgb0", "frames": self._index,
+                           "ffmpeg": f"ffmpeg -f rawvideo -pix_fmt rgb0 -s {w}x{h} -r {self.fps} -i {self.path} out.mp4"},
+                          f, indent=2)
+        if self.error is not None:
+            raise RuntimeError(f"frame capture to {self.path} failed after {self.written} frames") from self.error
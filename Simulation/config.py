@@ -6,6 +6,11 @@ class Config:
     HEIGHT: int = 600
     FPS: int = 60
 
+    # Physics runs at a fixed rate independent of FPS; rendering interpolates between steps.
+    PHYSICS_HZ: int = 240
+    MAX_FRAME_TIME: float = 0.25  # longest wall-clock frame fed to the accumulator (avoids a spiral of death)
+    TIME_WARP_LEVELS: tuple[int, ...] = (1, 2, 4, 8, 16, 32, 64)
+
     ORBIT_RADIUS: float = 120.0
     TANGENTIAL_SPEED: float = 300.0
     DIVE_SPEED: float = 320.0
@@ -23,6 +28,10 @@ class Config:
 
     DEBUG: bool = True
 
+    @property
+    def PHYSICS_DT(self) -> float:
+        return 1.0 / self.PHYSICS_HZ
+
     @property
     def ANGULAR_SPEED(self) -> float:
         # v_t = r * omega -> omega = v_t / r
@@ -0,0 +1,348 @@
+"""Real-time control loop on its own thread, decoupled from rendering.
+
+    loop = ControlLoop(AgentPlant(agent), transport, hz=500)
+    loop.start()
+    ...
+    snap = loop.buffer.read()      # renderer side: latest state, no lock
+    ...
+    loop.stop(); print(loop.jitter.report())
+
+    python -m Simulation.control --hz 1000 --seconds 5 [--backend phys] [--transport udp]
+
+Each tick the loop drains the transport (POSE messages move the target, CMD
+messages carry BTN_* bits), steps the plant by 1/hz, sends an ACT message with
+the commanded position and publishes a snapshot. Ticks are scheduled on
+absolute deadlines, so a late tick does not shift the ones after it.
+
+Snapshots go through a SeqlockBuffer: the writer bumps a sequence number to
+odd, fills the row, then bumps it back to even. A reader copies the row and
+retries if the sequence was odd or changed meanwhile, so it never returns a
+half-written row and the writer never blocks. This does not lean on the GIL
+keeping the row copy atomic, only on int reads and writes of `_seq` being
+atomic, which holds for any CPython build.
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+import numpy as np
+
+from .batch import STATE_CODES
+from .recorder import BTN_DIVE, BTN_FLIP
+
+POSE, CMD, ACT = 1, 2, 3
+# kind, time, then three payload floats: POSE (x, y, -), CMD (buttons, -, -), ACT (x, y, state)
+MESSAGE = struct.Struct("<Bdddd")
+
+class Snapshot(NamedTuple):
+    step: int
+    t: float
+    tx: float
+    ty: float
+    x: float
+    y: float
+    state: int          # batch.STATE_CODES
+    orbit_dir: int
+    radial: float
+    dives: int
+
+class SeqlockBuffer:
+    """Single-writer, many-reader latest-value buffer of Snapshot rows (a seqlock)."""
+
+    def __init__(self):
+        self._row = np.zeros(len(Snapshot._fields))
+        self._seq = 0  # odd while a write is in progress
+
+    def write(self, values: tuple):
+        self._seq += 1
+        self._row[:] = values
+        self._seq += 1
+
+    def read(self) -> Snapshot | None:
+        while True:
+            seq = self._seq
+            if not seq:
+                return None
+            if seq & 1:
+                continue
+            row = self._row.tolist()
+            if self._seq == seq:
+                break
+        return Snapshot(int(row[0]), row[1], row[2], row[3], row[4], row[5], int(row[6]), int(row[7]), row[8],
+                        int(row[9]))
+
+    @property
+    def seq(self) -> int:
+        """Completed writes so far."""
+        return self._seq // 2
+
+# ---- transports ----
+
+class LoopbackTransport:
+    """In-process endpoint; build connected pairs with loopback_pair()."""
+
+    def __init__(self):
+        self.inbox: deque[tuple] = deque()
+        self.peer: LoopbackTransport | None = None
+
+    def send(self, kind: int, t: float, a: float = 0.0, b: float = 0.0, c: float = 0.0):
+        self.peer.inbox.append((kind, t, a, b, c))
+
+    def poll(self) -> list[tuple]:
+        out = []
+        inbox = self.inbox
+        while inbox:
+            out.append(inbox.popleft())
+        return out
+
+    def close(self):
+        pass
+
+def loopback_pair() -> tuple[LoopbackTransport, LoopbackTransport]:
+    a, b = LoopbackTransport(), LoopbackTransport()
+    a.peer, b.peer = b, a
+    return a, b
+
+class UDPTransport:
+    """Non-blocking datagram endpoint speaking MESSAGE packets; a stand-in for the robot link."""
+
+    def __init__(self, bind: tuple[str, int] = ("127.0.0.1", 0), peer: tuple[str, int] | None = None):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(bind)
+        self.sock.setblocking(False)
+        self.peer = peer
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self.sock.getsockname()
+
+    def send(self, kind: int, t: float, a: float = 0.0, b: float = 0.0, c: float = 0.0):
+        if self.peer:
+            self.sock.sendto(MESSAGE.pack(kind, t, a, b, c), self.peer)
+
+    def poll(self) -> list[tuple]:
+        out = []
+        while True:
+            try:
+                data = self.sock.recv(MESSAGE.size)
+            except (BlockingIOError, InterruptedError):
+                return out
+            if len(data) == MESSAGE.size:
+                out.append(MESSAGE.unpack(data))
+
+    def close(self):
+        self.sock.close()
+
+def udp_pair() -> tuple[UDPTransport, UDPTransport]:
+    a, b = UDPTransport(), UDPTransport()
+    a.peer, b.peer = b.address, a.address
+    return a, b
+
+# ---- plants ----
+
+class AgentPlant:
+    """Kinematic Target/OrbitingAgent behind the control-loop interface."""
+
+    def __init__(self, agent):
+        self.agent = agent
+
+    def set_target(self, x: float, y: float):
+        self.agent.target.x, self.agent.target.y = x, y
+
+    def command(self, buttons: int):
+        if buttons & BTN_DIVE:
+            self.agent.trigger_dive()
+        if buttons & BTN_FLIP:
+            self.agent.flip_orbit_dir()
+
+    def step(self, dt: float):
+        self.agent.update(dt)
+
+    def values(self, step: int, t: float) -> tuple:
+        a = self.agent
+        return (step, t, a.target.x, a.target.y, a.gx, a.gy,
+                STATE_CODES[a.state], a.orbit_direction, a.radial_distance, a.dive_count)
+
+class RobotPlant:
+    """phys_sim Target/Robot behind the control-loop interface."""
+
+    def __init__(self, robot):
+        self.robot = robot
+
+    def set_target(self, x: float, y: float):
+        body = self.robot.target.body
+        body.x, body.y = x, y
+
+    def command(self, buttons: int):
+        if buttons & BTN_DIVE:
+            self.robot.command_dive()
+        if buttons & BTN_FLIP:
+            self.robot.flip_orbit()
+
+    def step(self, dt: float):
+        self.robot.update(dt)
+
+    def values(self, step: int, t: float) -> tuple:
+        b, tb = self.robot.body, self.robot.target.body
+        return (step, t, tb.x, tb.y, b.x, b.y, STATE_CODES[self.robot.state], self.robot.orbit_dir,
+                math.hypot(b.x - tb.x, b.y - tb.y), self.robot.dives)
+
+# ---- loop ----
+
+class JitterStats:
+    """Tick lateness (start - deadline), period and compute time over the last `window` ticks."""
+
+    def __init__(self, period: float, window: int = 10000):
+        self.period = period
+        self.window = window
+        self.rows = np.zeros((window, 3))  # lateness, period, compute (s)
+        self.ticks = 0
+        self.overruns = 0  # ticks whose compute time exceeded the period
+
+    def add(self, lateness: float, period: float, compute: float):
+        self.rows[self.ticks % self.window] = (lateness, period, compute)
+        self.ticks += 1
+        self.overruns += compute > self.period
+
+    def report(self) -> dict[str, float]:
+        """Milliseconds: lateness p50/p99/max, period mean/std, compute mean/max; plus counts."""
+        rows = self.rows[:min(self.ticks, self.window)] * 1e3
+        if not len(rows):
+            return {"ticks": 0}
+        late, period, compute = rows[:, 0], rows[1:, 1], rows[:, 2]
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "late_p50_ms": float(np.percentile(late, 50)),
+            "late_p99_ms": float(np.percentile(late, 99)),
+            "late_max_ms": float(late.max()),
+            "period_mean_ms": float(period.mean()) if len(period) else 0.0,
+            "period_std_ms": float(period.std()) if len(period) else 0.0,
+            "compute_mean_ms": float(compute.mean()),
+            "compute_max_ms": float(compute.max()),
+        }
+
+class ControlLoop:
+    """Steps a plant at `hz` on a daemon thread; see the module docstring.
+
+    `spin` is the tail of each wait spent busy-polling instead of sleeping,
+    which trades CPU for lower lateness. While running, the interpreter's
+    thread switch interval is lowered to `switch_interval` so the render
+    thread cannot hold the GIL for the default 5 ms.
+    """
+
+    def __init__(self, plant, transport, hz: float = 500.0, spin: float = 0.0005, switch_interval: float = 0.0005):
+        self.plant = plant
+        self.transport = transport
+        self.hz = hz
+        self.dt = 1.0 / hz
+        self.spin = spin
+        self.switch_interval = switch_interval
+        self.buffer = SeqlockBuffer()
+        self.jitter = JitterStats(self.dt)
+        self.steps = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._saved_interval = sys.getswitchinterval()
+
+    def start(self):
+        self._stop.clear()
+        self._saved_interval = sys.getswitchinterval()
+        sys.setswitchinterval(self.switch_interval)
+        self.buffer.write(self.plant.values(self.steps, 0.0))
+        self._thread = threading.Thread(target=self._run, name="control-loop", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        sys.setswitchinterval(self._saved_interval)
+
+    def tick(self, t: float):
+        plant = self.plant
+        buttons = 0
+        for kind, _, a, b, _ in self.transport.poll():
+            if kind == POSE:
+                plant.set_target(a, b)
+            elif kind == CMD:
+                buttons |= int(a)
+        if buttons:
+            plant.command(buttons)
+        plant.step(self.dt)
+        self.steps += 1
+        values = plant.values(self.steps, t)
+        self.transport.send(ACT, t, values[4], values[5], values[6])
+        self.buffer.write(values)
+
+    def _run(self):
+        clock = time.perf_counter
+        t0 = clock()
+        deadline = t0
+        prev = t0
+        while not self._stop.is_set():
+            deadline += self.dt
+            now = clock()
+            if deadline - now > self.spin:
+                time.sleep(deadline - now - self.spin)
+            while clock() < deadline:
+                pass
+            start = clock()
+            self.tick(start - t0)
+            end = clock()
+            self.jitter.add(start - deadline, start - prev, end - start)
+            prev = start
+            if end - deadline > 4 * self.dt:
+                deadline = end  # fell far behind (e.g. a debugger stop): resync instead of bursting
+
+def main():
+    from .config import Config
+    from .entities import OrbitingAgent, Target
+
+    ap = argparse.ArgumentParser(description="Run the control loop against a scripted sensor and report jitter.")
+    ap.add_argument("--hz", type=float, default=1000.0)
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--backend", choices=("kinematic", "phys"), default="kinematic")
+    ap.add_argument("--transport", choices=("loopback", "udp"), default="loopback")
+    ap.add_argument("--sensor-hz", type=float, default=120.0, help="rate of the stand-in target pose sensor")
+    args = ap.parse_args()
+
+    if args.backend == "phys":
+        from .all_in_one import phys_sim
+        cfg = phys_sim.Config()
+        plant = RobotPlant(phys_sim.Robot(cfg, phys_sim.Target(cfg)))
+    else:
+        cfg = Config()
+        plant = AgentPlant(OrbitingAgent(cfg, Target(cfg)))
+    ctl_end, dev_end = udp_pair() if args.transport == "udp" else loopback_pair()
+
+    loop = ControlLoop(plant, ctl_end, args.hz)
+    loop.start()
+    t0 = time.perf_counter()
+    acts = 0
+    while (t := time.perf_counter() - t0) < args.seconds:
+        # stand-in sensor: the target drifts on a Lissajous path, with a dive command every second
+        dev_end.send(POSE, t, cfg.WIDTH * (0.5 + 0.2 * math.cos(0.7 * t)), cfg.HEIGHT * (0.5 + 0.2 * math.sin(1.1 * t)))
+        if int(t) != int(t - 1.0 / args.sensor_hz):
+            dev_end.send(CMD, t, BTN_DIVE)
+        acts += sum(m[0] == ACT for m in dev_end.poll())
+        time.sleep(1.0 / args.sensor_hz)
+    loop.stop()
+    ctl_end.close()
+    dev_end.close()
+
+    print(f"{args.backend} @ {args.hz:.0f} Hz over {args.transport}: {acts} ACT messages received")
+    for k, v in loop.jitter.report().items():
+        print(f"  {k:16s} {v:.4f}" if isinstance(v, float) else f"  {k:16s} {v}")
+
+if __name__ == "__main__":
+    main()
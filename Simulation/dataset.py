@@ -0,0 +1,223 @@
+"""Behavior-cloning dataset: (observation, action) samples streamed into fixed-size .npy shards.
+
+Directory layout:
+    index.json              obs_dim, action names, shard size and per-shard sample counts
+    shard_00000.obs.npy     (k, OBS_DIM) float32
+    shard_00000.act.npy     (k,) int8, env.ACTION_NAMES index
+    shard_00000.move.npy    (k, 2) int8, target move axes (arrow keys / script) at that step
+
+BCLogger fills one preallocated shard buffer at a time; a full buffer goes to a
+writer thread and the logger carries on with a free one. There are `depth`
+buffers in total, so memory stays bounded and logging only blocks if the
+writer is that far behind. If a shard write fails the writer keeps recycling
+buffers and the error is raised from the next flush or from close(). BCDataset
+memory-maps the shards and yields shuffled minibatches from a few shards at a
+time, so only those pages are touched.
+
+    python -m Simulation.main --bc-log data/human      # log human play
+    python -m Simulation.dataset collect data/scripted --steps 2000000
+    python -m Simulation.dataset info data/scripted
+"""
+import argparse
+import json
+import os
+import queue
+import threading
+from typing import Iterator
+
+import numpy as np
+
+from .env import ACTION_NAMES, DIVE, FLIP_DIR, KEEP
+from .obs import OBS_DIM, observe_agent, observe_robot
+
+INDEX = "index.json"
+
+def _shard_path(root: str, k: int, column: str) -> str:
+    return os.path.join(root, f"shard_{k:05d}.{column}.npy")
+
+class BCLogger:
+    """Appends samples to shards under `root` through a pool of `depth` buffers and a writer thread."""
+
+    def __init__(self, root: str, cfg, shard_size: int = 65536, depth: int = 3):
+        self.root = root
+        self.cfg = cfg
+        self.shard_size = shard_size
+        os.makedirs(root, exist_ok=True)
+        self.counts: list[int] = []
+        self.count = 0
+        self.error: Exception | None = None  # first failed shard write, if any
+        self._free: queue.Queue = queue.Queue()
+        for _ in range(depth):
+            self._free.put((np.zeros((shard_size, OBS_DIM), dtype=np.float32),
+                            np.zeros(shard_size, dtype=np.int8),
+                            np.zeros((shard_size, 2), dtype=np.int8)))
+        self._q: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._writer, name="bc-writer", daemon=True)
+        self._thread.start()
+        self._take()
+        self._closed = False
+
+    def _take(self):
+        self.obs, self.act, self.move = self._free.get()  # blocks only if every buffer is queued for writing
+        self.i = 0
+
+    def commit(self, action: int, ix: int = 0, iy: int = 0):
+        """Finish the current row (its observation already written, e.g. by stage_agent) as one sample."""
+        i = self.i
+        self.act[i] = action
+        self.move[i, 0] = ix
+        self.move[i, 1] = iy
+        self.i = i + 1
+        self.count += 1
+        if self.i == self.shard_size:
+            self._flush()
+
+    def _flush(self):
+        self._check()
+        self._q.put((len(self.counts), self.i, (self.obs, self.act, self.move)))
+        self.counts.append(self.i)
+        self._take()
+
+    def log(self, obs: np.ndarray, action: int, ix: int = 0, iy: int = 0):
+        self.obs[self.i] = obs
+        self.commit(action, ix, iy)
+
+    def stage_agent(self, agent):
+        """Observe a kinematic OrbitingAgent into the current row, labelled later by commit()."""
+        observe_agent(self.cfg, agent, self.obs[self.i])
+
+    def log_agent(self, agent, action: int, ix: int = 0, iy: int = 0):
+        """Observe a kinematic OrbitingAgent straight into the shard buffer."""
+        self.stage_agent(agent)
+        self.commit(action, ix, iy)
+
+    def log_robot(self, robot, action: int, ix: int = 0, iy: int = 0):
+        observe_robot(self.cfg, robot, self.obs[self.i])
+        self.commit(action, ix, iy)
+
+    def _writer(self):
+        while True:
+            item = self._q.get()
+            if item is None:
+                return
+            k, n, bufs = item
+            if self.error is None:
+                try:
+                    for column, arr in zip(("obs", "act", "move"), bufs):
+                        np.save(_shard_path(self.root, k, column), arr[:n])
+                except Exception as e:
+                    self.error = e
+            self._free.put(bufs)  # always recycled, so _take() never waits on a failed write
+
+    def _check(self):
+        if self.error is not None:
+            raise RuntimeError(f"behavior-cloning log to {self.root} failed writing a shard") from self.error
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self.i and self.error is None:
+            self._flush()
+        self._q.put(None)
+        self._thread.join()
+        self._check()
+        with open(os.path.join(self.root, INDEX), "w") as f:
+            json.dump({"obs_dim": OBS_DIM, "actions": ACTION_NAMES, "shard_size": self.shard_size,
+                       "counts": self.counts}, f, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def action_of(dive: bool, flip: bool) -> int:
+    """Button presses as a discrete action (a dive wins over a flip pressed in the same step)."""
+    return DIVE if dive else FLIP_DIR if flip else KEEP
+
+class BCDataset:
+    """Memory-mapped view over a BCLogger directory."""
+
+    def __init__(self, root: str):
+        self.root = root
+        with open(os.path.join(root, INDEX)) as f:
+            self.index = json.load(f)
+        self.counts = self.index["counts"]
+        self.obs = [np.load(_shard_path(root, k, "obs"), mmap_mode="r") for k in range(len(self.counts))]
+        self.act = [np.load(_shard_path(root, k, "act"), mmap_mode="r") for k in range(len(self.counts))]
+        self.move = [np.load(_shard_path(root, k, "move"), mmap_mode="r") for k in range(len(self.counts))]
+        self.offsets = np.concatenate(([0], np.cumsum(self.counts))).astype(np.int64)
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    def __getitem__(self, i: int) -> tuple[np.ndarray, int]:
+        k = int(np.searchsorted(self.offsets, i, side="right")) - 1
+        j = i - int(self.offsets[k])
+        return np.asarray(self.obs[k][j]), int(self.act[k][j])
+
+    def action_counts(self) -> np.ndarray:
+        return sum((np.bincount(a, minlength=len(ACTION_NAMES)) for a in self.act),
+                   np.zeros(len(ACTION_NAMES), dtype=np.int64))
+
+    def batches(self, batch_size: int, seed: int = 0, window: int = 4) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """One shuffled epoch: shards in random order, `window` of them at a time, samples permuted
+        across the window. Yields copied (obs, act) arrays; RAM use is about `window` shards."""
+        rng = np.random.default_rng(seed)
+        order = rng.permutation(len(self.counts))
+        for w in range(0, len(order), window):
+            group = np.sort(order[w:w + window])
+            obs = np.concatenate([self.obs[k] for k in group])
+            act = np.concatenate([self.act[k] for k in group])
+            perm = rng.permutation(len(act))
+            for s in range(0, len(perm), batch_size):
+                idx = perm[s:s + batch_size]
+                yield obs[idx], act[idx]
+
+def collect(root: str, steps: int, seed: int = 0, p_dive: float = 0.005, p_flip: float = 0.003,
+            shard_size: int = 65536) -> int:
+    """Log a headless RandomWalk run (target moves plus random dives/flips) as BC samples."""
+    from .config import Config
+    from .headless import HeadlessSim, RandomWalk
+
+    cfg = Config()
+    sim = HeadlessSim(cfg, script=RandomWalk(seed, p_dive=p_dive, p_flip=p_flip))
+    with BCLogger(root, cfg, shard_size) as log:
+        for k in range(steps):
+            cmd = sim.script(k)
+            log.log_agent(sim.agent, action_of(cmd.dive, cmd.flip), int(cmd.ix), int(cmd.iy))
+            sim.step(cmd)
+    return steps
+
+def main():
+    import time
+
+    ap = argparse.ArgumentParser(description="Behavior-cloning datasets: collect scripted play or inspect a directory.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    c = sub.add_parser("collect", help="log a scripted RandomWalk run")
+    c.add_argument("root")
+    c.add_argument("--steps", type=int, default=1_000_000)
+    c.add_argument("--seed", type=int, default=0)
+    c.add_argument("--shard-size", type=int, default=65536)
+    i = sub.add_parser("info", help="print sample/action counts and time one shuffled epoch")
+    i.add_argument("root")
+    i.add_argument("--batch", type=int, default=256)
+    args = ap.parse_args()
+
+    if args.cmd == "collect":
+        t0 = time.perf_counter()
+        n = collect(args.root, args.steps, args.seed, shard_size=args.shard_size)
+        dt = time.perf_counter() - t0
+        print(f"{n:,} samples in {dt:.2f} s ({n / dt:,.0f}/s) -> {args.root}")
+        return
+    ds = BCDataset(args.root)
+    counts = ds.action_counts()
+    print(f"{len(ds):,} samples in {len(ds.counts)} shards; " +
+          ", ".join(f"{name}={int(c):,}" for name, c in zip(ACTION_NAMES, counts)))
+    t0 = time.perf_counter()
+    batches = sum(1 for _ in ds.batches(args.batch))
+    print(f"shuffled epoch: {batches:,} batches of {args.batch} in {time.perf_counter() - t0:.2f} s")
+
+if __name__ == "__main__":
+    main()
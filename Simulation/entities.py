@@ -1,8 +1,13 @@
+from __future__ import annotations
+
 import math
-import pygame
+from typing import TYPE_CHECKING
 from .config import Config
 from .utils import clamp, normalize, reflect_point, rotate90
 
+if TYPE_CHECKING:
+    import pygame
+
 class Target:
     """The red target the agent rotates around. (Moves with arrow keys)"""
 
@@ -16,8 +21,15 @@ class Target:
         return self.x, self.y
 
     def update(self, dt: float, keys):
-        tvx = (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * self.cfg.TARGET_SPEED
-        tvy = (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * self.cfg.TARGET_SPEED
+        import pygame
+        self.step(dt,
+                  keys[pygame.K_RIGHT] - keys[pygame.K_LEFT],
+                  keys[pygame.K_DOWN] - keys[pygame.K_UP])
+
+    def step(self, dt: float, ix: float, iy: float):
+        """Move with an input axis in [-1, 1] per direction (keys or a script)."""
+        tvx = ix * self.cfg.TARGET_SPEED
+        tvy = iy * self.cfg.TARGET_SPEED
 
         self.x = clamp(self.x + tvx * dt,
                        self.cfg.SAFETY_MARGIN,
@@ -26,10 +38,13 @@ class Target:
                        self.cfg.SAFETY_MARGIN,
                        self.cfg.HEIGHT - self.cfg.SAFETY_MARGIN)
 
-    def draw(self, surf: pygame.Surface):
-        pygame.draw.circle(surf, self.cfg.RED, (int(self.x), int(self.y)), self.cfg.DOT_RADIUS)
+    def draw(self, surf: pygame.Surface, pos: tuple[float, float] | None = None) -> pygame.Rect:
+        import pygame
+        x, y = pos or self.pos
+        dot = pygame.draw.circle(surf, self.cfg.RED, (int(x), int(y)), self.cfg.DOT_RADIUS)
         # orbit guide circle
-        pygame.draw.circle(surf, self.cfg.WHITE, (int(self.x), int(self.y)), int(self.cfg.ORBIT_RADIUS), 1)
+        ring = pygame.draw.circle(surf, self.cfg.WHITE, (int(x), int(y)), int(self.cfg.ORBIT_RADIUS), 1)
+        return dot.union(ring)
 
 class OrbitingAgent:
     """The green agent that orbits/dives/glides relative to the target."""
@@ -54,9 +69,55 @@ class OrbitingAgent:
         self.gx = self.target.x + self.udx * self.radial_distance
         self.gy = self.target.y + self.udy * self.radial_distance
 
-        # Stats
+        # Stats (per-step episode metrics live in profiler.SimStats)
         self.dive_count = 0
-        self.min_center_dist = float("inf")
+
+        # Retargeting: while switching, `target` is an anchor sliding towards `next_target`
+        self.next_target: Target | None = None
+        self.handoff_speed = 1.5 * cfg.TARGET_SPEED
+
+    def snapshot(self) -> tuple:
+        """Flat tuple of everything update() reads or writes, target position included.
+
+        A pending retarget() is part of it: the target (or handoff anchor) and
+        next target objects, the next target's position and the handoff speed.
+        """
+        nxt = self.next_target or self.target
+        return (self.target.x, self.target.y, self.udx, self.udy, self.radial_distance, self.orbit_direction,
+                self.state, self.glide_axis, self.glide_sign, self.gx, self.gy, self.dive_count,
+                self.target, self.next_target, nxt.x, nxt.y, self.handoff_speed)
+
+    def restore(self, s: tuple):
+        (tx, ty, self.udx, self.udy, self.radial_distance, self.orbit_direction,
+         self.state, self.glide_axis, self.glide_sign, self.gx, self.gy, self.dive_count,
+         self.target, self.next_target, nx, ny, self.handoff_speed) = s
+        self.target.x, self.target.y = tx, ty
+        if self.next_target is not None:
+            self.next_target.x, self.next_target.y = nx, ny
+
+    def retarget(self, target: Target, speed: float | None = None):
+        """Orbit `target` from now on. The orbit centre slides over at `speed` px/s (default 1.5 x
+        TARGET_SPEED, so it catches up with a fleeing target) instead of jumping, and the FSM carries on."""
+        if target is (self.next_target or self.target):
+            return
+        if self.next_target is None:
+            anchor = Target(self.cfg)
+            anchor.x, anchor.y = self.target.x, self.target.y
+            self.target = anchor
+        self.next_target = target
+        self.handoff_speed = speed or 1.5 * self.cfg.TARGET_SPEED
+
+    def _slide_anchor(self, dt: float):
+        a, t = self.target, self.next_target
+        dx, dy = t.x - a.x, t.y - a.y
+        d = math.hypot(dx, dy)
+        step = self.handoff_speed * dt
+        if d <= step:
+            self.target = t
+            self.next_target = None
+        else:
+            a.x += dx * step / d
+            a.y += dy * step / d
 
     def trigger_dive(self):
         if self.state == "ORBIT":
@@ -80,6 +141,8 @@ class OrbitingAgent:
         )
 
     def update(self, dt: float):
+        if self.next_target is not None:
+            self._slide_anchor(dt)
         tx, ty = self.target.pos
 
         # Radial motion (diving in/out)
@@ -159,11 +222,7 @@ class OrbitingAgent:
             if (self.gx in (left, right)) and (self.gy in (top, bottom)):
                 self.glide_sign *= -1
 
-        self.min_center_dist = min(
-            self.min_center_dist,
-            math.hypot((tx + self.udx * self.radial_distance) - tx,
-                       (ty + self.udy * self.radial_distance) - ty)
-        )
-
-    def draw(self, surf: pygame.Surface):
-        pygame.draw.circle(surf, self.cfg.GREEN, (int(self.gx), int(self.gy)), self.cfg.DOT_RADIUS)
\ No newline at end of file
+    def draw(self, surf: pygame.Surface, pos: tuple[float, float] | None = None) -> pygame.Rect:
+        import pygame
+        x, y = pos or (self.gx, self.gy)
+        return pygame.draw.circle(surf, self.cfg.GREEN, (int(x), int(y)), self.cfg.DOT_RADIUS)
\ No newline at end of file
@@ -0,0 +1,388 @@
+"""Gym-style environments around the orbit sim for Vortex AI training.
+
+`OrbitEnv` is one episode on either the kinematic `OrbitingAgent` or the force-based
+`phys_sim.Robot`. `SyncVecEnv` steps several in-process; `SubprocVecEnv` splits them
+across worker processes that exchange actions/observations/rewards/dones through
+shared-memory arrays (only a one-word command goes over the pipe) and auto-reset
+finished episodes.
+"""
+import dataclasses
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Callable, Sequence
+
+import numpy as np
+
+from .config import Config
+from .headless import Command, HeadlessSim, RandomWalk
+from .obs import OBS_DIM, observe_agent, observe_robot
+
+KEEP, FLIP_DIR, DIVE, FASTER, SLOWER = range(5)
+ACTION_NAMES = ("KEEP", "FLIP_DIR", "DIVE", "FASTER", "SLOWER")
+N_ACTIONS = len(ACTION_NAMES)
+
+@dataclasses.dataclass
+class EnvConfig:
+    backend: str = "kinematic"  # "kinematic" (OrbitingAgent) or "phys" (phys_sim.Robot)
+    max_steps: int = 1800
+    orbit_band: float = 10.0
+    speed_step: float = 0.1  # FASTER/SLOWER change v_t by this fraction of the base speed
+    speed_range: tuple[float, float] = (0.5, 1.5)
+    max_glide_time: float = 3.0
+
+    # Rewards (README: Vortex AI plan)
+    r_band: float = 0.01
+    r_hit: float = 1.0
+    r_contact: float = -0.02
+    r_corner: float = -0.2
+    r_action: float = -0.001
+    r_destroyed: float = -1.0
+
+    # Scripted target
+    target_hold: int = 30
+
+class OrbitEnv:
+    """Single orbit/dive episode with discrete actions KEEP/FLIP_DIR/DIVE/FASTER/SLOWER."""
+
+    obs_dim = OBS_DIM
+    n_actions = N_ACTIONS
+
+    def __init__(self, cfg: Config | None = None, env_cfg: EnvConfig | None = None, seed: int = 0):
+        self.env_cfg = env_cfg or EnvConfig()
+        self.base_cfg = cfg
+        self.seed = seed
+        self._episode = 0
+        self.reset(seed)
+
+    # ---- episode ----
+    def reset(self, seed: int | None = None) -> tuple[np.ndarray, dict]:
+        if seed is not None:
+            self.seed, self._episode = seed, 0
+        ec = self.env_cfg
+        script = RandomWalk(self.seed * 1_000_003 + self._episode, hold=ec.target_hold)
+        self._episode += 1
+
+        if ec.backend == "kinematic":
+            self.cfg = dataclasses.replace(self.base_cfg or Config())
+            self.sim = HeadlessSim(self.cfg, script=script)
+        elif ec.backend == "phys":
+            from .all_in_one import phys_sim
+            self.cfg = dataclasses.replace(self.base_cfg or phys_sim.Config())
+            self.target = phys_sim.Target(self.cfg)
+            self.robot = phys_sim.Robot(self.cfg, self.target)
+            self.script = script
+        else:
+            raise ValueError(f"unknown backend {ec.backend!r}")
+
+        # One env step is one rendered frame: PHYSICS_HZ / FPS fixed physics steps, as in Game.run.
+        self.dt = self.cfg.PHYSICS_DT
+        self.substeps = max(1, round(self.cfg.PHYSICS_HZ / self.cfg.FPS))
+        self.base_speed = self.cfg.TANGENTIAL_SPEED
+        self.steps = 0
+        self.glide_time = 0.0
+        self.episode_return = 0.0
+        obs = np.empty(OBS_DIM, dtype=np.float32)
+        self.observe(obs)
+        return obs, {}
+
+    def step(self, action: int) -> tuple[np.ndarray, float, bool, bool, dict]:
+        reward, terminated, truncated = self._step(action)
+        obs = np.empty(OBS_DIM, dtype=np.float32)
+        self.observe(obs)
+        info = {"episode_return": self.episode_return, "steps": self.steps} if terminated or truncated else {}
+        return obs, reward, terminated, truncated, info
+
+    def _step(self, action: int) -> tuple[float, bool, bool]:
+        ec = self.env_cfg
+        reward = ec.r_action if action != KEEP else 0.0
+        if action == FASTER or action == SLOWER:
+            lo, hi = ec.speed_range
+            sign = 1.0 if action == FASTER else -1.0
+            v = self.cfg.TANGENTIAL_SPEED + sign * ec.speed_step * self.base_speed
+            self.cfg.TANGENTIAL_SPEED = min(hi * self.base_speed, max(lo * self.base_speed, v))
+
+        if ec.backend == "kinematic":
+            reward += self._step_kinematic(action)
+        else:
+            reward += self._step_phys(action)
+
+        self.steps += 1
+        terminated = self.glide_time > ec.max_glide_time
+        if terminated:
+            reward += ec.r_destroyed
+        truncated = not terminated and self.steps >= ec.max_steps
+        self.episode_return += reward
+        return reward, terminated, truncated
+
+    def _step_kinematic(self, action: int) -> float:
+        ec, sim = self.env_cfg, self.sim
+        agent = sim.agent
+        move = sim.script(self.steps)
+        contact = corner = hit = False
+        for k in range(self.substeps):
+            # The action lands on the first physics step, like a key event in Game.run.
+            cmd = Command(move.ix, move.iy, dive=k == 0 and action == DIVE, flip=k == 0 and action == FLIP_DIR)
+            before = agent.state
+            dir_before = -agent.orbit_direction if cmd.flip else agent.orbit_direction
+            sim.step(cmd)
+            if agent.state == "WALL_GLIDE":
+                self.glide_time += self.dt
+                contact = True
+                corner |= before != "WALL_GLIDE"
+            else:
+                self.glide_time = 0.0
+                contact |= agent.orbit_direction != dir_before  # single-wall bounce reverses the sweep
+            hit |= before == "INWARD" and agent.state == "OUTWARD"
+
+        in_band = agent.state == "ORBIT" and abs(agent.radial_distance - self.cfg.ORBIT_RADIUS) <= ec.orbit_band
+        return ec.r_contact * contact + ec.r_corner * corner + ec.r_hit * hit + ec.r_band * in_band
+
+    def _step_phys(self, action: int) -> float:
+        from .all_in_one.phys_sim import norm, resolve_dynamic_collision
+
+        ec, robot, cfg = self.env_cfg, self.robot, self.cfg
+        if action == DIVE:
+            robot.command_dive()
+        elif action == FLIP_DIR:
+            robot.flip_orbit()
+        move = self.script(self.steps)
+        contact = hit = False
+        for _ in range(self.substeps):
+            self.target.step(self.dt, move.ix, move.iy)
+            before = robot.state
+            swept_wall, swept_target = robot.integrate(self.dt)
+            hit_wall = robot.resolve_walls() or swept_wall
+            hit_target = resolve_dynamic_collision(robot.body, self.target.body, e=cfg.RESTITUTION,
+                                                   mu=cfg.FRICTION, beta=cfg.BETA, slop=cfg.SLOP) or swept_target
+            robot.after_contacts(hit_wall or hit_target)
+            if hit_wall:
+                self.glide_time += self.dt
+                contact = True
+            else:
+                self.glide_time = 0.0
+            hit |= (before == "INWARD" and robot.state == "OUTWARD") or (hit_target and before == "INWARD")
+
+        _, r_now = norm(robot.body.x - self.target.body.x, robot.body.y - self.target.body.y)
+        in_band = robot.state == "ORBIT" and abs(r_now - cfg.ORBIT_RADIUS) <= ec.orbit_band
+        return ec.r_contact * contact + ec.r_hit * hit + ec.r_band * in_band
+
+    # ---- observation ----
+    def observe(self, out: np.ndarray):
+        """Write the observation into `out` (length OBS_DIM, see obs.py)."""
+        if self.env_cfg.backend == "kinematic":
+            observe_agent(self.cfg, self.sim.agent, out)
+        else:
+            observe_robot(self.cfg, self.robot, out)
+
+EnvFn = Callable[[], OrbitEnv]
+
+def make_env_fns(n: int, cfg: Config | None = None, env_cfg: EnvConfig | None = None, seed: int = 0) -> list[EnvFn]:
+    return [_EnvFactory(cfg, env_cfg, seed + i) for i in range(n)]
+
+class _EnvFactory:
+    """Picklable `lambda: OrbitEnv(...)` for worker processes."""
+
+    def __init__(self, cfg, env_cfg, seed):
+        self.cfg, self.env_cfg, self.seed = cfg, env_cfg, seed
+
+    def __call__(self) -> OrbitEnv:
+        return OrbitEnv(self.cfg, self.env_cfg, self.seed)
+
+class _Buffers:
+    """The arrays a vector env exposes; backed by shared memory for SubprocVecEnv."""
+
+    FIELDS = (
+        ("obs", np.float32, (OBS_DIM,)),
+        ("final_obs", np.float32, (OBS_DIM,)),
+        ("actions", np.int64, ()),
+        ("rewards", np.float32, ()),
+        ("terminated", np.bool_, ()),
+        ("truncated", np.bool_, ()),
+        ("episode_return", np.float64, ()),
+        ("episode_length", np.int64, ()),
+    )
+
+    def __init__(self, n: int, shms: dict[str, shared_memory.SharedMemory] | None = None):
+        self.n = n
+        self.shms = shms
+        for name, dtype, shape in self.FIELDS:
+            full = (n, *shape)
+            if shms is None:
+                arr = np.zeros(full, dtype=dtype)
+            else:
+                arr = np.ndarray(full, dtype=dtype, buffer=shms[name].buf)
+            setattr(self, name, arr)
+
+    @classmethod
+    def create_shared(cls, n: int) -> "_Buffers":
+        shms = {}
+        for name, dtype, shape in cls.FIELDS:
+            size = max(1, int(np.prod((n, *shape))) * np.dtype(dtype).itemsize)
+            shms[name] = shared_memory.SharedMemory(create=True, size=size)
+        buf = cls(n, shms)
+        for name, _, _ in cls.FIELDS:
+            getattr(buf, name).fill(0)
+        return buf
+
+    @classmethod
+    def attach(cls, n: int, names: dict[str, str]) -> "_Buffers":
+        return cls(n, {k: shared_memory.SharedMemory(name=v) for k, v in names.items()})
+
+    def names(self) -> dict[str, str]:
+        return {k: shm.name for k, shm in self.shms.items()}
+
+    def close(self, unlink: bool = False):
+        if not self.shms:
+            return
+        for name, _, _ in self.FIELDS:
+            setattr(self, name, None)  # drop views before closing the mappings
+        for shm in self.shms.values():
+            shm.close()
+            if unlink:
+                shm.unlink()
+        self.shms = None
+
+def _run_slice(envs: Sequence[OrbitEnv], start: int, buf: _Buffers):
+    """Step envs[k] as slot start+k, auto-resetting finished ones."""
+    for k, env in enumerate(envs):
+        i = start + k
+        reward, terminated, truncated = env._step(int(buf.actions[i]))
+        buf.rewards[i] = reward
+        buf.terminated[i] = terminated
+        buf.truncated[i] = truncated
+        if terminated or truncated:
+            env.observe(buf.final_obs[i])
+            buf.episode_return[i] = env.episode_return
+            buf.episode_length[i] = env.steps
+            env.reset()
+        env.observe(buf.obs[i])
+
+def _reset_slice(envs: Sequence[OrbitEnv], start: int, buf: _Buffers, seed: int | None):
+    for k, env in enumerate(envs):
+        env.reset(None if seed is None else seed + start + k)
+        env.observe(buf.obs[start + k])
+
+class SyncVecEnv:
+    """Vector env stepping every sub-env in this process (reference / debugging)."""
+
+    def __init__(self, env_fns: Sequence[EnvFn]):
+        self.envs = [fn() for fn in env_fns]
+        self.num_envs = len(self.envs)
+        self.buf = _Buffers(self.num_envs)
+
+    def reset(self, seed: int | None = None) -> np.ndarray:
+        _reset_slice(self.envs, 0, self.buf, seed)
+        return self.buf.obs
+
+    def step_async(self, actions):
+        self.buf.actions[:] = actions
+
+    def step_wait(self):
+        _run_slice(self.envs, 0, self.buf)
+        return self._result()
+
+    def step(self, actions):
+        self.step_async(actions)
+        return self.step_wait()
+
+    def _result(self):
+        b = self.buf
+        done = b.terminated | b.truncated
+        infos = {"final_obs": b.final_obs, "episode_return": b.episode_return, "episode_length": b.episode_length,
+                 "done": done}
+        return b.obs, b.rewards, b.terminated, b.truncated, infos
+
+    def close(self):
+        pass
+
+def _worker(conn, n: int, names: dict[str, str], start: int, env_fns: Sequence[EnvFn]):
+    buf = _Buffers.attach(n, names)
+    envs = [fn() for fn in env_fns]
+    try:
+        while True:
+            cmd, arg = conn.recv()
+            if cmd == "step":
+                _run_slice(envs, start, buf)
+            elif cmd == "reset":
+                _reset_slice(envs, start, buf, arg)
+            elif cmd == "close":
+                break
+            conn.send(None)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        buf.close()
+        conn.close()
+
+class SubprocVecEnv(SyncVecEnv):
+    """Sub-envs split over worker processes; all per-step data lives in shared memory.
+
+    Call `step_async(actions)`, do other work (e.g. the learner update), then
+    `step_wait()`. Returned arrays are views into the shared buffers and are
+    overwritten by the next step, so copy anything you keep.
+    """
+
+    def __init__(self, env_fns: Sequence[EnvFn], n_workers: int | None = None, context: str | None = None):
+        self.num_envs = len(env_fns)
+        n_workers = min(n_workers or mp.cpu_count(), self.num_envs)
+        self.buf = _Buffers.create_shared(self.num_envs)
+        ctx = mp.get_context(context)
+
+        bounds = np.linspace(0, self.num_envs, n_workers + 1).astype(int)
+        self.conns, self.procs = [], []
+        for w in range(n_workers):
+            lo, hi = int(bounds[w]), int(bounds[w + 1])
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_worker, args=(child, self.num_envs, self.buf.names(), lo, env_fns[lo:hi]),
+                               daemon=True)
+            proc.start()
+            child.close()
+            self.conns.append(parent)
+            self.procs.append(proc)
+        self._waiting = False
+        self._closed = False
+
+    def _broadcast(self, cmd: str, arg=None):
+        for conn in self.conns:
+            conn.send((cmd, arg))
+
+    def _gather(self):
+        for conn in self.conns:
+            conn.recv()
+
+    def reset(self, seed: int | None = None) -> np.ndarray:
+        if self._waiting:
+            self._gather()
+            self._waiting = False
+        self._broadcast("reset", seed)
+        self._gather()
+        return self.buf.obs
+
+    def step_async(self, actions):
+        self.buf.actions[:] = actions
+        self._broadcast("step")
+        self._waiting = True
+
+    def step_wait(self):
+        self._gather()
+        self._waiting = False
+        return self._result()
+
+    def close(self):
+        if self._closed:
+            return
+        if self._waiting:
+            self._gather()
+        self._broadcast("close")
+        for proc in self.procs:
+            proc.join(timeout=5)
+        for conn in self.conns:
+            conn.close()
+        self.buf.close(unlink=True)
+        self._closed = True
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
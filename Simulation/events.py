@@ -0,0 +1,209 @@
+"""Event-driven advance for headless runs: skip steps whose outcome is known in closed form.
+
+While the target stands still and no command arrives, a step of
+`OrbitingAgent.update` is fully predictable between events:
+
+- ORBIT: the phase turns by a fixed dtheta. The next wall hit is the first step
+  whose phase falls in one of the arcs where the orbit circle leaves the
+  SAFETY_MARGIN box, found analytically.
+- INWARD / OUTWARD: the radius also moves by DIVE_SPEED * dt; the dive segment
+  (at most ORBIT_RADIUS / (DIVE_SPEED * dt) steps) is evaluated in one
+  vectorized pass for the completion step and any wall hit.
+- WALL_GLIDE: the agent slides along one wall; the exit test is evaluated the
+  same way up to the next corner.
+
+A pending `OrbitingAgent.retarget()` handoff moves the orbit centre every step,
+so nothing is skipped until it completes.
+
+`steps_to_event` returns how many ordinary steps lie before the next event
+(minus a guard step), `skip` applies them in closed form, and the event step
+itself always runs through `OrbitingAgent.update`, so state changes happen at
+the same step index as per-step stepping; positions agree to float rounding.
+
+    python -m Simulation.events        # run() vs run_events() on idle scripts, with and without a retarget
+"""
+import argparse
+import math
+
+import numpy as np
+
+from .batch import normalize
+from .entities import OrbitingAgent
+from .utils import normalize as normalize_scalar
+
+GUARD = 1  # steps before an event that are still run per step
+NEVER = 1 << 62
+
+def _box(cfg) -> tuple[float, float, float, float]:
+    m = cfg.SAFETY_MARGIN
+    return m, cfg.WIDTH - m, m, cfg.HEIGHT - m
+
+def exit_arcs(cfg, tx: float, ty: float, r: float) -> list[tuple[float, float]]:
+    """(center, half-width) of the phase arcs where the circle of radius r around (tx, ty) is outside the box."""
+    left, right, top, bottom = _box(cfg)
+    arcs = []
+    c = (left - tx) / r  # cos < c
+    if c > -1.0:
+        arcs.append((math.pi, math.pi - math.acos(min(c, 1.0))))
+    c = (right - tx) / r  # cos > c
+    if c < 1.0:
+        arcs.append((0.0, math.acos(max(c, -1.0))))
+    c = (top - ty) / r  # sin < c
+    if c > -1.0:
+        arcs.append((1.5 * math.pi, 0.5 * math.pi + math.asin(min(c, 1.0))))
+    c = (bottom - ty) / r  # sin > c
+    if c < 1.0:
+        arcs.append((0.5 * math.pi, 0.5 * math.pi - math.asin(max(c, -1.0))))
+    return arcs
+
+def first_arc_step(theta0: float, dtheta: float, arcs: list[tuple[float, float]], limit: int) -> int:
+    """Smallest k in [1, limit] with theta0 + k*dtheta strictly inside an arc, else NEVER."""
+    w = abs(dtheta)
+    if w == 0.0 or not arcs:
+        return NEVER
+    best = NEVER
+    for center, hw in arcs:
+        if hw <= 0.0:
+            continue
+        off = (theta0 - center + math.pi) % (2 * math.pi) - math.pi
+        if abs(off) < hw:
+            return 1
+        # travel distance from theta0 to the arc's entry edge
+        entry = center - hw if dtheta > 0 else center + hw
+        lo = ((entry - theta0) if dtheta > 0 else (theta0 - entry)) % (2 * math.pi)
+        while True:
+            k = math.floor(lo / w) + 1
+            if k > min(limit, best):
+                break
+            if k * w < lo + 2 * hw:
+                best = k
+                break
+            lo += 2 * math.pi  # the arc is narrower than a step and was jumped over; try the next turn
+    return best
+
+def _outside(cfg, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    left, right, top, bottom = _box(cfg)
+    return (x < left) | (x > right) | (y < top) | (y > bottom)
+
+def _first(mask: np.ndarray) -> int:
+    """1-based index of the first True, else NEVER."""
+    i = int(np.argmax(mask)) if len(mask) else 0
+    return i + 1 if len(mask) and mask[i] else NEVER
+
+def _dive_radii(agent: OrbitingAgent, dt: float, k):
+    cfg = agent.cfg
+    if agent.state == "INWARD":
+        return np.maximum(0.0, agent.radial_distance - k * (cfg.DIVE_SPEED * dt))
+    return np.minimum(cfg.ORBIT_RADIUS, agent.radial_distance + k * (cfg.DIVE_SPEED * dt))
+
+def _dive_end(agent: OrbitingAgent, dt: float) -> int:
+    """Step at which INWARD turns OUTWARD (or OUTWARD turns ORBIT)."""
+    cfg = agent.cfg
+    dr = cfg.DIVE_SPEED * dt
+    if dr <= 0.0:
+        return NEVER
+    if agent.state == "INWARD":
+        return max(1, math.ceil((agent.radial_distance - cfg.EPS) / dr))
+    return max(1, math.ceil((cfg.ORBIT_RADIUS - cfg.EPS - agent.radial_distance) / dr))
+
+def _glide(agent: OrbitingAgent, dt: float, k):
+    """Glide-axis coordinate after k steps (clamped like update()), plus the axis limits."""
+    left, right, top, bottom = _box(agent.cfg)
+    lo, hi = (left, right) if agent.glide_axis == "x" else (top, bottom)
+    start = agent.gx if agent.glide_axis == "x" else agent.gy
+    return np.clip(start + k * (agent.glide_sign * agent.cfg.TANGENTIAL_SPEED * dt), lo, hi), lo, hi
+
+def steps_to_event(agent: OrbitingAgent, dt: float, limit: int) -> int:
+    """Number of ordinary steps (<= limit) that `skip` may apply before the next event."""
+    if agent.next_target is not None:
+        return 0  # the handoff anchor slides every step
+    cfg = agent.cfg
+    tx, ty = agent.target.pos
+    dtheta = cfg.ANGULAR_SPEED * agent.orbit_direction * dt
+    theta0 = math.atan2(agent.udy, agent.udx)
+    horizon = limit + GUARD + 1
+
+    if agent.state == "ORBIT":
+        event = first_arc_step(theta0, dtheta, exit_arcs(cfg, tx, ty, cfg.ORBIT_RADIUS), horizon)
+    elif agent.state in ("INWARD", "OUTWARD"):
+        end = _dive_end(agent, dt)
+        k = np.arange(1, min(end, horizon) + 1, dtype=float)
+        r = _dive_radii(agent, dt, k)
+        th = theta0 + k * dtheta
+        event = min(end, _first(_outside(cfg, tx + np.cos(th) * r, ty + np.sin(th) * r)))
+    else:
+        # a glide reaches a corner within span / step steps
+        _, lo, hi = _glide(agent, dt, 0)
+        step = cfg.TANGENTIAL_SPEED * dt
+        n = min(horizon, math.ceil((hi - lo) / step) + 1 if step > 0 else 1)
+        pos, _, _ = _glide(agent, dt, np.arange(1, n + 1, dtype=float))
+        corner = _first((pos <= lo) | (pos >= hi))
+        if agent.glide_axis == "x":
+            gx, gy = pos, np.full_like(pos, agent.gy)
+        else:
+            gx, gy = np.full_like(pos, agent.gx), pos
+        ux, uy = normalize(gx - tx, gy - ty)
+        c, s = math.cos(dtheta), math.sin(dtheta)
+        nx, ny = normalize(ux * c - uy * s, ux * s + uy * c)
+        leaves = ~_outside(cfg, tx + nx * cfg.ORBIT_RADIUS, ty + ny * cfg.ORBIT_RADIUS)
+        event = min(corner, _first(leaves))
+    return max(0, min(limit, event - 1 - GUARD))
+
+def skip(agent: OrbitingAgent, dt: float, n: int):
+    """Apply n ordinary steps (as counted by steps_to_event) in closed form."""
+    if n <= 0:
+        return
+    cfg = agent.cfg
+    tx, ty = agent.target.pos
+    if agent.state == "WALL_GLIDE":
+        pos = float(_glide(agent, dt, n)[0])
+        if agent.glide_axis == "x":
+            agent.gx = pos
+        else:
+            agent.gy = pos
+        agent.udx, agent.udy = normalize_scalar(agent.gx - tx, agent.gy - ty)
+        agent.radial_distance = math.hypot(agent.gx - tx, agent.gy - ty)
+        return
+    r = cfg.ORBIT_RADIUS if agent.state == "ORBIT" else float(_dive_radii(agent, dt, n))
+    theta = math.atan2(agent.udy, agent.udx) + n * cfg.ANGULAR_SPEED * agent.orbit_direction * dt
+    agent.udx, agent.udy = math.cos(theta), math.sin(theta)
+    agent.radial_distance = r
+    agent.gx, agent.gy = tx + agent.udx * r, ty + agent.udy * r
+
+def max_deviation(cfg=None, steps: int = 6000) -> dict[str, float]:
+    """Final agent position gap between HeadlessSim.run and run_events per scenario (inf if the FSM, target
+    binding or pending handoff differ)."""
+    from .config import Config
+    from .entities import Target
+    from .headless import IDLE, Command, HeadlessSim, Hold, Playback
+
+    cfg = cfg or Config()
+    period = round(2.0 / cfg.PHYSICS_DT)
+    dives = Playback([Command(dive=True)] + [IDLE] * (period // 2) + [Command(flip=True)] + [IDLE] * period, loop=True)
+    scenarios = {"idle": (Hold, False), "dives": (lambda: dives, False),
+                 "retarget": (Hold, True), "retarget + dives": (lambda: dives, True)}
+    out = {}
+    for name, (script, retarget) in scenarios.items():
+        ends = []
+        for run in ("run", "run_events"):
+            sim = HeadlessSim(cfg, script=script())
+            if retarget:
+                t = Target(cfg)
+                t.x, t.y = 200.0, 150.0
+                sim.agent.retarget(t)
+            getattr(sim, run)(steps)
+            a = sim.agent
+            ends.append((a.gx, a.gy, a.state, a.target.pos, a.next_target is None))
+        (x0, y0, *rest0), (x1, y1, *rest1) = ends
+        out[name] = math.hypot(x1 - x0, y1 - y0) if rest0 == rest1 else math.inf
+    return out
+
+def main():
+    ap = argparse.ArgumentParser(description="Check event-driven headless runs against per-step ones.")
+    ap.add_argument("--steps", type=int, default=6000)
+    args = ap.parse_args()
+    for name, err in max_deviation(steps=args.steps).items():
+        print(f"{name:18s} |run_events - run| = {err:.3e} px")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,23 @@
+import contextlib
 import sys
 import pygame
 from .config import Config
 from .entities import Target, OrbitingAgent
+from .dataset import BCLogger, action_of
+from .env import DIVE, FLIP_DIR, KEEP
 from .hud import HUD
+from .profiler import FrameProfiler, SimStats, export
+from .recorder import BTN_DIVE, BTN_FLIP, Header, Recorder
+from .render import FrameRenderer, static_layer
+from .swarm import Swarm
 
 class Game:
-    def __init__(self, cfg: Config | None = None):
+    def __init__(self, cfg: Config | None = None, record_path: str | None = None, profile_path: str | None = None,
+                 swarm: int = 0, control_hz: float | None = None, policy=None, bc_path: str | None = None,
+                 capture=None):
+        if control_hz and (swarm or record_path or policy or bc_path):
+            raise ValueError("the control thread drives a single agent; swarm, recording, bots and "
+                             "BC logging need the frame-locked loop")
         self.cfg = cfg or Config()
         pygame.init()
         self.screen = pygame.display.set_mode((self.cfg.WIDTH, self.cfg.HEIGHT))
@@ -14,15 +26,70 @@ class Game:
         self.font = pygame.font.SysFont(None, 18)
 
         self.target = Target(self.cfg)
-        self.agent = OrbitingAgent(self.cfg, self.target)
+        # With a control thread the agent owns its own Target, moved only by POSE messages.
+        self.agent = OrbitingAgent(self.cfg, Target(self.cfg) if control_hz else self.target)
         self.hud = HUD(self.cfg, self.font)
+        # Swarm mode: extra agents around the same target, stepped and drawn as arrays.
+        self.swarm = Swarm(self.cfg, self.target, swarm) if swarm else None
 
         self.debug = self.cfg.DEBUG
         self.running = True
+        # Bounds and key help are static: drawn once, then only sprite/HUD rects are redrawn.
+        self.renderer = FrameRenderer(self.screen, self._background())
 
-    def _draw_bounds(self):
+        # Fixed-rate physics: wall-clock time (times the warp factor) feeds an accumulator
+        # that is drained in PHYSICS_DT steps, so results don't depend on the frame rate.
+        self.accumulator = 0.0
+        self.warp_index = 0
+        self._prev_target = self.target.pos
+        self._prev_agent = (self.agent.gx, self.agent.gy)
+        self._prev_swarm = self.swarm.positions if self.swarm else None
+        self.physics_steps = 0
+
+        # Optional per-step trajectory recording (replay with `python -m Simulation.replay FILE`)
+        self.recorder = Recorder(record_path, Header.from_cfg(self.cfg)) if record_path else None
+        self._buttons = 0  # BTN_* pressed since the last physics step
+
+        # Loop-phase timings and sim counters; P toggles them (and their HUD page) at runtime.
+        self.profiler = FrameProfiler(("wait", "events", "target", "agent", "bookkeeping", "draw", "present"),
+                                      enabled=profile_path is not None)
+        self.stats = SimStats(self.cfg.ORBIT_RADIUS, self.cfg.PHYSICS_DT)
+        self.profile_path = profile_path
+
+        # Optional off-thread frame capture (capture.FrameCapture), grabbed after each present.
+        self.capture = capture
+
+        # Optional bot (policy.PolicyHook, policy.StarterBot or planner.RolloutPlanner): chooses an action once
+        # per rendered frame; dives and flips go through command() like key presses.
+        self.policy = policy
+
+        # Optional behavior-cloning log: one (observation, action) sample per physics step. The first key
+        # press or bot action in a step stages its pre-action observation; everything applied before the
+        # step runs is merged into its label like the recorder ORs _buttons (a dive wins over a flip,
+        # either over a speed change).
+        self.bc = BCLogger(bc_path, self.cfg) if bc_path else None
+        self._bc_staged = False
+        self._bc_speed = KEEP  # FASTER / SLOWER applied this step
+
+        # Optional real-time control thread: the agent steps at control_hz off the render loop,
+        # gets target poses and buttons over a loopback link and publishes snapshots for draw().
+        self.control = None
+        if control_hz:
+            from .control import AgentPlant, ControlLoop, loopback_pair
+            self._link, ctl = loopback_pair()
+            self.control = ControlLoop(AgentPlant(self.agent), ctl, control_hz)
+
+    @property
+    def time_warp(self) -> int:
+        return self.cfg.TIME_WARP_LEVELS[self.warp_index]
+
+    def _background(self) -> pygame.Surface:
+        painters = [self._draw_bounds] + ([self.hud.draw_static] if self.debug else [])
+        return static_layer(self.screen.get_size(), self.cfg.BLACK, *painters)
+
+    def _draw_bounds(self, surf: pygame.Surface):
         pygame.draw.rect(
-            self.screen,
+            surf,
             (40, 40, 40),
             (self.cfg.SAFETY_MARGIN,
              self.cfg.SAFETY_MARGIN,
@@ -34,35 +101,185 @@ class Game:
     def handle_event(self, event: pygame.event.Event):
         if event.type == pygame.QUIT:
             self.running = False
+        elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+            self.renderer.invalidate()
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 self.running = False
             elif event.key == pygame.K_SPACE:
-                self.agent.trigger_dive()
+                self.command(BTN_DIVE)
             elif event.key == pygame.K_c:
-                self.agent.flip_orbit_dir()
+                self.command(BTN_FLIP)
             elif event.key == pygame.K_d:
                 self.debug = not self.debug
+                self.renderer.set_background(self._background())
+            elif event.key == pygame.K_p:
+                self.profiler.toggle()
+            elif event.key == pygame.K_RIGHTBRACKET:
+                self.warp_index = min(self.warp_index + 1, len(self.cfg.TIME_WARP_LEVELS) - 1)
+            elif event.key == pygame.K_LEFTBRACKET:
+                self.warp_index = max(self.warp_index - 1, 0)
+
+    def command(self, buttons: int):
+        if self.control:
+            from .control import CMD
+            self._link.send(CMD, 0.0, buttons)
+            return
+        self._bc_stage()
+        if buttons & BTN_DIVE:
+            self.agent.trigger_dive()
+            if self.swarm:
+                self.swarm.trigger_dive()
+        if buttons & BTN_FLIP:
+            self.agent.flip_orbit_dir()
+            if self.swarm:
+                self.swarm.flip_orbit_dir()
+        self._buttons |= buttons
+
+    def _bc_stage(self):
+        if self.bc and not self._bc_staged:
+            self.bc.stage_agent(self.agent)
+            self._bc_staged = True
+
+    def step_physics(self, ix: int, iy: int):
+        dt = self.cfg.PHYSICS_DT
+        prof = self.profiler
+        if self.bc:
+            self._bc_stage()  # no input this step: a KEEP sample of the current state
+            action = action_of(self._buttons & BTN_DIVE, self._buttons & BTN_FLIP)
+            self.bc.commit(action if action != KEEP else self._bc_speed, ix, iy)
+            self._bc_staged = False
+            self._bc_speed = KEEP
+        self.target.step(dt, ix, iy)
+        prof.lap("target")
+        self.agent.update(dt)
+        if self.swarm:
+            self.swarm.step(dt)
+        prof.lap("agent")
+        if prof.enabled:
+            a = self.agent
+            self.stats.step(a.state, a.radial_distance, a.orbit_direction, flipped=bool(self._buttons & BTN_FLIP))
+        if self.recorder:
+            self.recorder.record_agent(self.physics_steps, self.target, self.agent, ix, iy, self._buttons)
+        self._buttons = 0
+        self.physics_steps += 1
+        prof.lap("bookkeeping")
+
+    def advance(self, frame_dt: float, keys):
+        dt = self.cfg.PHYSICS_DT
+        ix = keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]
+        iy = keys[pygame.K_DOWN] - keys[pygame.K_UP]
+        if self.control:
+            self.sense(min(frame_dt, self.cfg.MAX_FRAME_TIME), ix, iy)
+            return
+        if self.policy:
+            action = self.policy.choose_agent(self.agent)
+            if action == DIVE or action == FLIP_DIR:
+                self.command(BTN_DIVE if action == DIVE else BTN_FLIP)
+            elif action != KEEP:  # FASTER / SLOWER (PolicyHook)
+                self._bc_stage()
+                self._bc_speed = action
+                self.policy.apply(self.agent, action)  # writes the shared self.cfg
+                if self.swarm:
+                    self.swarm.engine.tangential_speed.fill(self.cfg.TANGENTIAL_SPEED)
+        self.accumulator += min(frame_dt, self.cfg.MAX_FRAME_TIME) * self.time_warp
+        while self.accumulator >= dt:
+            self._prev_target = self.target.pos
+            self._prev_agent = (self.agent.gx, self.agent.gy)
+            if self.swarm:
+                self._prev_swarm = self.swarm.positions  # step() rebinds the arrays, no copy needed
+            self.step_physics(ix, iy)
+            self.accumulator -= dt
+
+    def sense(self, dt: float, ix: int, iy: int):
+        """Control-thread mode: move the target in real time and send its pose; drop the ACT echoes."""
+        from .control import POSE
+        self.target.step(dt, ix, iy)
+        self.profiler.lap("target")
+        self._link.send(POSE, 0.0, self.target.x, self.target.y)
+        self._link.poll()
+        self.profiler.lap("bookkeeping")
+
+    def _lerp(self, prev: tuple[float, float], cur: tuple[float, float]) -> tuple[float, float]:
+        a = self.accumulator / self.cfg.PHYSICS_DT
+        return prev[0] + (cur[0] - prev[0]) * a, prev[1] + (cur[1] - prev[1]) * a
+
+    def draw(self):
+        r = self.renderer
+        r.begin()
+        snap = None
+        if self.control:
+            snap = self.control.buffer.read()  # the agent itself is the control thread's
+            r.mark(self.target.draw(self.screen))
+            r.mark(self.agent.draw(self.screen, (snap.x, snap.y)))
+        else:
+            r.mark(self.target.draw(self.screen, self._lerp(self._prev_target, self.target.pos)))
+            if self.swarm:
+                r.mark(self.swarm.draw(self.screen, *self._lerp(self._prev_swarm, self.swarm.positions)))
+            r.mark(self.agent.draw(self.screen, self._lerp(self._prev_agent, (self.agent.gx, self.agent.gy))))
+        if self.debug:
+            hud = self.hud.draw_snapshot(self.screen, snap, self.time_warp) if snap else \
+                self.hud.draw(self.screen, self.agent, self.time_warp)
+            for rect in hud:
+                r.mark(rect)
+        if self.profiler.enabled:
+            for rect in self.hud.draw_lines(self.screen, self.profiler.page(self.stats) + self._status_lines()):
+                r.mark(rect)
+        elif self.capture and self.capture.error is not None:
+            for rect in self.hud.draw_lines(self.screen, self._status_lines()):
+                r.mark(rect)
+        self.profiler.lap("draw")
+        r.present()
+
+    def _status_lines(self) -> list[str]:
+        """Side-channel status for the profiler HUD page (control loop and capture health)."""
+        lines = []
+        if self.control:
+            j = self.control.jitter
+            lines.append(f"control: {self.control.hz:.0f} Hz  ticks={j.ticks}  overruns={j.overruns}")
+        if self.capture:
+            c = self.capture
+            lines.append(f"capture: written={c.written}  dropped={c.dropped}  every={c.every}"
+                         + (f"  FAILED: {c.error!r}" if c.error is not None else ""))
+        return lines
+
+    def _report(self) -> dict:
+        """Extra sections for the profile export."""
+        report = {}
+        if self.control:
+            report["control_jitter"] = self.control.jitter.report()
+        if self.capture:
+            report["capture"] = self.capture.stats()
+        return report
 
     def run(self):
+        if self.control:
+            self.control.start()
         while self.running:
-            dt = self.clock.tick(self.cfg.FPS) / 1000.0
+            frame_dt = self.clock.tick(self.cfg.FPS) / 1000.0
+            self.profiler.lap("wait")
 
             for event in pygame.event.get():
                 self.handle_event(event)
+            self.profiler.lap("events")
 
-            keys = pygame.key.get_pressed()
-            self.target.update(dt, keys)
-            self.agent.update(dt)
-
-            self.screen.fill(self.cfg.BLACK)
-            self._draw_bounds()
-            self.target.draw(self.screen)
-            self.agent.draw(self.screen)
-            if self.debug:
-                self.hud.draw(self.screen, self.agent)
+            self.advance(frame_dt, pygame.key.get_pressed())
 
-            pygame.display.flip()
+            self.draw()
+            if self.capture:
+                self.capture.grab(self.screen)
+            self.profiler.lap("present")
+            self.profiler.end_frame()
 
-        pygame.quit()
+        if self.control:
+            self.control.stop()
+        # Closed last-registered first; every step runs even if an earlier one raises (a failed
+        # BC shard or capture write), and the error surfaces once the rest is shut down.
+        with contextlib.ExitStack() as shutdown:
+            shutdown.callback(pygame.quit)
+            if self.profile_path:
+                shutdown.callback(lambda: export(self.profile_path, self.profiler, self.stats, self._report()))
+            for sink in (self.capture, self.bc, self.recorder):
+                if sink:
+                    shutdown.callback(sink.close)
         sys.exit()
@@ -0,0 +1,168 @@
+"""Pygame-free stepping core: scripted target input at a fixed dt, no render clock."""
+import argparse
+import bisect
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+from .config import Config
+from .entities import Target, OrbitingAgent
+
+@dataclass(frozen=True)
+class Command:
+    """One step of input: target move axes in [-1, 1] plus the agent buttons."""
+    ix: float = 0.0
+    iy: float = 0.0
+    dive: bool = False
+    flip: bool = False
+
+IDLE = Command()
+
+# A script maps the step index to that step's Command. Scripts that can also
+# answer next_active(i) -> first step >= i whose command is not IDLE let
+# HeadlessSim.run_events skip idle stretches.
+Script = Callable[[int], Command]
+QUIET = sys.maxsize  # next_active() result when the script idles forever
+
+class Hold:
+    """Script that repeats the same command forever (IDLE by default)."""
+
+    def __init__(self, cmd: Command = IDLE):
+        self.cmd = cmd
+
+    def __call__(self, i: int) -> Command:
+        return self.cmd
+
+    def next_active(self, i: int) -> int:
+        return QUIET if self.cmd == IDLE else i
+
+class Playback:
+    """Script that plays a recorded command list, then idles (or loops)."""
+
+    def __init__(self, cmds: Sequence[Command], loop: bool = False):
+        self.cmds = list(cmds)
+        self.loop = loop
+        self._active = [k for k, c in enumerate(self.cmds) if c != IDLE]
+
+    def __call__(self, i: int) -> Command:
+        if self.loop and self.cmds:
+            return self.cmds[i % len(self.cmds)]
+        return self.cmds[i] if i < len(self.cmds) else IDLE
+
+    def next_active(self, i: int) -> int:
+        if not self._active:
+            return QUIET
+        n = len(self.cmds)
+        base, k = (i - i % n, i % n) if self.loop else (0, i)
+        j = bisect.bisect_left(self._active, k)
+        if j < len(self._active):
+            return base + self._active[j]
+        return base + n + self._active[0] if self.loop else QUIET
+
+class RandomWalk:
+    """Seeded random target driver: new arrow-key combo every `hold` steps, random dives/flips."""
+
+    def __init__(self, seed: int = 0, hold: int = 30, p_dive: float = 0.0, p_flip: float = 0.0):
+        self.seed = seed
+        self.hold = hold
+        self.p_dive = p_dive
+        self.p_flip = p_flip
+        self._rng = random.Random(seed)
+        self._axes = (0, 0)
+
+    def __call__(self, i: int) -> Command:
+        rng = self._rng
+        if i % self.hold == 0:
+            self._axes = (rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1)))
+        return Command(self._axes[0], self._axes[1],
+                       dive=rng.random() < self.p_dive,
+                       flip=rng.random() < self.p_flip)
+
+class HeadlessSim:
+    """Target + OrbitingAgent advanced at a fixed dt, as fast as the CPU allows."""
+
+    def __init__(self, cfg: Config | None = None, dt: float | None = None, script: Script | None = None):
+        self.cfg = cfg or Config()
+        self.dt = dt if dt is not None else self.cfg.PHYSICS_DT
+        self.script = script or Hold()
+        self.reset()
+
+    def reset(self):
+        self.target = Target(self.cfg)
+        self.agent = OrbitingAgent(self.cfg, self.target)
+        self.steps = 0
+
+    @property
+    def time(self) -> float:
+        return self.steps * self.dt
+
+    def step(self, cmd: Command | None = None):
+        if cmd is None:
+            cmd = self.script(self.steps)
+        # Same order as Game.run: key events, then target, then agent.
+        if cmd.dive:
+            self.agent.trigger_dive()
+        if cmd.flip:
+            self.agent.flip_orbit_dir()
+        self.target.step(self.dt, cmd.ix, cmd.iy)
+        self.agent.update(self.dt)
+        self.steps += 1
+
+    def run(self, n_steps: int, callback: Callable[["HeadlessSim"], None] | None = None) -> "HeadlessSim":
+        step = self.step
+        if callback is None:
+            for _ in range(n_steps):
+                step()
+        else:
+            for _ in range(n_steps):
+                step()
+                callback(self)
+        return self
+
+    def run_events(self, n_steps: int, callback: Callable[["HeadlessSim"], None] | None = None) -> "HeadlessSim":
+        """Like run(), but idle stretches between events are skipped in closed form (see events.py).
+
+        Needs a script with next_active(); otherwise this is run(). callback(sim)
+        is called after every step actually executed, i.e. at event boundaries.
+        """
+        from .events import skip, steps_to_event
+
+        next_active = getattr(self.script, "next_active", None)
+        end = self.steps + n_steps
+        while self.steps < end:
+            quiet = (min(next_active(self.steps), end) - self.steps) if next_active else 0
+            n = steps_to_event(self.agent, self.dt, quiet) if quiet > 0 else 0
+            if n:
+                skip(self.agent, self.dt, n)
+                self.steps += n
+                continue
+            self.step()
+            if callback is not None:
+                callback(self)
+        return self
+
+def main():
+    ap = argparse.ArgumentParser(description="Run the orbit sim headless and report throughput.")
+    ap.add_argument("--steps", type=int, default=100_000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--dt", type=float, default=None)
+    ap.add_argument("--events", action="store_true",
+                    help="event-driven advance with an idle target (dive every 10 s)")
+    args = ap.parse_args()
+
+    if args.events:
+        cfg = Config()
+        period = int(10 / (args.dt or cfg.PHYSICS_DT))
+        sim = HeadlessSim(cfg, dt=args.dt, script=Playback([Command(dive=True)] + [IDLE] * (period - 1), loop=True))
+    else:
+        sim = HeadlessSim(dt=args.dt, script=RandomWalk(args.seed, p_dive=0.01, p_flip=0.005))
+    t0 = time.perf_counter()
+    (sim.run_events if args.events else sim.run)(args.steps)
+    elapsed = time.perf_counter() - t0
+    print(f"{args.steps} steps in {elapsed:.3f}s  ({args.steps / elapsed:,.0f} steps/s, "
+          f"{sim.time:.1f}s simulated)  dives={sim.agent.dive_count}  state={sim.agent.state}")
+
+if __name__ == "__main__":
+    main()
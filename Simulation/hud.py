@@ -2,19 +2,39 @@ import math
 import pygame
 from .config import Config
 from .entities import OrbitingAgent
+from .render import TextCache
+
+HELP = "SPACE: dive,  C: flip orbit dir,  [ ]: time warp,  D: debug,  P: profiler,  ESC: quit"
 
 class HUD:
     def __init__(self, cfg: Config, font: pygame.font.Font):
         self.cfg = cfg
         self.font = font
+        self.text = TextCache(font)
+
+    def draw_static(self, surf: pygame.Surface):
+        """Key-help line; drawn once into the background layer."""
+        surf.blit(self.font.render(HELP, True, self.cfg.GREY), (10, 10 + 18 * 3))
 
-    def draw(self, surf: pygame.Surface, agent: OrbitingAgent):
+    def draw(self, surf: pygame.Surface, agent: OrbitingAgent, warp: int = 1) -> list[pygame.Rect]:
         angle = (math.atan2(agent.udy, agent.udx) + 2 * math.pi) % (2 * math.pi)
         lines = [
             f"state={agent.state}  r={agent.radial_distance:6.1f}  angle={angle:.2f} rad",
-            f"orbit_dir={'CW' if agent.orbit_direction==1 else 'CCW'}  dives={agent.dive_count}",
+            f"orbit_dir={'CW' if agent.orbit_direction==1 else 'CCW'}  dives={agent.dive_count}  warp=x{warp}",
             f"glide_axis={agent.glide_axis}  glide_sign={agent.glide_sign}",
-            "SPACE: dive,  C: flip orbit dir,  D: debug,  ESC: quit"
         ]
-        for i, s in enumerate(lines):
-            surf.blit(self.font.render(s, True, self.cfg.GREY), (10, 10 + 18 * i))
+        return [self.text.blit(surf, s, self.cfg.GREY, (10, 10 + 18 * i)) for i, s in enumerate(lines)]
+
+    def draw_snapshot(self, surf: pygame.Surface, snap, warp: int = 1) -> list[pygame.Rect]:
+        """draw() from a control.Snapshot, for when the agent itself belongs to the control thread."""
+        from .batch import STATE_NAMES
+        angle = math.atan2(snap.y - snap.ty, snap.x - snap.tx) % (2 * math.pi)
+        lines = [
+            f"state={STATE_NAMES[snap.state]}  r={snap.radial:6.1f}  angle={angle:.2f} rad",
+            f"orbit_dir={'CW' if snap.orbit_dir==1 else 'CCW'}  dives={snap.dives}  warp=x{warp}",
+        ]
+        return [self.text.blit(surf, s, self.cfg.GREY, (10, 10 + 18 * i)) for i, s in enumerate(lines)]
+
+    def draw_lines(self, surf: pygame.Surface, lines: list[str], row: int = 5) -> list[pygame.Rect]:
+        """Extra text page (e.g. profiler.profile_lines) starting at HUD line `row`."""
+        return [self.text.blit(surf, s, self.cfg.GREY, (10, 10 + 18 * (row + i))) for i, s in enumerate(lines)]
@@ -0,0 +1,219 @@
+"""Randomized versions of the README testing scenarios, checked over whole trajectories with NumPy.
+
+    python -m Simulation.invariants --scenarios 4000 --seconds 5
+    python -m Simulation.invariants --kind corner --scenarios 500 --show 5
+
+Every scenario is one slot of a BatchOrbitEngine (the vector twin of
+Target + OrbitingAgent; see `python -m Simulation.batch` for the equivalence
+check), driven by a per-slot target program and button schedule:
+
+- bounce: target pushed onto a random wall, sliding along it now and then.
+- corner: target run into random corners at random speeds.
+- dive: wall/corner pushes with frequent dives.
+- flip: corner pushes with direction flips, most of them mid-glide.
+
+Slots are simulated in chunks; each chunk records agent and target positions
+and the FSM state at every step into preallocated (steps + 1, chunk) arrays,
+then every invariant is evaluated over the whole block at once:
+
+- step: |p[t+1] - p[t]| never exceeds `step_factor` times the fastest legal
+  move in one step (tangential or dive speed plus target speed), i.e. no teleports.
+- box: the agent stays inside the SAFETY_MARGIN box (within `box_tol` px).
+- orbit: in ORBIT, the agent's actual distance to the target is R within `band`.
+- glide: no WALL_GLIDE stretch lasts longer than `max_glide` seconds.
+"""
+import argparse
+import dataclasses
+import time
+
+import numpy as np
+
+from .batch import ORBIT, WALL_GLIDE, BatchOrbitEngine
+from .config import Config
+
+KINDS = ("bounce", "corner", "dive", "flip")
+INVARIANTS = ("step", "box", "orbit", "glide")
+
+@dataclasses.dataclass
+class Bounds:
+    """Invariant tolerances."""
+    step_factor: float = 1.5
+    box_tol: float = 0.5         # px
+    band: float = 1.0            # px, |r - R| in ORBIT
+    max_glide: float = 2.0       # s
+
+@dataclasses.dataclass
+class Program:
+    """Per-slot scenario parameters for one chunk, as arrays."""
+    kind: np.ndarray          # index into KINDS
+    seg_len: np.ndarray       # steps per target-input segment
+    ax: np.ndarray            # (n, segments) target x axis per segment
+    ay: np.ndarray
+    p_dive: np.ndarray        # per step
+    p_flip: np.ndarray        # per step, any state
+    p_flip_glide: np.ndarray  # per step, while in WALL_GLIDE
+    phase: np.ndarray         # initial orbit angle
+    direction: np.ndarray     # initial orbit direction
+
+def make_program(rng: np.random.Generator, n: int, steps: int, dt: float, kinds: tuple[int, ...]) -> Program:
+    kind = rng.choice(np.asarray(kinds), n)
+    seg_len = np.maximum(1, (rng.uniform(1.0, 3.0, n) / dt).astype(np.int64))
+    segments = int(steps // seg_len.min()) + 1
+    speed = rng.uniform(0.3, 1.0, (n, segments))
+    sx = rng.choice((-1.0, 1.0), (n, segments))
+    sy = rng.choice((-1.0, 1.0), (n, segments))
+    # bounce: hold one wall for the whole run, sometimes sliding along it
+    wall_axis = rng.integers(0, 2, n)[:, None]
+    wall_sign = rng.choice((-1.0, 1.0), n)[:, None]
+    slide = rng.choice((-1.0, 0.0, 1.0), (n, segments)) * speed
+    bx = np.where(wall_axis == 0, wall_sign, slide)
+    by = np.where(wall_axis == 1, wall_sign, slide)
+    is_bounce = (kind == KINDS.index("bounce"))[:, None]
+    # dive: half its segments are wall holds, half corner runs
+    wallish = (kind == KINDS.index("dive"))[:, None] & (rng.random((n, segments)) < 0.5)
+    ax = np.where(is_bounce | wallish, bx, sx * speed)
+    ay = np.where(is_bounce | wallish, by, sy * speed)
+    per_s = dt  # rates below are per second
+    p_dive = np.where(kind == KINDS.index("dive"), 2.0, 0.2) * per_s
+    p_flip = np.where(kind == KINDS.index("flip"), 0.5, 0.05) * per_s
+    p_flip_glide = np.where(kind == KINDS.index("flip"), 0.02, 0.0)
+    return Program(kind, seg_len, ax, ay, p_dive, p_flip, p_flip_glide,
+                   rng.uniform(0, 2 * np.pi, n), rng.choice(np.array([-1, 1], dtype=np.int8), n))
+
+@dataclasses.dataclass
+class Trajectories:
+    """Recorded (steps + 1, n) arrays for one chunk."""
+    gx: np.ndarray
+    gy: np.ndarray
+    tx: np.ndarray
+    ty: np.ndarray
+    state: np.ndarray
+
+def simulate(cfg: Config, prog: Program, steps: int, rng: np.random.Generator) -> Trajectories:
+    n = len(prog.kind)
+    dt = cfg.PHYSICS_DT
+    eng = BatchOrbitEngine(cfg, n)
+    eng.udx, eng.udy = np.cos(prog.phase), np.sin(prog.phase)
+    eng.orbit_direction[:] = prog.direction
+    eng.gx = eng.tx + eng.udx * eng.radial_distance
+    eng.gy = eng.ty + eng.udy * eng.radial_distance
+    # float32 halves the recording's memory traffic; ~1e-4 px resolution is far below every tolerance
+    rec = Trajectories(*(np.empty((steps + 1, n), dtype=np.float32) for _ in range(4)),
+                       np.empty((steps + 1, n), dtype=np.int8))
+    ix, iy = prog.ax[:, 0].copy(), prog.ay[:, 0].copy()
+    u = np.empty(n)
+    mask = np.empty(n, dtype=bool)
+    flip = np.empty(n, dtype=bool)
+    for t in range(steps + 1):
+        rec.gx[t], rec.gy[t], rec.tx[t], rec.ty[t], rec.state[t] = eng.gx, eng.gy, eng.tx, eng.ty, eng.state
+        if t == steps:
+            break
+        if t:
+            new = np.flatnonzero(t % prog.seg_len == 0)  # slots starting a new input segment
+            if len(new):
+                seg = t // prog.seg_len[new]
+                ix[new], iy[new] = prog.ax[new, seg], prog.ay[new, seg]
+        rng.random(n, out=u)
+        eng.trigger_dive(np.less(u, prog.p_dive, out=mask))
+        np.greater(u, 1.0 - prog.p_flip, out=flip)
+        flip |= np.equal(eng.state, WALL_GLIDE, out=mask) & (u < prog.p_flip_glide)
+        eng.flip_orbit_dir(flip)
+        eng.step_targets(dt, ix, iy)
+        eng.step(dt)
+    return rec
+
+def longest_run(flag: np.ndarray) -> np.ndarray:
+    """Longest run of consecutive True along axis 0, per column."""
+    c = np.cumsum(flag, axis=0, dtype=np.int32)
+    reset = np.maximum.accumulate(np.where(flag, 0, c), axis=0)
+    return (c - reset).max(axis=0)
+
+def check(cfg: Config, rec: Trajectories, bounds: Bounds) -> dict[str, np.ndarray]:
+    """Worst value of each invariant per slot, normalized so that > 1 is a violation."""
+    dt = cfg.PHYSICS_DT
+    m = cfg.SAFETY_MARGIN
+    step_limit = bounds.step_factor * (max(cfg.TANGENTIAL_SPEED, cfg.DIVE_SPEED) + cfg.TARGET_SPEED) * dt
+    disp = np.hypot(np.diff(rec.gx, axis=0), np.diff(rec.gy, axis=0)).max(axis=0)
+    out_x = np.maximum(m - rec.gx, rec.gx - (cfg.WIDTH - m)).max(axis=0)
+    out_y = np.maximum(m - rec.gy, rec.gy - (cfg.HEIGHT - m)).max(axis=0)
+    r_err = np.abs(np.hypot(rec.gx - rec.tx, rec.gy - rec.ty) - cfg.ORBIT_RADIUS)
+    r_err = np.where(rec.state == ORBIT, r_err, 0.0).max(axis=0)
+    glide = longest_run(rec.state == WALL_GLIDE) * dt
+    return {
+        "step": disp / step_limit,
+        "box": np.maximum(out_x, out_y) / bounds.box_tol,
+        "orbit": r_err / bounds.band,
+        "glide": glide / bounds.max_glide,
+    }
+
+def first_violation(cfg: Config, rec: Trajectories, slot: int, name: str, bounds: Bounds) -> int:
+    """Step index at which `slot` first breaks invariant `name`."""
+    cols = [getattr(rec, f.name)[:, slot:slot + 1] for f in dataclasses.fields(rec)]  # views, not copies
+    if check(cfg, Trajectories(*cols), bounds)[name][0] <= 1.0:
+        return -1
+    lo, hi = 1, len(rec.gx)
+    while lo < hi:  # smallest prefix that already violates (every invariant is a max over the prefix)
+        mid = (lo + hi) // 2
+        if check(cfg, Trajectories(*(c[:mid + 1] for c in cols)), bounds)[name][0] > 1.0:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+def run(cfg: Config, scenarios: int, seconds: float, seed: int = 0, chunk: int = 2048,
+        kinds: tuple[str, ...] = KINDS, bounds: Bounds | None = None, show: int = 3):
+    """Returns (per-invariant worst ratios over all slots, per-kind violation counts, examples)."""
+    bounds = bounds or Bounds()
+    steps = int(round(seconds / cfg.PHYSICS_DT))
+    codes = tuple(KINDS.index(k) for k in kinds)
+    worst = dict.fromkeys(INVARIANTS, 0.0)
+    counts = {k: dict.fromkeys(INVARIANTS, 0) for k in kinds}
+    examples = []
+    for c, start in enumerate(range(0, scenarios, chunk)):
+        n = min(chunk, scenarios - start)
+        rng = np.random.default_rng([seed, c])
+        prog = make_program(rng, n, steps, cfg.PHYSICS_DT, codes)
+        rec = simulate(cfg, prog, steps, rng)
+        res = check(cfg, rec, bounds)
+        for name, ratio in res.items():
+            worst[name] = max(worst[name], float(ratio.max()))
+            bad = np.flatnonzero(ratio > 1.0)
+            for i in bad:
+                counts[KINDS[prog.kind[i]]][name] += 1
+                if len(examples) < show:
+                    examples.append((start + int(i), KINDS[prog.kind[i]], name, float(ratio[i]),
+                                     first_violation(cfg, rec, int(i), name, bounds)))
+    return worst, counts, examples
+
+def main():
+    ap = argparse.ArgumentParser(description="Check trajectory invariants over randomized README test scenarios.")
+    ap.add_argument("--scenarios", type=int, default=4000)
+    ap.add_argument("--seconds", type=float, default=5.0, help="simulated time per scenario")
+    ap.add_argument("--kind", action="append", choices=KINDS, help="restrict to these scenario kinds; repeat")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--chunk", type=int, default=2048, help="scenarios simulated and checked together")
+    ap.add_argument("--max-glide", type=float, default=Bounds.max_glide)
+    ap.add_argument("--step-factor", type=float, default=Bounds.step_factor)
+    ap.add_argument("--band", type=float, default=Bounds.band, help="px allowed between |agent - target| and R in ORBIT")
+    ap.add_argument("--show", type=int, default=3, help="print this many violating scenarios")
+    args = ap.parse_args()
+
+    cfg = Config()
+    bounds = Bounds(step_factor=args.step_factor, band=args.band, max_glide=args.max_glide)
+    kinds = tuple(args.kind or KINDS)
+    t0 = time.perf_counter()
+    worst, counts, examples = run(cfg, args.scenarios, args.seconds, args.seed, args.chunk, kinds, bounds, args.show)
+    wall = time.perf_counter() - t0
+    steps = args.scenarios * int(round(args.seconds / cfg.PHYSICS_DT))
+    print(f"{args.scenarios} scenarios x {args.seconds:g} s ({steps:,} agent-steps) in {wall:.2f} s")
+    print(f"{'kind':8s} " + " ".join(f"{name:>6s}" for name in INVARIANTS) + "   (violating scenarios)")
+    for k in kinds:
+        print(f"{k:8s} " + " ".join(f"{counts[k][name]:6d}" for name in INVARIANTS))
+    print("worst / limit: " + ", ".join(f"{name}={worst[name]:.3g}" for name in INVARIANTS))
+    for slot, kind, name, ratio, step in examples:
+        print(f"  scenario {slot} ({kind}): {name} at {ratio:.3g}x its limit, first at step {step}")
+    if any(sum(c.values()) for c in counts.values()):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,38 @@
+import argparse
+
 from .game import Game
 from .config import Config
 
 def main():
-    Game(Config()).run()
+    ap = argparse.ArgumentParser(description="Orbit/dive simulation")
+    ap.add_argument("--record", metavar="FILE", help="record every physics step for `python -m Simulation.replay`")
+    ap.add_argument("--profile", metavar="FILE", help="profile from the start; write timings/counters (.json or .csv) on exit")
+    ap.add_argument("--swarm", type=int, default=0, metavar="N", help="add N agents in phase slots around the same target")
+    ap.add_argument("--control-hz", type=float, metavar="HZ", help="step the agent on a real-time control thread at HZ")
+    ap.add_argument("--bot", metavar="NPZ", help="let a policy.LinearPolicy (W, b arrays) drive dives/flips/speed")
+    ap.add_argument("--plan", type=float, metavar="MS", help="let the rollout planner pick dives/flips within MS per frame")
+    ap.add_argument("--bc-log", metavar="DIR", help="log (observation, action) samples for behavior cloning")
+    ap.add_argument("--capture", metavar="PATH", help="capture frames off-thread: a directory (image sequence), "
+                    ".rgb0 (raw stream) or .mp4 (via ffmpeg)")
+    ap.add_argument("--capture-format", default="bmp", help="image format for directory captures (bmp, tga, png, jpg)")
+    ap.add_argument("--capture-every", type=int, default=1, metavar="N", help="capture every Nth frame")
+    args = ap.parse_args()
+    cfg = Config()
+    policy = None
+    if args.bot:
+        from .policy import LinearPolicy, PolicyHook
+        policy = PolicyHook(LinearPolicy.load(args.bot), cfg)
+    elif args.plan:
+        from .planner import RolloutPlanner
+        policy = RolloutPlanner(cfg, budget_ms=args.plan)
+    capture = None
+    if args.capture:
+        from .capture import FrameCapture
+        capture = FrameCapture(args.capture, (cfg.WIDTH, cfg.HEIGHT), cfg.FPS, args.capture_format,
+                               every=args.capture_every)
+    Game(cfg, record_path=args.record, profile_path=args.profile, swarm=args.swarm,
+         control_hz=args.control_hz, policy=policy, bc_path=args.bc_log,
+         capture=capture).run()
 
 if __name__ == "__main__":
     main()
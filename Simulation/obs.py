@@ -0,0 +1,115 @@
+"""Vortex AI observations written into caller-owned float32 buffers.
+
+Layout (README: Observations), OBS_DIM floats per agent:
+    0-1  cos, sin of the orbit phase (unit vector target -> agent)
+    2-3  r / R, (r - R) / R
+    4-7  distance to the left, right, top, bottom wall over the SAFETY_MARGIN box span
+    8-   FSM state one-hot in STATES order
+
+`observe_agent` / `observe_robot` fill one row from a scalar agent;
+`BatchObserver` fills a whole (n, OBS_DIM) block from a BatchOrbitEngine or
+BatchPhysics with ufuncs writing into preallocated scratch, so a step
+allocates no arrays.
+"""
+import numpy as np
+
+from .batch import STATE_CODES, STATE_NAMES
+
+STATES = STATE_NAMES
+OBS_DIM = 8 + len(STATES)
+
+def _box(cfg) -> tuple[float, float, float, float]:
+    """(left, top, 1 / width, 1 / height) of the SAFETY_MARGIN box."""
+    m = cfg.SAFETY_MARGIN
+    return m, m, 1.0 / (cfg.WIDTH - 2 * m), 1.0 / (cfg.HEIGHT - 2 * m)
+
+def _write(cfg, out: np.ndarray, c: float, s: float, r: float, x: float, y: float, state: str):
+    R = cfg.ORBIT_RADIUS
+    m, _, iw, ih = _box(cfg)
+    out[0] = c
+    out[1] = s
+    out[2] = r / R
+    out[3] = (r - R) / R
+    out[4] = (x - m) * iw
+    out[5] = (cfg.WIDTH - m - x) * iw
+    out[6] = (y - m) * ih
+    out[7] = (cfg.HEIGHT - m - y) * ih
+    out[8:] = 0.0
+    out[8 + STATE_CODES[state]] = 1.0
+
+def observe_agent(cfg, agent, out: np.ndarray):
+    """Observation of a kinematic OrbitingAgent into `out` (length OBS_DIM)."""
+    _write(cfg, out, agent.udx, agent.udy, agent.radial_distance, agent.gx, agent.gy, agent.state)
+
+def observe_robot(cfg, robot, out: np.ndarray):
+    """Observation of a phys_sim Robot (relative to its target body) into `out`."""
+    b, t = robot.body, robot.target.body
+    dx, dy = b.x - t.x, b.y - t.y
+    r = (dx * dx + dy * dy) ** 0.5
+    if r > 1e-9:
+        _write(cfg, out, dx / r, dy / r, r, b.x, b.y, robot.state)
+    else:
+        _write(cfg, out, 1.0, 0.0, r, b.x, b.y, robot.state)
+
+class BatchObserver:
+    """Fills `obs` (n, OBS_DIM float32) from a batch engine without allocating per call."""
+
+    def __init__(self, cfg, n: int):
+        self.cfg = cfg
+        self.n = n
+        self.obs = np.zeros((n, OBS_DIM), dtype=np.float32)
+        self._codes = np.arange(len(STATES), dtype=np.int8)
+        self._hot = np.zeros((n, len(STATES)), dtype=bool)
+        self._a = np.empty(n)
+        self._b = np.empty(n)
+        self._r = np.empty(n)
+        self._ok = np.empty(n, dtype=bool)
+
+    def _walls(self, x: np.ndarray, y: np.ndarray):
+        cfg, o = self.cfg, self.obs
+        m, _, iw, ih = _box(cfg)
+        np.subtract(x, m, out=self._a)
+        np.multiply(self._a, iw, out=o[:, 4])
+        np.subtract(cfg.WIDTH - m, x, out=self._a)
+        np.multiply(self._a, iw, out=o[:, 5])
+        np.subtract(y, m, out=self._a)
+        np.multiply(self._a, ih, out=o[:, 6])
+        np.subtract(cfg.HEIGHT - m, y, out=self._a)
+        np.multiply(self._a, ih, out=o[:, 7])
+
+    def _radial(self, r: np.ndarray):
+        o, inv_R = self.obs, 1.0 / self.cfg.ORBIT_RADIUS
+        np.multiply(r, inv_R, out=o[:, 2])
+        np.subtract(r, self.cfg.ORBIT_RADIUS, out=self._a)
+        np.multiply(self._a, inv_R, out=o[:, 3])
+
+    def _state(self, state: np.ndarray):
+        np.equal(state[:, None], self._codes, out=self._hot)
+        self.obs[:, 8:] = self._hot
+
+    def fill(self, eng) -> np.ndarray:
+        """From a BatchOrbitEngine."""
+        o = self.obs
+        o[:, 0] = eng.udx
+        o[:, 1] = eng.udy
+        self._radial(eng.radial_distance)
+        self._walls(eng.gx, eng.gy)
+        self._state(eng.state)
+        return o
+
+    def fill_phys(self, batch) -> np.ndarray:
+        """From a phys_batch.BatchPhysics (phase and radius relative to each slot's target)."""
+        o, a, b, r = self.obs, self._a, self._b, self._r
+        np.subtract(batch.x, batch.tx, out=a)
+        np.subtract(batch.y, batch.ty, out=b)
+        np.hypot(a, b, out=r)
+        # A robot on its target gets phase (1, 0), as in observe_robot.
+        np.greater(r, 1e-9, out=self._ok)
+        o[:, 0] = 1.0
+        o[:, 1] = 0.0
+        np.divide(a, r, out=o[:, 0], where=self._ok)
+        np.divide(b, r, out=o[:, 1], where=self._ok)
+        self._radial(r)
+        self._walls(batch.x, batch.y)
+        self._state(batch.state)
+        return o
@@ -0,0 +1,215 @@
+"""Look-ahead dive/flip planner: score KEEP / FLIP_DIR / DIVE with short batched rollouts.
+
+    planner = RolloutPlanner(cfg, budget_ms=4.0)
+    action = planner.act_agent(agent)      # once per frame; usable as Game(policy=planner)
+
+    python -m Simulation.planner [--backend phys] [--budget-ms 4]
+
+Every call snapshots the agent (OrbitingAgent.snapshot / Robot.snapshot),
+broadcasts it into a batch engine with one slot per (candidate, target
+scenario) pair, applies each candidate's command and steps all slots together.
+Scenario 0 holds the target input estimated from its last displacement; the
+rest hold fixed random arrow-key combos. Each step is scored with the
+OrbitEnv reward weights (orbit band, dive hit, wall contact, corner glide);
+a candidate's value is its mean return over the scenarios.
+
+Rollouts step at `plan_hz` (30 Hz by default, far coarser than PHYSICS_HZ;
+the phys engine runs with CCD so contacts survive the large step) for at most
+`max_horizon` steps. The horizon adapts to `budget_ms`, which covers the whole
+call: the clock starts before the snapshot is loaded, time for the final
+scoring is reserved from running estimates, and the planner checks before
+every batch step that its estimated cost still fits, so `min_horizon` is only
+honoured as far as the budget allows. A dive still in progress at the horizon
+is credited in proportion to its depth.
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from .batch import INWARD, ORBIT, OUTWARD, WALL_GLIDE, BatchOrbitEngine
+from .env import ACTION_NAMES, DIVE, FLIP_DIR, KEEP, EnvConfig
+from .obs import OBS_DIM, observe_agent, observe_robot
+
+CANDIDATES = (KEEP, FLIP_DIR, DIVE)
+
+class RolloutPlanner:
+    """Picks the best of CANDIDATES for one agent each call, within `budget_ms` of rollouts."""
+
+    def __init__(self, cfg, budget_ms: float = 4.0, scenarios: int = 8, plan_hz: float = 30.0, max_horizon: int = 30,
+                 min_horizon: int = 4, backend: str = "kinematic", env_cfg: EnvConfig | None = None, seed: int = 0):
+        self.cfg = cfg
+        self.budget = budget_ms * 1e-3
+        self.scenarios = scenarios
+        self.max_horizon = max_horizon
+        self.min_horizon = min_horizon
+        self.backend = backend
+        self.env_cfg = env_cfg or EnvConfig()
+        self.dt = 1.0 / plan_hz
+
+        n = len(CANDIDATES) * scenarios
+        self.n = n
+        if backend == "phys":
+            import dataclasses
+            from .all_in_one.phys_batch import BatchPhysics
+            self.eng = BatchPhysics(dataclasses.replace(cfg, CCD=True), n)  # coarse plan steps need the sweep
+            self._dive, self._flip = self.eng.command_dive, self.eng.flip_orbit
+        else:
+            self.eng = BatchOrbitEngine(cfg, n)
+            self._dive, self._flip = self.eng.trigger_dive, self.eng.flip_orbit_dir
+        rng = np.random.default_rng(seed)
+        axes = rng.integers(-1, 2, size=(scenarios, 2)).astype(float)
+        self._axes = axes
+        self.ix = np.tile(axes[:, 0], len(CANDIDATES))
+        self.iy = np.tile(axes[:, 1], len(CANDIDATES))
+        self._cand = np.repeat(np.asarray(CANDIDATES), scenarios)
+        self._returns = np.zeros(n)
+        self.values = np.zeros(len(CANDIDATES))
+        self.obs = np.zeros((1, OBS_DIM), dtype=np.float32)  # pre-action observation, for BC logging
+        self.step_cost = 0.0      # running estimate of one batch step (s)
+        self.step_margin = 0.0    # decaying high-water mark of one batch step, capped at 3x step_cost (s)
+        self.score_cost = 0.0     # running estimate of the post-rollout scoring (s)
+        self._scoring_start = 0.0
+        self.horizon = 0          # steps simulated in the last plan
+        self._last_target: tuple[float, float] | None = None
+
+    def reset(self):
+        """Forget the target's last position (start of a new episode)."""
+        self._last_target = None
+
+    def _estimate_input(self, tx: float, ty: float):
+        """Scenario 0 holds the target input implied by its displacement since the last call."""
+        if self._last_target is not None:
+            dx, dy = tx - self._last_target[0], ty - self._last_target[1]
+            eps = 1e-6
+            self._axes[0] = ((dx > eps) - (dx < -eps), (dy > eps) - (dy < -eps))
+            self.ix[::self.scenarios] = self._axes[0, 0]
+            self.iy[::self.scenarios] = self._axes[0, 1]
+        self._last_target = (tx, ty)
+
+    def _rollout(self, deadline: float):
+        eng, ec, dt = self.eng, self.env_cfg, self.dt
+        R, band = self.cfg.ORBIT_RADIUS, ec.orbit_band
+        ret = self._returns
+        ret.fill(0.0)
+        self._dive(self._cand == DIVE)
+        self._flip(self._cand == FLIP_DIR)
+        clock = time.perf_counter
+        h = 0
+        min_h = self.min_horizon
+        if self.step_cost > 0.0:
+            min_h = max(1, min(min_h, int(max(0.0, deadline - clock()) / self.step_margin)))  # 1: keep estimates live
+        r = eng.radial_distance if self.backend == "kinematic" else np.hypot(eng.x - eng.tx, eng.y - eng.ty)
+        while h < self.max_horizon:
+            t0 = clock()
+            if h >= min_h and t0 + self.step_margin > deadline:
+                break
+            before = eng.state.copy()
+            if self.backend == "kinematic":
+                dirs = eng.orbit_direction.copy()
+                eng.step_targets(dt, self.ix, self.iy)
+                eng.step(dt)
+                r = eng.radial_distance
+                contact = (eng.state == WALL_GLIDE) | ((eng.orbit_direction != dirs) & (before != WALL_GLIDE))
+                hit = (before == INWARD) & (eng.state == OUTWARD)
+                corner = (eng.state == WALL_GLIDE) & (before != WALL_GLIDE)
+            else:
+                eng.step_targets(dt, self.ix, self.iy)
+                eng.step(dt)
+                r = np.hypot(eng.x - eng.tx, eng.y - eng.ty)
+                contact = eng.hit_wall
+                hit = (before == INWARD) & ((eng.state == OUTWARD) | eng.hit_target)
+                corner = False
+            in_band = (eng.state == ORBIT) & (np.abs(r - R) <= band)
+            ret += ec.r_band * in_band + ec.r_hit * hit + ec.r_contact * contact + ec.r_corner * corner
+            h += 1
+            cost = clock() - t0
+            self.step_cost = cost if not self.step_cost else 0.8 * self.step_cost + 0.2 * cost
+            self.step_margin = min(max(cost, 0.95 * self.step_margin), 3.0 * self.step_cost)
+        self._scoring_start = clock()
+        # Truncated rollouts: credit an unfinished dive by how far in it got.
+        ret += ec.r_hit * (eng.state == INWARD) * (1.0 - r / R)
+        self.horizon = h
+
+    def plan(self, snap: tuple, tx: float, ty: float) -> int:
+        """Best candidate from a snapshot (OrbitingAgent.snapshot or Robot.snapshot) and the target position."""
+        clock = time.perf_counter
+        deadline = clock() + self.budget
+        self._estimate_input(tx, ty)
+        self.eng.load_snapshot(snap)
+        self._rollout(deadline - self.score_cost)
+        self.values[:] = self._returns.reshape(len(CANDIDATES), self.scenarios).mean(axis=1)
+        best = CANDIDATES[int(np.argmax(self.values))]
+        cost = clock() - self._scoring_start
+        self.score_cost = cost if not self.score_cost else max(cost, 0.8 * self.score_cost + 0.2 * cost)
+        return best
+
+    def choose_agent(self, agent) -> int:
+        """Plan for a kinematic OrbitingAgent without applying the chosen command."""
+        observe_agent(self.cfg, agent, self.obs[0])
+        t = agent.next_target or agent.target  # the real target, not a retarget() anchor
+        return self.plan(agent.snapshot(), t.x, t.y)
+
+    def act_agent(self, agent) -> int:
+        """Plan for a kinematic OrbitingAgent and apply the chosen command."""
+        action = self.choose_agent(agent)
+        if action == DIVE:
+            agent.trigger_dive()
+        elif action == FLIP_DIR:
+            agent.flip_orbit_dir()
+        return action
+
+    def act_robot(self, robot) -> int:
+        """Plan for a phys_sim Robot and apply the chosen command."""
+        observe_robot(self.cfg, robot, self.obs[0])
+        t = robot.target.body
+        action = self.plan(robot.snapshot(), t.x, t.y)
+        if action == DIVE:
+            robot.command_dive()
+        elif action == FLIP_DIR:
+            robot.flip_orbit()
+        return action
+
+def main():
+    ap = argparse.ArgumentParser(description="Run the planner as a bot for a few seconds of headless play.")
+    ap.add_argument("--backend", choices=("kinematic", "phys"), default="kinematic")
+    ap.add_argument("--budget-ms", type=float, default=4.0)
+    ap.add_argument("--scenarios", type=int, default=8)
+    ap.add_argument("--seconds", type=float, default=20.0)
+    args = ap.parse_args()
+
+    if args.backend == "phys":
+        from .all_in_one import phys_sim
+        cfg = phys_sim.Config()
+        agent = phys_sim.Robot(cfg, phys_sim.Target(cfg))
+        target = agent.target
+    else:
+        from .config import Config
+        from .entities import OrbitingAgent, Target
+        cfg = Config()
+        agent = OrbitingAgent(cfg, Target(cfg))
+        target = agent.target
+    planner = RolloutPlanner(cfg, args.budget_ms, args.scenarios, backend=args.backend)
+    act = planner.act_robot if args.backend == "phys" else planner.act_agent
+    substeps = max(1, round(cfg.PHYSICS_HZ / cfg.FPS))
+    counts = dict.fromkeys(ACTION_NAMES[:3], 0)
+    times, horizons = [], []
+    for frame in range(int(args.seconds * cfg.FPS)):
+        t0 = time.perf_counter()
+        counts[ACTION_NAMES[act(agent)]] += 1
+        times.append(time.perf_counter() - t0)
+        horizons.append(planner.horizon)
+        phase = frame / cfg.FPS
+        for _ in range(substeps):
+            target.step(cfg.PHYSICS_DT, round(math.cos(0.5 * phase)), round(math.sin(0.3 * phase)))
+            agent.update(cfg.PHYSICS_DT)
+    ms = np.array(times) * 1e3
+    print(f"{args.backend}: {len(ms)} plans, {args.scenarios} scenarios x {len(CANDIDATES)} candidates, "
+          f"horizon mean {np.mean(horizons):.0f} steps")
+    print(f"  plan time mean {ms.mean():.2f} / p99 {np.percentile(ms, 99):.2f} / max {ms.max():.2f} ms "
+          f"(budget {args.budget_ms:.1f} ms)")
+    print("  actions: " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+
+if __name__ == "__main__":
+    main()
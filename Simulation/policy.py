@@ -0,0 +1,185 @@
+"""Policy inference hook: observation buffer -> model -> KEEP/FLIP_DIR/DIVE/FASTER/SLOWER.
+
+    hook = PolicyHook(LinearPolicy.load("bot.npz"), cfg)
+    hook.act_agent(agent)                  # one OrbitingAgent, e.g. once per frame in Game
+    hook = PolicyHook(model, cfg, n=4096)
+    hook.act_batch(engine)                 # a BatchOrbitEngine, all slots at once
+
+    python -m Simulation.policy --agents 4096 --steps 600
+
+A model is any callable taking the (n, OBS_DIM) float32 observation block and
+returning either (n, N_ACTIONS) scores (argmax is taken) or (n,) action
+indices. The hook owns the observation and action buffers and reuses them
+every call. FASTER/SLOWER move the tangential speed by EnvConfig.speed_step of
+the base speed, clamped to EnvConfig.speed_range, as in OrbitEnv.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from .env import DIVE, FASTER, FLIP_DIR, KEEP, N_ACTIONS, SLOWER, EnvConfig
+from .obs import OBS_DIM, BatchObserver, observe_agent
+
+class LinearPolicy:
+    """scores = obs @ W + b, written into a preallocated block (grown on demand)."""
+
+    def __init__(self, W: np.ndarray, b: np.ndarray | None = None):
+        self.W = np.ascontiguousarray(W, dtype=np.float32)
+        self.b = np.zeros(self.W.shape[1], dtype=np.float32) if b is None else np.asarray(b, dtype=np.float32)
+        self._scores = np.empty((0, self.W.shape[1]), dtype=np.float32)
+
+    @classmethod
+    def random(cls, seed: int = 0, scale: float = 0.1) -> "LinearPolicy":
+        rng = np.random.default_rng(seed)
+        return cls(rng.normal(0.0, scale, (OBS_DIM, N_ACTIONS)), rng.normal(0.0, scale, N_ACTIONS))
+
+    @classmethod
+    def load(cls, path: str) -> "LinearPolicy":
+        with np.load(path) as f:
+            return cls(f["W"], f["b"] if "b" in f else None)
+
+    def save(self, path: str):
+        np.savez(path, W=self.W, b=self.b)
+
+    def __call__(self, obs: np.ndarray) -> np.ndarray:
+        n = len(obs)
+        if len(self._scores) < n:
+            self._scores = np.empty((n, self.W.shape[1]), dtype=np.float32)
+        out = self._scores[:n]
+        np.matmul(obs, self.W, out=out)
+        out += self.b
+        return out
+
+class PolicyHook:
+    """Feeds a model from preallocated buffers and applies its actions to agents."""
+
+    def __init__(self, model, cfg, n: int = 1, env_cfg: EnvConfig | None = None):
+        self.model = model
+        self.cfg = cfg
+        self.n = n
+        ec = env_cfg or EnvConfig()
+        self.base_speed = cfg.TANGENTIAL_SPEED
+        self.speed_delta = ec.speed_step * self.base_speed
+        self.speed_lo, self.speed_hi = ec.speed_range[0] * self.base_speed, ec.speed_range[1] * self.base_speed
+        self.observer = BatchObserver(cfg, n)
+        self.obs = self.observer.obs
+        self.actions = np.zeros(n, dtype=np.int64)
+        self._mask = np.zeros(n, dtype=bool)
+        self._dv = np.zeros(n)
+
+    def decide(self) -> np.ndarray:
+        """Run the model on `obs`; leaves the chosen actions in `actions`."""
+        out = self.model(self.obs)
+        if out.ndim == 2:
+            np.argmax(out, axis=1, out=self.actions)
+        else:
+            self.actions[:] = out
+        return self.actions
+
+    def choose_agent(self, agent, slot: int = 0) -> int:
+        """Observe and decide for one kinematic OrbitingAgent without acting (the caller applies the action)."""
+        observe_agent(self.cfg, agent, self.obs[slot])
+        return int(self.decide()[slot])
+
+    def apply(self, agent, action: int):
+        """Apply one action to a kinematic OrbitingAgent.
+
+        FASTER/SLOWER rewrite agent.cfg.TANGENTIAL_SPEED, so every entity sharing that Config (in Game: the
+        agent and later swarm respawns) changes speed; live BatchOrbitEngine rows keep their own
+        tangential_speed and must be updated by the caller.
+        """
+        if action == DIVE:
+            agent.trigger_dive()
+        elif action == FLIP_DIR:
+            agent.flip_orbit_dir()
+        elif action == FASTER or action == SLOWER:
+            v = agent.cfg.TANGENTIAL_SPEED + (self.speed_delta if action == FASTER else -self.speed_delta)
+            agent.cfg.TANGENTIAL_SPEED = min(self.speed_hi, max(self.speed_lo, v))
+
+    def act_agent(self, agent, slot: int = 0) -> int:
+        """Observe, decide and act for one kinematic OrbitingAgent."""
+        action = self.choose_agent(agent, slot)
+        self.apply(agent, action)
+        return action
+
+    def act_batch(self, eng) -> np.ndarray:
+        """Observe, decide and act for every slot of a BatchOrbitEngine."""
+        self.observer.fill(eng)
+        a, mask, dv = self.decide(), self._mask, self._dv
+        eng.trigger_dive(np.equal(a, DIVE, out=mask))
+        eng.flip_orbit_dir(np.equal(a, FLIP_DIR, out=mask))
+        np.multiply(np.equal(a, FASTER, out=mask), self.speed_delta, out=dv)
+        eng.tangential_speed += dv
+        np.multiply(np.equal(a, SLOWER, out=mask), self.speed_delta, out=dv)
+        eng.tangential_speed -= dv
+        np.clip(eng.tangential_speed, self.speed_lo, self.speed_hi, out=eng.tangential_speed)
+        return a
+
+class StarterBot:
+    """Scripted Game v0 opponent: dives on a cooldown whenever the orbit is clear of the walls."""
+
+    def __init__(self, cfg, cooldown: float = 1.5, clearance: float = 20.0):
+        self.cfg = cfg
+        self.cooldown = cooldown
+        self.clearance = clearance
+        self.obs = np.zeros((1, OBS_DIM), dtype=np.float32)  # pre-action observation, for BC logging
+        self._wait = 0.0
+
+    def reset(self):
+        self._wait = 0.0
+
+    def choose_agent(self, agent) -> int:
+        """Call once per frame (1 / FPS); DIVE (which starts the cooldown) or KEEP, not yet applied."""
+        cfg = self.cfg
+        observe_agent(cfg, agent, self.obs[0])
+        self._wait -= 1.0 / cfg.FPS
+        if agent.state != "ORBIT" or self._wait > 0.0:
+            return KEEP
+        m = cfg.SAFETY_MARGIN + self.clearance
+        if m <= agent.gx <= cfg.WIDTH - m and m <= agent.gy <= cfg.HEIGHT - m:
+            self._wait = self.cooldown
+            return DIVE
+        return KEEP
+
+    def act_agent(self, agent) -> int:
+        action = self.choose_agent(agent)
+        if action == DIVE:
+            agent.trigger_dive()
+        return action
+
+def main():
+    from .batch import BatchOrbitEngine
+    from .config import Config
+    from .entities import OrbitingAgent, Target
+
+    ap = argparse.ArgumentParser(description="Time observation + inference + action for one agent and a batch.")
+    ap.add_argument("--agents", type=int, default=4096)
+    ap.add_argument("--steps", type=int, default=600)
+    args = ap.parse_args()
+
+    cfg = Config()
+    agent = OrbitingAgent(cfg, Target(cfg))
+    hook = PolicyHook(LinearPolicy.random(), cfg)
+    t0 = time.perf_counter()
+    for _ in range(args.steps):
+        hook.act_agent(agent)
+        agent.update(cfg.PHYSICS_DT)
+    single = (time.perf_counter() - t0) / args.steps
+
+    bcfg = Config()
+    eng = BatchOrbitEngine(bcfg, args.agents)
+    hook = PolicyHook(LinearPolicy.random(), bcfg, n=args.agents)
+    decide = 0.0
+    for _ in range(args.steps):
+        t0 = time.perf_counter()
+        hook.act_batch(eng)
+        decide += time.perf_counter() - t0
+        eng.step(bcfg.PHYSICS_DT)
+    batch = decide / args.steps
+    print(f"single agent: {single * 1e6:.1f} us per observe+decide+act+update ({1 / 60 / single:.0f}x headroom at 60 Hz)")
+    print(f"batch of {args.agents}: {batch * 1e6:.1f} us per observe+decide+act "
+          f"({batch / args.agents * 1e9:.0f} ns per agent)")
+
+if __name__ == "__main__":
+    main()
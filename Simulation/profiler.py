@@ -0,0 +1,223 @@
+"""Frame-phase profiler and simulation counters for the interactive loops.
+
+    prof = FrameProfiler(("wait", "events", "target", "agent", "draw", "present"))
+    prof.enable()
+    ...
+    prof.lap("events")      # time since the previous lap is charged to "events"
+    ...
+    prof.end_frame()        # push this frame's per-phase totals into the rolling window
+
+A phase lapped several times in one frame (one lap per physics step) is summed.
+While disabled, `lap` and `end_frame` are bound to a no-op, so an instrumented
+loop pays one empty call per phase.
+"""
+import csv
+import json
+import math
+import time
+
+import numpy as np
+
+from .batch import STATE_NAMES
+
+# Histogram bucket edges in milliseconds; the last bucket is open-ended.
+HIST_EDGES_MS = (0.0, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.7, 33.3, 66.7, math.inf)
+
+def _noop(*_):
+    pass
+
+class FrameProfiler:
+    """Per-phase frame times over a rolling window of `window` frames."""
+
+    def __init__(self, phases: tuple[str, ...], window: int = 240, enabled: bool = False):
+        self.phases = tuple(phases)
+        self._index = {p: i for i, p in enumerate(self.phases)}
+        self.window = window
+        self.samples = np.zeros((window, len(self.phases)))  # seconds, ring buffer by frame
+        self.frames = 0
+        self._frame = [0.0] * len(self.phases)
+        self._t = 0.0
+        self._page: tuple[int, list[str]] = (-1, [])
+        self.enabled = False
+        self.lap = self.end_frame = _noop
+        if enabled:
+            self.enable()
+
+    def enable(self):
+        self.enabled = True
+        self._frame = [0.0] * len(self.phases)
+        self._t = time.perf_counter()
+        self.lap, self.end_frame = self._lap, self._end_frame
+
+    def disable(self):
+        self.enabled = False
+        self.lap = self.end_frame = _noop
+
+    def toggle(self) -> bool:
+        self.disable() if self.enabled else self.enable()
+        return self.enabled
+
+    def _lap(self, phase: str):
+        t = time.perf_counter()
+        self._frame[self._index[phase]] += t - self._t
+        self._t = t
+
+    def _end_frame(self):
+        self.samples[self.frames % self.window] = self._frame
+        self.frames += 1
+        self._frame = [0.0] * len(self.phases)
+
+    def recent(self) -> np.ndarray:
+        """Window rows oldest first, in seconds (fewer than `window` rows early on)."""
+        if self.frames <= self.window:
+            return self.samples[:self.frames]
+        k = self.frames % self.window
+        return np.concatenate((self.samples[k:], self.samples[:k]))
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """mean/p50/p95/max in ms per phase plus the whole frame, over the window."""
+        rows = self.recent() * 1e3
+        if not len(rows):
+            return {}
+        cols = {p: rows[:, i] for i, p in enumerate(self.phases)}
+        cols["frame"] = rows.sum(axis=1)
+        return {p: {"mean": float(c.mean()), "p50": float(np.percentile(c, 50)),
+                    "p95": float(np.percentile(c, 95)), "max": float(c.max())} for p, c in cols.items()}
+
+    def histogram(self, phase: str) -> list[int]:
+        """Frame counts per HIST_EDGES_MS bucket for one phase (or "frame") over the window."""
+        rows = self.recent() * 1e3
+        col = rows.sum(axis=1) if phase == "frame" else rows[:, self._index[phase]]
+        return np.histogram(col, bins=HIST_EDGES_MS)[0].tolist()
+
+    def page(self, stats: "SimStats", every: int = 15) -> list[str]:
+        """profile_lines(), recomputed every `every` frames so the HUD page itself stays cheap."""
+        if self.frames - self._page[0] >= every or not self._page[1]:
+            self._page = (self.frames, profile_lines(self, stats))
+        return self._page[1]
+
+class SimStats:
+    """State-transition counters and incremental episode metrics, fed once per physics step.
+
+    Works for both backends: step() only needs the FSM state name, the radial
+    distance to the target, the orbit direction and (phys) the stun timer.
+    """
+
+    def __init__(self, orbit_radius: float, dt: float):
+        self.orbit_radius = orbit_radius
+        self.dt = dt
+        self.reset()
+
+    def reset(self):
+        self.steps = 0
+        self.dives = 0
+        self.flips = 0
+        self.bounces = 0
+        self.glide_entries = 0
+        self.glide_time = 0.0
+        self.glide_max = 0.0
+        self.stun_events = 0
+        self.stun_time = 0.0
+        self.state_time = dict.fromkeys(STATE_NAMES, 0.0)
+        self.min_radial = math.inf
+        self.max_radial = 0.0
+        self.max_orbit_err = 0.0
+        self._radial_sum = 0.0
+        self._glide_run = 0.0
+        self._state = "ORBIT"
+        self._dir = None
+        self._stunned = False
+
+    def step(self, state: str, radial: float, orbit_dir: int, stun: float = 0.0, flipped: bool = False):
+        dt = self.dt
+        self.steps += 1
+        if state != self._state:
+            self.dives += state == "INWARD"
+            self.glide_entries += state == "WALL_GLIDE"
+            self._state = state
+        self.state_time[state] += dt
+        if state == "WALL_GLIDE":
+            self._glide_run += dt
+            self.glide_time += dt
+            if self._glide_run > self.glide_max:
+                self.glide_max = self._glide_run
+        else:
+            self._glide_run = 0.0
+
+        if self._dir is not None and orbit_dir != self._dir:
+            if flipped:
+                self.flips += 1
+            elif state != "WALL_GLIDE":
+                self.bounces += 1  # a wall reversed the sweep
+        self._dir = orbit_dir
+
+        stunned = stun > 0.0
+        if stunned:
+            self.stun_time += dt
+            self.stun_events += not self._stunned
+        self._stunned = stunned
+
+        self._radial_sum += radial
+        if radial < self.min_radial:
+            self.min_radial = radial
+        if radial > self.max_radial:
+            self.max_radial = radial
+        if state == "ORBIT":
+            err = abs(radial - self.orbit_radius)
+            if err > self.max_orbit_err:
+                self.max_orbit_err = err
+
+    @property
+    def sim_time(self) -> float:
+        return self.steps * self.dt
+
+    def as_dict(self) -> dict[str, float]:
+        d = {k: v for k, v in vars(self).items() if not k.startswith("_") and k != "state_time"}
+        d["sim_time"] = self.sim_time
+        d["mean_radial"] = self._radial_sum / self.steps if self.steps else 0.0
+        d.update({f"time_{s}": t for s, t in self.state_time.items()})
+        return d
+
+def profile_lines(prof: FrameProfiler, stats: SimStats) -> list[str]:
+    """HUD page text: per-phase timings (mean / p95 / max ms), counters and episode metrics."""
+    summ = prof.summary()
+    if not summ:
+        return ["profiler: collecting..."]
+    f = summ["frame"]
+    lines = [f"frame {f['mean']:6.2f} / {f['p95']:6.2f} / {f['max']:6.2f} ms  "
+             f"({1e3 / f['mean'] if f['mean'] else 0:.0f} fps, {min(prof.frames, prof.window)} frames)"]
+    lines += [f"  {p:12s}{summ[p]['mean']:6.2f} / {summ[p]['p95']:6.2f} / {summ[p]['max']:6.2f}" for p in prof.phases]
+    s = stats
+    lines.append(f"dives={s.dives}  flips={s.flips}  bounces={s.bounces}  "
+                 f"glides={s.glide_entries} ({s.glide_time:.2f}s, max {s.glide_max:.2f}s)  "
+                 f"stuns={s.stun_events} ({s.stun_time:.2f}s)")
+    if s.steps:
+        lines.append(f"t={s.sim_time:.1f}s  r min/mean/max={s.min_radial:.1f}/{s._radial_sum / s.steps:.1f}/"
+                     f"{s.max_radial:.1f}  max orbit err={s.max_orbit_err:.2f}")
+    return lines
+
+def export(path: str, prof: FrameProfiler, stats: SimStats, extra: dict | None = None):
+    """.json: summaries, histograms, counters and any `extra` sections; .csv: the rolling window, one row per
+    frame (ms), with `extra` (if any) in a PATH.json sidecar."""
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(("frame",) + prof.phases + ("total",))
+            first = prof.frames - len(prof.recent())
+            for k, row in enumerate(prof.recent() * 1e3, first):
+                w.writerow([k] + [f"{v:.4f}" for v in row] + [f"{row.sum():.4f}"])
+        if extra:
+            with open(path + ".json", "w") as f:
+                json.dump(extra, f, indent=2)
+        return
+    doc = {
+        "frames": prof.frames,
+        "window": min(prof.frames, prof.window),
+        "phases_ms": prof.summary(),
+        "hist_edges_ms": [e if math.isfinite(e) else None for e in HIST_EDGES_MS],
+        "histograms": {p: prof.histogram(p) for p in prof.phases + ("frame",)} if prof.frames else {},
+        "counters": stats.as_dict(),
+        **(extra or {}),
+    }
+    with open(path, "w") as f:
+        json.dump(doc, f, indent=2)
@@ -0,0 +1,173 @@
+"""Fixed-record binary trajectory files: one packed record per physics step.
+
+File layout: a 64-byte header (see HEADER) followed by `FRAME_DTYPE` records.
+The frame count is (file size - HEADER_SIZE) / record size, so a file cut short
+by a crash is still readable up to its last complete record, and frame i lives
+at a fixed offset (O(1) seek, memory-mappable).
+
+Recording fills a preallocated two-half ring buffer; a writer thread flushes
+each half while the loop keeps filling the other one.
+"""
+import queue
+import struct
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from .batch import STATE_CODES, STATE_NAMES
+
+MAGIC = b"GRVTRAJ\0"
+VERSION = 1
+HEADER_SIZE = 64
+# magic, version, record size, physics Hz, width, height, safety margin, orbit radius, dot radius, source
+HEADER = struct.Struct("<8sHHIfffff12s")
+
+FRAME_DTYPE = np.dtype([
+    ("step", "<u4"),
+    ("target", "<f4", (2,)),
+    ("agent", "<f4", (2,)),
+    ("u", "<f4", (2,)),           # unit vector target -> agent
+    ("radial", "<f4"),
+    ("stun", "<f4"),
+    ("state", "u1"),              # batch.STATE_CODES
+    ("orbit_dir", "i1"),
+    ("input", "i1", (2,)),        # target move axes
+    ("buttons", "u1"),            # BTN_* bits pressed before this step
+])
+
+BTN_DIVE, BTN_FLIP = 1, 2
+
+@dataclass
+class Header:
+    physics_hz: int
+    width: float
+    height: float
+    safety_margin: float
+    orbit_radius: float
+    dot_radius: float
+    source: str = "kinematic"
+
+    def pack(self) -> bytes:
+        raw = HEADER.pack(MAGIC, VERSION, FRAME_DTYPE.itemsize, self.physics_hz, self.width, self.height,
+                          self.safety_margin, self.orbit_radius, self.dot_radius, self.source.encode()[:12])
+        return raw.ljust(HEADER_SIZE, b"\0")
+
+    @classmethod
+    def unpack(cls, raw: bytes) -> "Header":
+        magic, version, rec, hz, w, h, m, r, dot, src = HEADER.unpack_from(raw)
+        if magic != MAGIC:
+            raise ValueError("not a trajectory file")
+        if version != VERSION or rec != FRAME_DTYPE.itemsize:
+            raise ValueError(f"unsupported trajectory format v{version} (record {rec} bytes)")
+        return cls(hz, w, h, m, r, dot, src.rstrip(b"\0").decode())
+
+    @classmethod
+    def from_cfg(cls, cfg, source: str = "kinematic") -> "Header":
+        return cls(cfg.PHYSICS_HZ, cfg.WIDTH, cfg.HEIGHT, cfg.SAFETY_MARGIN, cfg.ORBIT_RADIUS, cfg.DOT_RADIUS, source)
+
+class Recorder:
+    """Appends FRAME_DTYPE records to `path` through a ring buffer drained by a writer thread."""
+
+    def __init__(self, path: str, header: Header, capacity: int = 8192):
+        self.path = path
+        self.header = header
+        self.f = open(path, "wb")
+        self.f.write(header.pack())
+        self.buf = np.zeros(capacity - capacity % 2, dtype=FRAME_DTYPE)
+        self.half = len(self.buf) // 2
+        self.i = 0
+        self.count = 0
+        self.error: Exception | None = None  # first failed write, if any
+        # Each half is held by the loop while filling and by the writer while flushing.
+        self._halves = (threading.Semaphore(1), threading.Semaphore(1))
+        self._q: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._writer, name="trajectory-writer", daemon=True)
+        self._thread.start()
+        self._closed = False
+
+    def append(self, row: tuple):
+        if self.error is not None:
+            self._raise()
+        i = self.i
+        if i % self.half == 0:
+            self._halves[i // self.half].acquire()  # only blocks if the writer is a whole half behind
+        self.buf[i] = row
+        i += 1
+        self.count += 1
+        if i % self.half == 0:
+            self._q.put(((i - 1) // self.half, self.half))
+        self.i = i % len(self.buf)
+
+    def record_agent(self, step: int, target, agent, ix: int = 0, iy: int = 0, buttons: int = 0):
+        """One kinematic step (entities.Target / OrbitingAgent)."""
+        self.append((step, (target.x, target.y), (agent.gx, agent.gy), (agent.udx, agent.udy),
+                     agent.radial_distance, 0.0, STATE_CODES[agent.state], agent.orbit_direction,
+                     (ix, iy), buttons))
+
+    def record_robot(self, step: int, target, robot, ix: int = 0, iy: int = 0, buttons: int = 0):
+        """One phys_sim step (Target / Robot bodies)."""
+        b, t = robot.body, target.body
+        dx, dy = b.x - t.x, b.y - t.y
+        r = (dx * dx + dy * dy) ** 0.5
+        ux, uy = (dx / r, dy / r) if r > 1e-9 else (1.0, 0.0)
+        self.append((step, (t.x, t.y), (b.x, b.y), (ux, uy), r, robot.stun, STATE_CODES[robot.state],
+                     robot.orbit_dir, (ix, iy), buttons))
+
+    def _writer(self):
+        while True:
+            item = self._q.get()
+            if item is None:
+                return
+            h, n = item
+            start = h * self.half
+            if self.error is None:  # after a failure keep draining so append() never waits on a dead writer
+                try:
+                    self.f.write(self.buf[start:start + n].data)
+                except Exception as e:
+                    self.error = e
+            self._halves[h].release()
+
+    def _raise(self):
+        raise RuntimeError(f"trajectory recording to {self.path} failed writing a block") from self.error
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        n = self.i % self.half
+        if n and self.error is None:
+            self._q.put((self.i // self.half, n))
+        self._q.put(None)
+        self._thread.join()
+        self.f.close()
+        if self.error is not None:
+            self._raise()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class Trajectory:
+    """Memory-mapped view of a trajectory file; indexing is O(1) and touches only the pages read."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.header = Header.unpack(f.read(HEADER_SIZE))
+            f.seek(0, 2)
+            size = f.tell()
+        n = (size - HEADER_SIZE) // FRAME_DTYPE.itemsize
+        self.frames = (np.memmap(path, dtype=FRAME_DTYPE, mode="r", offset=HEADER_SIZE, shape=(n,))
+                       if n else np.zeros(0, dtype=FRAME_DTYPE))
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def __getitem__(self, i):
+        return self.frames[i]
+
+    @staticmethod
+    def state_name(code: int) -> str:
+        return STATE_NAMES[code]
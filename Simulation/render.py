@@ -0,0 +1,95 @@
+"""Frame rendering helpers: cached static layers, cached text surfaces, dirty-rect presentation.
+
+A frame is the static background (fill, bounds box, key-help line) rendered
+once into an off-screen surface, plus the moving sprites and HUD text drawn
+over it. Instead of clearing and flipping the whole window, FrameRenderer
+restores only the rectangles drawn last frame from the background and pushes
+the union of last and current rectangles to the display.
+"""
+from collections import OrderedDict
+from typing import Callable
+
+import pygame
+
+Color = tuple[int, int, int]
+
+class TextCache:
+    """font.render results keyed by (text, color); the least recently used entries are evicted."""
+
+    def __init__(self, font: pygame.font.Font, maxsize: int = 256, antialias: bool = True):
+        self.font = font
+        self.maxsize = maxsize
+        self.antialias = antialias
+        self._surfaces: OrderedDict[tuple[str, Color], pygame.Surface] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text: str, color: Color) -> pygame.Surface:
+        key = (text, color)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = self.font.render(text, self.antialias, color)
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.maxsize:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def blit(self, surf: pygame.Surface, text: str, color: Color, pos: tuple[int, int]) -> pygame.Rect:
+        return surf.blit(self.render(text, color), pos)
+
+def static_layer(size: tuple[int, int], fill: Color, *painters: Callable[[pygame.Surface], object]) -> pygame.Surface:
+    """Off-screen surface filled with `fill`, then drawn on by each painter(surface) in order."""
+    layer = pygame.Surface(size).convert()
+    layer.fill(fill)
+    for paint in painters:
+        paint(layer)
+    return layer
+
+class FrameRenderer:
+    """Draws frames over a cached background and updates only the screen areas that changed.
+
+    Per frame: begin() erases last frame's rectangles, draw calls report their
+    rects through mark(), present() updates old + new rects. After
+    invalidate() (first frame, new background, window exposed) the whole
+    screen is redrawn and flipped once.
+    """
+
+    def __init__(self, screen: pygame.Surface, background: pygame.Surface):
+        self.screen = screen
+        self.background = background
+        self._prev: list[pygame.Rect] = []
+        self._cur: list[pygame.Rect] = []
+        self._full = True
+
+    def set_background(self, background: pygame.Surface):
+        self.background = background
+        self.invalidate()
+
+    def invalidate(self):
+        self._full = True
+
+    def begin(self):
+        if self._full:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            bg, screen = self.background, self.screen
+            for r in self._prev:
+                screen.blit(bg, r, r)
+        self._cur = []
+
+    def mark(self, rect: pygame.Rect | None) -> pygame.Rect | None:
+        if rect:
+            self._cur.append(rect)
+        return rect
+
+    def present(self):
+        if self._full:
+            pygame.display.flip()
+            self._full = False
+        else:
+            pygame.display.update(self._prev + self._cur)
+        self._prev = self._cur
@@ -0,0 +1,122 @@
+"""Replay viewer for trajectory files written by Recorder (python -m Simulation.replay FILE)."""
+import argparse
+import math
+import sys
+
+import pygame
+
+from .config import Config
+from .entities import OrbitingAgent, Target
+from .recorder import BTN_DIVE, BTN_FLIP, Trajectory
+
+SPEEDS = (-16, -4, -1, -0.25, 0.25, 1, 4, 16)
+
+class ReplayViewer:
+    """Scrub a memory-mapped trajectory: only the frame on screen is read from disk."""
+
+    def __init__(self, path: str):
+        self.traj = Trajectory(path)
+        h = self.traj.header
+        self.cfg = Config(WIDTH=int(h.width), HEIGHT=int(h.height), SAFETY_MARGIN=int(h.safety_margin),
+                          ORBIT_RADIUS=h.orbit_radius, DOT_RADIUS=int(h.dot_radius), PHYSICS_HZ=h.physics_hz)
+        pygame.init()
+        self.screen = pygame.display.set_mode((self.cfg.WIDTH, self.cfg.HEIGHT + 24))
+        pygame.display.set_caption(f"Replay — {path}")
+        self.clock = pygame.time.Clock()
+        self.font = pygame.font.SysFont(None, 18)
+
+        # Entities are only used for their draw code.
+        self.target = Target(self.cfg)
+        self.agent = OrbitingAgent(self.cfg, self.target)
+
+        self.pos = 0.0  # fractional frame index
+        self.speed_index = SPEEDS.index(1)
+        self.playing = True
+        self.running = True
+
+    @property
+    def n(self) -> int:
+        return len(self.traj)
+
+    def seek(self, frame: float):
+        self.pos = min(max(frame, 0.0), max(self.n - 1, 0))
+
+    def handle_event(self, event: pygame.event.Event):
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type == pygame.KEYDOWN:
+            step = 10 if event.mod & pygame.KMOD_SHIFT else 1
+            if event.key == pygame.K_ESCAPE:
+                self.running = False
+            elif event.key == pygame.K_SPACE:
+                self.playing = not self.playing
+            elif event.key == pygame.K_RIGHT:
+                self.playing = False
+                self.seek(int(self.pos) + step)
+            elif event.key == pygame.K_LEFT:
+                self.playing = False
+                self.seek(int(self.pos) - step)
+            elif event.key == pygame.K_RIGHTBRACKET:
+                self.speed_index = min(self.speed_index + 1, len(SPEEDS) - 1)
+            elif event.key == pygame.K_LEFTBRACKET:
+                self.speed_index = max(self.speed_index - 1, 0)
+            elif event.key == pygame.K_HOME:
+                self.seek(0)
+            elif event.key == pygame.K_END:
+                self.seek(self.n - 1)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.pos[1] >= self.cfg.HEIGHT:
+            self.seek(event.pos[0] / self.cfg.WIDTH * (self.n - 1))
+        elif event.type == pygame.MOUSEMOTION and event.buttons[0] and event.pos[1] >= self.cfg.HEIGHT:
+            self.seek(event.pos[0] / self.cfg.WIDTH * (self.n - 1))
+
+    def draw(self):
+        cfg = self.cfg
+        self.screen.fill(cfg.BLACK)
+        pygame.draw.rect(self.screen, (40, 40, 40),
+                         (cfg.SAFETY_MARGIN, cfg.SAFETY_MARGIN,
+                          cfg.WIDTH - 2 * cfg.SAFETY_MARGIN, cfg.HEIGHT - 2 * cfg.SAFETY_MARGIN), 1)
+        if self.n:
+            fr = self.traj[int(self.pos)]
+            self.target.draw(self.screen, tuple(fr["target"]))
+            self.agent.draw(self.screen, tuple(fr["agent"]))
+            state = self.traj.state_name(int(fr["state"]))
+            angle = (math.atan2(fr["u"][1], fr["u"][0]) + 2 * math.pi) % (2 * math.pi)
+            buttons = ("DIVE " if fr["buttons"] & BTN_DIVE else "") + ("FLIP" if fr["buttons"] & BTN_FLIP else "")
+            lines = [
+                f"frame {int(self.pos)}/{self.n - 1}  t={fr['step'] / cfg.PHYSICS_HZ:7.2f}s  "
+                f"speed=x{SPEEDS[self.speed_index]}  {'playing' if self.playing else 'paused'}",
+                f"state={state}  r={fr['radial']:6.1f}  angle={angle:.2f} rad  dir={int(fr['orbit_dir'])}  "
+                f"stun={fr['stun']:.2f}",
+                f"input=({int(fr['input'][0])}, {int(fr['input'][1])})  {buttons}",
+                "SPACE: play/pause  LEFT/RIGHT: step (SHIFT x10)  [ ]: speed  HOME/END  click bar: seek  ESC: quit",
+            ]
+            for i, s in enumerate(lines):
+                self.screen.blit(self.font.render(s, True, cfg.GREY), (10, 10 + 18 * i))
+
+        # timeline
+        bar_y = cfg.HEIGHT + 8
+        pygame.draw.rect(self.screen, (60, 60, 60), (0, bar_y, cfg.WIDTH, 8))
+        if self.n > 1:
+            x = int(self.pos / (self.n - 1) * cfg.WIDTH)
+            pygame.draw.rect(self.screen, cfg.GREEN, (0, bar_y, x, 8))
+        pygame.display.flip()
+
+    def run(self):
+        while self.running:
+            frame_dt = self.clock.tick(self.cfg.FPS) / 1000.0
+            for event in pygame.event.get():
+                self.handle_event(event)
+            if self.playing:
+                self.seek(self.pos + SPEEDS[self.speed_index] * frame_dt * self.cfg.PHYSICS_HZ)
+            self.draw()
+        pygame.quit()
+
+def main():
+    ap = argparse.ArgumentParser(description="Scrub through a recorded trajectory file.")
+    ap.add_argument("path")
+    args = ap.parse_args()
+    ReplayViewer(args.path).run()
+    sys.exit()
+
+if __name__ == "__main__":
+    main()
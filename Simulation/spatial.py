@@ -0,0 +1,135 @@
+"""Uniform-grid spatial hash for broad-phase pair finding and neighbourhood queries."""
+import math
+from typing import Iterable, Sequence
+
+class SpatialHash:
+    """Buckets points into square cells keyed by integer (cx, cy).
+
+    With `cell` at least the largest interaction distance (e.g. the biggest
+    r_a + r_b), every interacting pair lies in the same or a neighbouring cell.
+    """
+
+    _NEIGHBOURS = tuple((dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1))
+
+    def __init__(self, cell: float):
+        if cell <= 0:
+            raise ValueError("cell size must be positive")
+        self.cell = float(cell)
+        self.inv_cell = 1.0 / self.cell
+        self.cells: dict[tuple[int, int], list[int]] = {}
+        self.xs: list[float] = []
+        self.ys: list[float] = []
+
+    @classmethod
+    def for_radii(cls, radii: Iterable[float]) -> "SpatialHash":
+        """Grid sized so any two touching circles share or neighbour a cell."""
+        return cls(2.0 * max(radii, default=1.0))
+
+    def key(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x * self.inv_cell), math.floor(y * self.inv_cell)
+
+    def build(self, xs: Sequence[float], ys: Sequence[float]):
+        """Rebuild from scratch; point i is xs[i], ys[i]. Buckets stay sorted by index."""
+        self.xs, self.ys = list(xs), list(ys)
+        cells: dict[tuple[int, int], list[int]] = {}
+        inv = self.inv_cell
+        floor = math.floor
+        for i, (x, y) in enumerate(zip(self.xs, self.ys)):
+            k = (floor(x * inv), floor(y * inv))
+            bucket = cells.get(k)
+            if bucket is None:
+                cells[k] = [i]
+            else:
+                bucket.append(i)
+        self.cells = cells
+
+    def move(self, i: int, x: float, y: float):
+        """Incrementally update point i (only touches buckets if its cell changed)."""
+        old = self.key(self.xs[i], self.ys[i])
+        new = self.key(x, y)
+        self.xs[i], self.ys[i] = x, y
+        if old == new:
+            return
+        bucket = self.cells[old]
+        bucket.remove(i)
+        if not bucket:
+            del self.cells[old]
+        bucket = self.cells.setdefault(new, [])
+        # keep buckets index-sorted so query order stays deterministic
+        pos = len(bucket)
+        while pos and bucket[pos - 1] > i:
+            pos -= 1
+        bucket.insert(pos, i)
+
+    def pairs(self) -> list[tuple[int, int]]:
+        """Candidate pairs (i, j), i < j, in ascending lexicographic order."""
+        cells = self.cells
+        out: list[tuple[int, int]] = []
+        for i, (x, y) in enumerate(zip(self.xs, self.ys)):
+            cx, cy = self.key(x, y)
+            js: list[int] = []
+            for dx, dy in self._NEIGHBOURS:
+                bucket = cells.get((cx + dx, cy + dy))
+                if bucket:
+                    js.extend(j for j in bucket if j > i)
+            if js:
+                js.sort()
+                out.extend((i, j) for j in js)
+        return out
+
+    def query(self, x: float, y: float, radius: float) -> list[int]:
+        """Indices within `radius` of (x, y), ascending."""
+        r2 = radius * radius
+        reach = max(1, math.ceil(radius * self.inv_cell))
+        cx, cy = self.key(x, y)
+        xs, ys, cells = self.xs, self.ys, self.cells
+        hits: list[int] = []
+        for gy in range(cy - reach, cy + reach + 1):
+            for gx in range(cx - reach, cx + reach + 1):
+                for j in cells.get((gx, gy), ()):
+                    if (xs[j] - x) ** 2 + (ys[j] - y) ** 2 <= r2:
+                        hits.append(j)
+        hits.sort()
+        return hits
+
+    def nearest(self, x: float, y: float, max_radius: float = math.inf, exclude: int = -1) -> int:
+        """Index of the closest point (lowest index on ties), or -1 if none within max_radius."""
+        if not self.xs:
+            return -1
+        xs, ys, cells = self.xs, self.ys, self.cells
+        cx, cy = self.key(x, y)
+        best, best_d2 = -1, max_radius * max_radius
+        ring = 0
+        # A point found in ring k is at most (k + 1) cells away; stop once the next ring can't beat it.
+        max_ring = int(min(max_radius * self.inv_cell + 1, 1 << 30)) if math.isfinite(max_radius) else None
+        n_cells = len(cells)
+        scanned = 0
+        while True:
+            for gx, gy in self._ring(cx, cy, ring):
+                bucket = cells.get((gx, gy))
+                if not bucket:
+                    continue
+                scanned += 1
+                for j in bucket:
+                    if j == exclude:
+                        continue
+                    d2 = (xs[j] - x) ** 2 + (ys[j] - y) ** 2
+                    if d2 < best_d2 or (d2 == best_d2 and 0 <= j < best):
+                        best, best_d2 = j, d2
+            if best >= 0 and (ring * self.cell) ** 2 > best_d2:
+                return best
+            if (max_ring is not None and ring >= max_ring) or scanned >= n_cells:
+                return best
+            ring += 1
+
+    @staticmethod
+    def _ring(cx: int, cy: int, k: int):
+        if k == 0:
+            yield cx, cy
+            return
+        for gx in range(cx - k, cx + k + 1):
+            yield gx, cy - k
+            yield gx, cy + k
+        for gy in range(cy - k + 1, cy + k):
+            yield cx - k, gy
+            yield cx + k, gy
@@ -0,0 +1,613 @@
+"""Headless sim server streaming quantized, delta-encoded state to remote viewers over TCP.
+
+    python -m Simulation.stream serve --agents 2000 --rate 30            # real time, port 5077
+    python -m Simulation.stream serve --backend phys --warp 0            # free-running, as fast as it steps
+    python -m Simulation.stream view [--host 127.0.0.1] [--port 5077]    # arrows / SPACE / C steer the server
+
+The server steps the target plus `agents` orbiters (one OrbitingAgent or
+phys_sim.Robot, the rest a Swarm / BatchPhysics block following the same
+target) at PHYSICS_HZ, `warp` times real time, and never renders. At `rate` Hz
+it sends every client one frame:
+
+    u32 length | HEADER (kind, seq, step, sim time, wall time, target x/y, n) | zlib payload
+
+Positions are quantized to 1/SCALE px as int16; each agent's FSM state and
+orbit direction share one flag byte. A KEY frame holds absolute values, a
+DELTA frame the int16 difference from the previous frame (flags XORed), with
+low and high bytes split into separate planes so the mostly-zero high bytes
+compress away. A client gets a KEY on connect and then the same DELTA bytes as
+everyone else; if its socket backs up past `backlog` bytes, frames are skipped
+rather than queued (keeping latency bounded) and it resyncs with a KEY.
+
+Viewers send control.MESSAGE packets back: CMD carries BTN_* bits, MOVE the
+target's arrow-key axes. The server applies them as soon as they arrive.
+Viewers draw with Target.draw / Swarm.draw over the usual static layer and
+interpolate between the last two frames, i.e. they run one update interval
+behind the stream.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import select
+import socket
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from .control import CMD, MESSAGE
+from .recorder import BTN_DIVE, BTN_FLIP
+
+MOVE = 4  # control.MESSAGE kind: target move axes (ix, iy)
+HELLO, KEY, DELTA = 0, 1, 2
+LENGTH = struct.Struct("<I")
+# kind, seq, physics step, sim time, server wall time (time.time), target x/y (quantized), agent count
+HEADER = struct.Struct("<BIIddhhI")
+SCALE = 16  # quantization steps per pixel
+FLIP_BIT = 4  # flag byte: state code in bits 0-1, set when orbit direction is negative
+PORT = 5077
+
+# ---- worlds ----
+
+class KinematicWorld:
+    """Target + OrbitingAgent (slot 0) + a Swarm for the remaining slots."""
+
+    backend = "kinematic"
+
+    def __init__(self, agents: int = 1):
+        from .config import Config
+        from .entities import OrbitingAgent, Target
+        from .swarm import Swarm
+        self.cfg = Config()
+        self.target = Target(self.cfg)
+        self.agent = OrbitingAgent(self.cfg, self.target)
+        self.swarm = Swarm(self.cfg, self.target, agents - 1, directions=(-1, 1)) if agents > 1 else None
+        self.n = agents
+
+    def command(self, buttons: int):
+        if buttons & BTN_DIVE:
+            self.agent.trigger_dive()
+            if self.swarm:
+                self.swarm.trigger_dive()
+        if buttons & BTN_FLIP:
+            self.agent.flip_orbit_dir()
+            if self.swarm:
+                self.swarm.flip_orbit_dir()
+
+    def step(self, dt: float, ix: float, iy: float):
+        self.target.step(dt, ix, iy)
+        self.agent.update(dt)
+        if self.swarm:
+            self.swarm.step(dt)
+
+    def columns(self, xs: np.ndarray, ys: np.ndarray, state: np.ndarray, neg: np.ndarray) -> tuple[float, float]:
+        """Write agent x, y, state code and (orbit direction < 0) into the slot arrays; returns the target."""
+        from .batch import STATE_CODES
+        a = self.agent
+        xs[0], ys[0], state[0], neg[0] = a.gx, a.gy, STATE_CODES[a.state], a.orbit_direction < 0
+        if self.swarm:
+            eng = self.swarm.engine
+            xs[1:], ys[1:], state[1:] = eng.gx, eng.gy, eng.state
+            np.less(eng.orbit_direction, 0, out=neg[1:])
+        return self.target.x, self.target.y
+
+class RobotWorld:
+    """phys_sim Target + Robot (slot 0) + a BatchPhysics block whose targets follow the same body."""
+
+    backend = "phys"
+
+    def __init__(self, agents: int = 1):
+        from .all_in_one import phys_sim
+        from .all_in_one.phys_batch import BatchPhysics
+        self.cfg = phys_sim.Config()
+        self.target = phys_sim.Target(self.cfg)
+        self.agent = phys_sim.Robot(self.cfg, self.target)
+        self.batch = BatchPhysics(self.cfg, agents - 1) if agents > 1 else None
+        self.n = agents
+        if self.batch:
+            # Spread the extra robots around the orbit, alternating directions.
+            b, cfg = self.batch, self.cfg
+            theta = 2 * math.pi * (np.arange(b.n) + 1) / agents
+            b.orbit_dir[:] = np.resize(np.array([-1, 1], dtype=np.int8), b.n)
+            b.x[:] = b.tx + cfg.ORBIT_RADIUS * np.cos(theta)
+            b.y[:] = b.ty + cfg.ORBIT_RADIUS * np.sin(theta)
+            b.vx[:] = -b.orbit_dir * cfg.TANGENTIAL_SPEED * np.sin(theta)
+            b.vy[:] = b.orbit_dir * cfg.TANGENTIAL_SPEED * np.cos(theta)
+            self._all = np.ones(b.n, dtype=bool)
+
+    def command(self, buttons: int):
+        if buttons & BTN_DIVE:
+            self.agent.command_dive()
+            if self.batch:
+                self.batch.command_dive(self._all)
+        if buttons & BTN_FLIP:
+            self.agent.flip_orbit()
+            if self.batch:
+                self.batch.flip_orbit(self._all)
+
+    def step(self, dt: float, ix: float, iy: float):
+        self.target.step(dt, ix, iy)
+        self.agent.update(dt)
+        if self.batch:
+            t, b = self.target.body, self.batch
+            b.tx.fill(t.x)
+            b.ty.fill(t.y)
+            b.tvx.fill(0.0)
+            b.tvy.fill(0.0)
+            b.step(dt)
+
+    def columns(self, xs: np.ndarray, ys: np.ndarray, state: np.ndarray, neg: np.ndarray) -> tuple[float, float]:
+        from .all_in_one.phys_batch import STATE_CODES
+        a = self.agent
+        xs[0], ys[0], state[0], neg[0] = a.body.x, a.body.y, STATE_CODES[a.state], a.orbit_dir < 0
+        if self.batch:
+            b = self.batch
+            xs[1:], ys[1:], state[1:] = b.x, b.y, b.state
+            np.less(b.orbit_dir, 0, out=neg[1:])
+        t = self.target.body
+        return t.x, t.y
+
+WORLDS = {"kinematic": KinematicWorld, "phys": RobotWorld}
+
+# ---- wire format ----
+
+def _planes(q: np.ndarray) -> bytes:
+    """int16 array as all low bytes followed by all high bytes."""
+    return q.view(np.uint8).reshape(-1, 2).T.tobytes()
+
+def _unplanes(data: bytes, count: int) -> np.ndarray:
+    b = np.frombuffer(data, dtype=np.uint8, count=2 * count).reshape(2, count)
+    return np.ascontiguousarray(b.T).view(np.int16).reshape(count)
+
+def _q(v: float, scale: int) -> int:
+    return max(-32768, min(32767, round(v * scale)))
+
+class StateEncoder:
+    """Quantizes slot arrays and produces KEY / DELTA frames relative to the last committed frames."""
+
+    def __init__(self, n: int, scale: int = SCALE, level: int = 1):
+        self.n = n
+        self.scale = scale
+        self.level = level
+        self.xy = np.zeros((2, n), dtype=np.int16)
+        self.flags = np.zeros(n, dtype=np.uint8)
+        self.prev_xy = np.zeros_like(self.xy)
+        self.prev2_xy = np.zeros_like(self.xy)
+        self.prev_flags = np.zeros_like(self.flags)
+        self._f = np.zeros((2, n))
+        self._dxy = np.zeros_like(self.xy)
+        self._vxy = np.zeros_like(self.xy)
+        self._dflags = np.zeros_like(self.flags)
+        self.head = (0, 0, 0.0, 0, 0)
+
+    def quantize(self, seq: int, step: int, t: float, tx: float, ty: float, xs: np.ndarray, ys: np.ndarray,
+                 state: np.ndarray, neg: np.ndarray):
+        f = self._f
+        np.multiply(xs, self.scale, out=f[0])
+        np.multiply(ys, self.scale, out=f[1])
+        np.rint(f, out=f)
+        np.clip(f, -32768, 32767, out=f)
+        self.xy[:] = f
+        np.multiply(neg, FLIP_BIT, out=self.flags, casting="unsafe")
+        self.flags |= state.astype(np.uint8, copy=False)
+        self.head = (seq, step, t, _q(tx, self.scale), _q(ty, self.scale))
+
+    def frame(self, kind: int) -> bytes:
+        """KEY: absolute positions, flags, then the last motion (xy - prev) so a fresh decoder can predict.
+        DELTA: residual against the constant-velocity prediction 2 * prev - prev2, flags XORed.
+        All int16 arithmetic wraps; the decoder undoes it modulo 2**16."""
+        seq, step, t, qx, qy = self.head
+        v = np.subtract(self.xy, self.prev_xy, out=self._vxy)
+        if kind == KEY:
+            payload = _planes(self.xy) + self.flags.tobytes() + _planes(v)
+        else:
+            d = np.subtract(v, self.prev_xy, out=self._dxy)
+            d += self.prev2_xy
+            np.bitwise_xor(self.flags, self.prev_flags, out=self._dflags)
+            payload = _planes(d) + self._dflags.tobytes()
+        body = HEADER.pack(kind, seq, step, t, time.time(), qx, qy, self.n) + zlib.compress(payload, self.level)
+        return LENGTH.pack(len(body)) + body
+
+    def commit(self):
+        self.prev2_xy[:] = self.prev_xy
+        self.prev_xy[:] = self.xy
+        self.prev_flags[:] = self.flags
+
+def hello(world, scale: int = SCALE, rate: float = 0.0) -> bytes:
+    cfg = world.cfg
+    meta = {"backend": world.backend, "width": cfg.WIDTH, "height": cfg.HEIGHT, "orbit_radius": cfg.ORBIT_RADIUS,
+            "dot_radius": cfg.DOT_RADIUS, "safety_margin": cfg.SAFETY_MARGIN, "scale": scale, "rate": rate}
+    body = bytes([HELLO]) + json.dumps(meta).encode()
+    return LENGTH.pack(len(body)) + body
+
+class Frame:
+    """One decoded update: positions in px, state codes and orbit directions."""
+
+    __slots__ = ("seq", "step", "t", "wall", "tx", "ty", "xs", "ys", "state", "orbit_dir", "key")
+
+    def __init__(self, seq, step, t, wall, tx, ty, xs, ys, state, orbit_dir, key):
+        self.seq, self.step, self.t, self.wall, self.tx, self.ty = seq, step, t, wall, tx, ty
+        self.xs, self.ys, self.state, self.orbit_dir, self.key = xs, ys, state, orbit_dir, key
+
+class StateDecoder:
+    """Reassembles length-prefixed frames from a byte stream and undoes the delta encoding."""
+
+    def __init__(self):
+        self.meta: dict | None = None
+        self.buf = bytearray()
+        self.xy: np.ndarray | None = None
+        self.prev_xy: np.ndarray | None = None
+        self.flags: np.ndarray | None = None
+        self.bytes = 0
+        self.frames = 0
+
+    def feed(self, data: bytes) -> list[Frame]:
+        self.buf += data
+        self.bytes += len(data)
+        out = []
+        buf = self.buf
+        while len(buf) >= LENGTH.size:
+            (size,) = LENGTH.unpack_from(buf)
+            if len(buf) < LENGTH.size + size:
+                break
+            body = bytes(buf[LENGTH.size:LENGTH.size + size])
+            del buf[:LENGTH.size + size]
+            frame = self._decode(body)
+            if frame:
+                out.append(frame)
+        return out
+
+    def _decode(self, body: bytes) -> Frame | None:
+        if body[0] == HELLO:
+            self.meta = json.loads(body[1:])
+            return None
+        kind, seq, step, t, wall, qx, qy, n = HEADER.unpack_from(body)
+        raw = zlib.decompress(body[HEADER.size:])
+        xy = _unplanes(raw, 2 * n).reshape(2, n)
+        flags = np.frombuffer(raw, dtype=np.uint8, offset=4 * n, count=n)
+        if kind == KEY:
+            self.xy, self.flags = xy.copy(), flags.copy()
+            self.prev_xy = xy - _unplanes(raw[5 * n:], 2 * n).reshape(2, n)
+        elif self.xy is None or len(self.flags) != n:
+            return None  # delta without its key frame
+        else:
+            cur = self.xy
+            self.xy = cur + cur - self.prev_xy + xy
+            self.prev_xy = cur
+            self.flags ^= flags
+        self.frames += 1
+        s = 1.0 / self.meta["scale"]
+        return Frame(seq, step, t, wall, qx * s, qy * s, self.xy[0] * s, self.xy[1] * s,
+                     self.flags & 3, np.where(self.flags & FLIP_BIT, -1, 1), kind == KEY)
+
+# ---- server ----
+
+class _Client:
+    __slots__ = ("sock", "addr", "out", "inbuf", "needs_key", "sent", "skipped")
+
+    def __init__(self, sock: socket.socket, addr):
+        self.sock, self.addr = sock, addr
+        self.out = bytearray()
+        self.inbuf = bytearray()
+        self.needs_key = True
+        self.sent = 0
+        self.skipped = 0
+
+class SimServer:
+    """Steps a world headless and streams it to every connected viewer; see the module docstring."""
+
+    def __init__(self, world, bind: tuple[str, int] = ("127.0.0.1", PORT), rate: float = 30.0, warp: float = 1.0,
+                 backlog: int = 1 << 18, scale: int = SCALE):
+        self.world = world
+        self.rate = rate
+        self.warp = warp  # 0: free-running
+        self.backlog = backlog
+        self.dt = world.cfg.PHYSICS_DT
+        self.hz = world.cfg.PHYSICS_HZ
+        self.encoder = StateEncoder(world.n, scale)
+        n = world.n
+        self._xs, self._ys = np.zeros(n), np.zeros(n)
+        self._state, self._neg = np.zeros(n, dtype=np.int8), np.zeros(n, dtype=bool)
+        self._hello = hello(world, scale, rate)
+        self.listener = socket.create_server(bind)
+        self.listener.setblocking(False)
+        self.clients: list[_Client] = []
+        self.move = (0.0, 0.0)
+        self.steps = 0
+        self.seq = 0
+        self.bytes_sent = 0
+        self.frames_sent = 0
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self.listener.getsockname()
+
+    def _accept(self):
+        while True:
+            try:
+                sock, addr = self.listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            sock.setblocking(False)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            c = _Client(sock, addr)
+            c.out += self._hello
+            self.clients.append(c)
+
+    def _drop(self, c: _Client):
+        c.sock.close()
+        self.clients.remove(c)
+
+    def _receive(self, c: _Client):
+        try:
+            data = c.sock.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._drop(c)
+            return
+        c.inbuf += data
+        size = MESSAGE.size
+        while len(c.inbuf) >= size:
+            kind, _, a, b, _ = MESSAGE.unpack_from(c.inbuf)
+            del c.inbuf[:size]
+            if kind == CMD:
+                self.world.command(int(a))
+            elif kind == MOVE:
+                self.move = (max(-1.0, min(1.0, a)), max(-1.0, min(1.0, b)))
+
+    def _flush(self, c: _Client):
+        if not c.out:
+            return
+        try:
+            k = c.sock.send(c.out)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self._drop(c)
+            return
+        del c.out[:k]
+        c.sent += k
+        self.bytes_sent += k
+
+    def publish(self):
+        """Encode the current state once and queue it for every client (a KEY for those resyncing)."""
+        enc = self.encoder
+        tx, ty = self.world.columns(self._xs, self._ys, self._state, self._neg)
+        enc.quantize(self.seq, self.steps, self.steps * self.dt, tx, ty, self._xs, self._ys, self._state, self._neg)
+        delta = key = None
+        for c in self.clients:
+            if len(c.out) > self.backlog:
+                c.needs_key = True  # slow reader: skip rather than queue stale frames
+                c.skipped += 1
+                continue
+            if c.needs_key:
+                key = key or enc.frame(KEY)
+                c.out += key
+                c.needs_key = False
+            else:
+                delta = delta or enc.frame(DELTA)
+                c.out += delta
+        enc.commit()
+        self.seq += 1
+        self.frames_sent += 1
+        for c in list(self.clients):
+            self._flush(c)
+
+    def _step(self, count: int):
+        ix, iy = self.move
+        world, dt = self.world, self.dt
+        for _ in range(count):
+            world.step(dt, ix, iy)
+        self.steps += count
+
+    def poll(self, timeout: float):
+        """Wait up to `timeout` for connections, commands or writable sockets, and service them."""
+        reads = [self.listener] + [c.sock for c in self.clients]
+        writes = [c.sock for c in self.clients if c.out]
+        r, w, _ = select.select(reads, writes, [], max(0.0, timeout))
+        if self.listener in r:
+            self._accept()
+        for c in list(self.clients):
+            if c.sock in r:
+                self._receive(c)
+            if c in self.clients and c.sock in w:
+                self._flush(c)
+
+    def serve(self, seconds: float | None = None, chunk: int = 64):
+        """Run until `seconds` of wall time pass (forever if None).
+
+        Real time (warp > 0): the world is caught up to the wall clock whenever
+        something arrives and before each publish. Free-running (warp == 0):
+        steps go in `chunk`s with a non-blocking poll in between.
+        """
+        clock = time.perf_counter
+        t0 = clock()
+        period = 1.0 / self.rate
+        next_pub = t0
+        try:
+            while seconds is None or clock() - t0 < seconds:
+                if self.warp:
+                    self.poll(next_pub - clock())
+                    due = int((clock() - t0) * self.hz * self.warp) - self.steps
+                    if due > 0:
+                        self._step(due)
+                else:
+                    self.poll(0.0)
+                    self._step(chunk)
+                if clock() >= next_pub:
+                    self.publish()
+                    next_pub += period
+                    if clock() > next_pub + period:
+                        next_pub = clock()  # fell behind: don't burst
+        finally:
+            for c in list(self.clients):
+                self._drop(c)
+            self.listener.close()
+
+# ---- viewer ----
+
+class Viewer:
+    """Connects to a SimServer, draws interpolated frames and sends keyboard commands back."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = PORT, fps: int = 60):
+        self.sock = socket.create_connection((host, port))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.setblocking(False)
+        self.decoder = StateDecoder()
+        self.fps = fps
+        self.prev: Frame | None = None
+        self.cur: Frame | None = None
+        self.arrived = 0.0
+        self.interval = 0.0   # running estimate of the time between frames
+        self.latency = 0.0    # wall-clock age of the newest frame on arrival (same-host clocks)
+        self.move = (0, 0)
+        self.running = True
+
+    def send(self, kind: int, a: float = 0.0, b: float = 0.0):
+        self.sock.sendall(MESSAGE.pack(kind, time.time(), a, b, 0.0))
+
+    def receive(self):
+        """Drain the socket; keep the newest two frames."""
+        while True:
+            try:
+                data = self.sock.recv(1 << 16)
+            except (BlockingIOError, InterruptedError):
+                return
+            if not data:
+                self.running = False
+                return
+            for f in self.decoder.feed(data):
+                now = time.perf_counter()
+                if self.cur is not None:
+                    gap = now - self.arrived
+                    self.interval = gap if not self.interval else 0.9 * self.interval + 0.1 * gap
+                self.prev = self.cur if self.cur is not None and len(self.cur.xs) == len(f.xs) and not f.key else f
+                self.cur = f
+                self.arrived = now
+                self.latency = time.time() - f.wall
+
+    def alpha(self) -> float:
+        if not self.interval:
+            return 1.0
+        return min(1.0, (time.perf_counter() - self.arrived) / self.interval)
+
+    def _setup(self):
+        import pygame
+        from .config import Config
+        from .entities import Target
+        from .hud import HUD
+        from .render import FrameRenderer, static_layer
+        from .swarm import Swarm
+        while self.decoder.meta is None or self.cur is None:
+            select.select([self.sock], [], [], 1.0)
+            self.receive()
+            if not self.running:
+                raise ConnectionError("server closed the stream before the first frame")
+        m = self.decoder.meta
+        self.cfg = cfg = Config(WIDTH=m["width"], HEIGHT=m["height"], ORBIT_RADIUS=m["orbit_radius"],
+                                DOT_RADIUS=m["dot_radius"], SAFETY_MARGIN=m["safety_margin"], FPS=self.fps)
+        pygame.init()
+        self.screen = pygame.display.set_mode((cfg.WIDTH, cfg.HEIGHT))
+        pygame.display.set_caption(f"Stream viewer ({m['backend']})")
+        self.hud = HUD(cfg, pygame.font.SysFont(None, 18))
+        self.target = Target(cfg)
+        self.dots = Swarm(cfg, self.target, len(self.cur.xs))  # only its sprite batch is used
+
+        def bounds(surf):
+            pygame.draw.rect(surf, (40, 40, 40), (cfg.SAFETY_MARGIN, cfg.SAFETY_MARGIN,
+                                                  cfg.WIDTH - 2 * cfg.SAFETY_MARGIN, cfg.HEIGHT - 2 * cfg.SAFETY_MARGIN), 1)
+        self.renderer = FrameRenderer(self.screen, static_layer(self.screen.get_size(), cfg.BLACK, bounds))
+
+    def _handle(self, event):
+        import pygame
+        if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+            self.running = False
+        elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+            self.renderer.invalidate()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+            self.send(CMD, BTN_DIVE)
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_c:
+            self.send(CMD, BTN_FLIP)
+
+    def draw(self):
+        from .batch import STATE_NAMES
+        from .swarm import Swarm
+        p, c, a = self.prev, self.cur, self.alpha()
+        r = self.renderer
+        r.begin()
+        if self.dots.n != len(c.xs):
+            self.dots = Swarm(self.cfg, self.target, len(c.xs))
+        r.mark(self.target.draw(self.screen, (p.tx + (c.tx - p.tx) * a, p.ty + (c.ty - p.ty) * a)))
+        r.mark(self.dots.draw(self.screen, p.xs + (c.xs - p.xs) * a, p.ys + (c.ys - p.ys) * a))
+        d = self.decoder
+        lines = [f"agents={len(c.xs)}  step={c.step}  t={c.t:7.2f}s  agent0={STATE_NAMES[c.state[0]]} "
+                 f"dir={'CW' if c.orbit_dir[0] == 1 else 'CCW'}",
+                 f"frames={d.frames}  {d.bytes / max(d.frames, 1):,.0f} B/frame  "
+                 f"interval={self.interval * 1e3:4.1f} ms  latency={self.latency * 1e3:4.1f} ms"]
+        for rect in self.hud.draw_lines(self.screen, lines, row=0):
+            r.mark(rect)
+        r.present()
+
+    def run(self, seconds: float | None = None):
+        import pygame
+        self._setup()
+        clock = pygame.time.Clock()
+        t0 = time.perf_counter()
+        try:
+            while self.running and (seconds is None or time.perf_counter() - t0 < seconds):
+                clock.tick(self.fps)
+                for event in pygame.event.get():
+                    self._handle(event)
+                keys = pygame.key.get_pressed()
+                move = (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT], keys[pygame.K_DOWN] - keys[pygame.K_UP])
+                if move != self.move:
+                    self.move = move
+                    self.send(MOVE, *move)
+                self.receive()
+                self.draw()
+        finally:
+            self.sock.close()
+            pygame.quit()
+
+def main():
+    ap = argparse.ArgumentParser(description="Stream a headless simulation to viewers, or view one.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("serve", help="step the world headless and stream it")
+    s.add_argument("--backend", choices=tuple(WORLDS), default="kinematic")
+    s.add_argument("--agents", type=int, default=1)
+    s.add_argument("--rate", type=float, default=30.0, help="frames per second sent to viewers")
+    s.add_argument("--warp", type=float, default=1.0, help="sim seconds per wall second; 0 runs free")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=PORT)
+    s.add_argument("--seconds", type=float, help="stop after this long (default: run until interrupted)")
+    v = sub.add_parser("view", help="connect to a server and draw it")
+    v.add_argument("--host", default="127.0.0.1")
+    v.add_argument("--port", type=int, default=PORT)
+    v.add_argument("--seconds", type=float)
+    args = ap.parse_args()
+
+    if args.cmd == "view":
+        viewer = Viewer(args.host, args.port)
+        viewer.run(args.seconds)
+        d = viewer.decoder
+        print(f"{d.frames} frames, {d.bytes / max(d.frames, 1):,.0f} B/frame, last latency {viewer.latency * 1e3:.1f} ms")
+        return
+    server = SimServer(WORLDS[args.backend](args.agents), (args.host, args.port), args.rate, args.warp)
+    print(f"serving {args.backend} x{args.agents} on {server.address[0]}:{server.address[1]} at {args.rate:g} Hz")
+    t0 = time.perf_counter()
+    try:
+        server.serve(args.seconds)
+    except KeyboardInterrupt:
+        pass
+    wall = time.perf_counter() - t0
+    print(f"{server.steps} steps in {wall:.1f} s ({server.steps / wall:,.0f}/s), {server.frames_sent} frames, "
+          f"{server.bytes_sent / wall / 1024:,.1f} KiB/s sent")
+
+if __name__ == "__main__":
+    main()
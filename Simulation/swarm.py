@@ -0,0 +1,133 @@
+"""Swarm mode: many orbiting agents around one shared target, stepped and drawn as arrays.
+
+    python -m Simulation.main --swarm 4000
+    python -m Simulation.swarm --agents 4000 --frames 600    # headless frame-time check
+
+Agent i starts in phase slot i (evenly spaced around the orbit) with direction
+directions[i % len(directions)]. The agents run on a BatchOrbitEngine whose
+per-agent target columns are all overwritten with the one shared target before
+each step, so every agent follows the same FSM as OrbitingAgent. Drawing blits
+one pre-rendered dot sprite per agent in a single `Surface.blits` call and
+reports one bounding rect, so the dirty-rect renderer stays cheap.
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .batch import BatchOrbitEngine
+from .config import Config
+from .entities import Target
+
+if TYPE_CHECKING:
+    import pygame
+
+class Swarm:
+    """N agents sharing one Target, held in a BatchOrbitEngine."""
+
+    def __init__(self, cfg: Config, target: Target, n: int, directions: tuple[int, ...] = (1, -1)):
+        self.cfg = cfg
+        self.target = target
+        self.n = n
+        self.engine = BatchOrbitEngine(cfg, n)
+        self.assign_slots(directions)
+        self._sprite: pygame.Surface | None = None
+
+    def assign_slots(self, directions: tuple[int, ...] = (1, -1)):
+        """Evenly spaced phases; directions cycle over the slots. Resets every agent to ORBIT."""
+        eng = self.engine
+        theta = 2 * math.pi * np.arange(self.n) / max(self.n, 1)
+        eng.udx, eng.udy = np.cos(theta), np.sin(theta)
+        eng.orbit_direction[:] = np.resize(np.asarray(directions, dtype=np.int8), self.n)
+        eng.radial_distance[:] = self.cfg.ORBIT_RADIUS
+        eng.state[:] = 0
+        eng.glide_axis[:] = -1
+        eng.glide_sign[:] = 0
+        self._follow_target()
+        eng.gx = eng.tx + eng.udx * eng.radial_distance
+        eng.gy = eng.ty + eng.udy * eng.radial_distance
+
+    @property
+    def positions(self) -> tuple[np.ndarray, np.ndarray]:
+        return self.engine.gx, self.engine.gy
+
+    def _follow_target(self):
+        self.engine.tx.fill(self.target.x)
+        self.engine.ty.fill(self.target.y)
+
+    def trigger_dive(self, mask: np.ndarray | None = None):
+        self.engine.trigger_dive(np.ones(self.n, dtype=bool) if mask is None else mask)
+
+    def flip_orbit_dir(self, mask: np.ndarray | None = None):
+        self.engine.flip_orbit_dir(np.ones(self.n, dtype=bool) if mask is None else mask)
+
+    def step(self, dt: float):
+        """One physics step; call after the shared target has moved."""
+        self._follow_target()
+        self.engine.step(dt)
+
+    def sprite(self) -> pygame.Surface:
+        if self._sprite is None:
+            import pygame
+            r = self.cfg.DOT_RADIUS
+            # Colorkeyed + RLE rather than per-pixel alpha: about 2x faster to blit.
+            sprite = pygame.Surface((2 * r + 1, 2 * r + 1))
+            sprite.fill(self.cfg.BLACK)
+            pygame.draw.circle(sprite, self.cfg.GREEN, (r, r), r)
+            sprite.set_colorkey(self.cfg.BLACK, pygame.RLEACCEL)
+            self._sprite = sprite.convert()
+        return self._sprite
+
+    def draw(self, surf: pygame.Surface, xs: np.ndarray, ys: np.ndarray) -> pygame.Rect | None:
+        """Blit the dot sprite at every (xs, ys); returns the bounding rect of all of them."""
+        import pygame
+        if not self.n:
+            return None
+        sprite = self.sprite()
+        r = self.cfg.DOT_RADIUS
+        px = xs.astype(np.int32) - r
+        py = ys.astype(np.int32) - r
+        surf.blits([(sprite, p) for p in zip(px.tolist(), py.tolist())], doreturn=False)
+        x0, y0 = int(px.min()), int(py.min())
+        w, h = sprite.get_size()
+        return pygame.Rect(x0, y0, int(px.max()) - x0 + w, int(py.max()) - y0 + h).clip(surf.get_rect())
+
+def main():
+    import os
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+
+    ap = argparse.ArgumentParser(description="Headless swarm frame-time check (step + draw).")
+    ap.add_argument("--agents", type=int, default=4000)
+    ap.add_argument("--frames", type=int, default=600)
+    args = ap.parse_args()
+
+    cfg = Config()
+    pygame.init()
+    screen = pygame.display.set_mode((cfg.WIDTH, cfg.HEIGHT))
+    target = Target(cfg)
+    swarm = Swarm(cfg, target, args.agents)
+    dt = cfg.PHYSICS_DT
+    per_frame = max(1, round(cfg.PHYSICS_HZ / cfg.FPS))
+    step_t = draw_t = 0.0
+    for k in range(args.frames):
+        t0 = time.perf_counter()
+        for _ in range(per_frame):
+            target.step(dt, math.cos(k * 0.01), math.sin(k * 0.013))
+            swarm.step(dt)
+        t1 = time.perf_counter()
+        screen.fill(cfg.BLACK)
+        swarm.draw(screen, *swarm.positions)
+        draw_t += time.perf_counter() - t1
+        step_t += t1 - t0
+    pygame.quit()
+    ms = 1e3 / args.frames
+    print(f"{args.agents} agents, {per_frame} steps/frame: step {step_t * ms:.2f} ms, draw {draw_t * ms:.2f} ms, "
+          f"frame {(step_t + draw_t) * ms:.2f} ms (budget {1e3 / cfg.FPS:.1f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""Parallel parameter sweeps over Config fields with invariant-based early stopping.
+
+Each grid point runs headless on a process pool for a few seeds of a random
+target script. A run stops as soon as it breaks an invariant (stuck against a
+wall/corner too long, escaping the box, non-finite state) and the remaining
+seeds of that grid point are skipped. Per-run metrics are streamed to CSV as
+they arrive, or to Parquet row groups when the output ends in .parquet and
+pyarrow is installed.
+
+    python -m Simulation.sweep --param ORBIT_RADIUS=80:200:7 --param TANGENTIAL_SPEED=150,300,450
+    python -m Simulation.sweep --backend phys --param DRAG=2:8:4 --param RESTITUTION=0.1,0.25,0.5
+"""
+import argparse
+import csv
+import dataclasses
+import itertools
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Iterator
+
+from .config import Config
+from .headless import HeadlessSim, RandomWalk
+
+@dataclasses.dataclass
+class Limits:
+    """Invariants a run must keep; breaking one ends it early."""
+    seconds: float = 60.0
+    max_glide_time: float = 2.0     # longest continuous WALL_GLIDE / wall contact
+    escape_tol: float = 1.0         # px beyond the SAFETY_MARGIN box (plus body radius for phys)
+    p_dive: float = 0.01
+    p_flip: float = 0.002
+
+def config_class(backend: str):
+    if backend == "kinematic":
+        return Config
+    if backend == "phys":
+        from .all_in_one.phys_sim import Config as PhysConfig
+        return PhysConfig
+    raise ValueError(f"unknown backend {backend!r}")
+
+def parse_range(spec: str, field_type) -> list:
+    """'a:b:n' -> n evenly spaced values from a to b; 'v1,v2,...' -> that list."""
+    cast = int if field_type in (int, "int") else float
+    if ":" in spec:
+        a, b, n = spec.split(":")
+        n = int(n)
+        if n < 1:
+            raise ValueError(f"bad range {spec!r}")
+        vals = [float(a) + (float(b) - float(a)) * k / max(n - 1, 1) for k in range(n)]
+        return [cast(round(v)) if cast is int else v for v in vals]
+    return [cast(v) for v in spec.split(",")]
+
+def build_grid(backend: str, params: list[str]) -> list[dict[str, Any]]:
+    fields = {f.name: f.type for f in dataclasses.fields(config_class(backend))}
+    axes = []
+    for p in params:
+        name, _, spec = p.partition("=")
+        if name not in fields:
+            raise ValueError(f"{name!r} is not a {backend} Config field")
+        axes.append([(name, v) for v in parse_range(spec, fields[name])])
+    return [dict(combo) for combo in itertools.product(*axes)]
+
+# ---- single runs (executed in worker processes) ----
+
+def _run_kinematic(cfg: Config, seed: int, lim: Limits) -> dict[str, Any]:
+    sim = HeadlessSim(cfg, script=RandomWalk(seed, p_dive=lim.p_dive, p_flip=lim.p_flip))
+    agent, dt = sim.agent, sim.dt
+    left, right = cfg.SAFETY_MARGIN - lim.escape_tol, cfg.WIDTH - cfg.SAFETY_MARGIN + lim.escape_tol
+    top, bottom = cfg.SAFETY_MARGIN - lim.escape_tol, cfg.HEIGHT - cfg.SAFETY_MARGIN + lim.escape_tol
+    n_steps = int(lim.seconds / dt)
+
+    glide_run = glide_total = glide_max = 0.0
+    glide_entries = bounces = 0
+    max_r_err = max_step = 0.0
+    status = "ok"
+    px, py = agent.gx, agent.gy
+    for _ in range(n_steps):
+        state, direction = agent.state, agent.orbit_direction
+        cmd = sim.script(sim.steps)
+        sim.step(cmd)
+        if cmd.flip:
+            direction = -direction
+
+        if agent.state == "WALL_GLIDE":
+            glide_entries += state != "WALL_GLIDE"
+            glide_run += dt
+            glide_total += dt
+            glide_max = max(glide_max, glide_run)
+        else:
+            glide_run = 0.0
+            bounces += agent.orbit_direction != direction
+            if agent.state == "ORBIT":
+                max_r_err = max(max_r_err, abs(agent.radial_distance - cfg.ORBIT_RADIUS))
+        max_step = max(max_step, math.hypot(agent.gx - px, agent.gy - py))
+        px, py = agent.gx, agent.gy
+
+        if not (math.isfinite(px) and math.isfinite(py)):
+            status = "violated:nonfinite"
+        elif not (left <= px <= right and top <= py <= bottom):
+            status = "violated:escaped_box"
+        elif glide_run > lim.max_glide_time:
+            status = "violated:stuck_wall_glide"
+        if status != "ok":
+            break
+
+    return {"status": status, "sim_time": sim.time, "steps": sim.steps, "dives": agent.dive_count,
+            "bounces": bounces, "glide_entries": glide_entries, "glide_time": glide_total,
+            "max_glide_run": glide_max, "max_orbit_r_err": max_r_err, "max_step_disp": max_step}
+
+def _run_phys(cfg, seed: int, lim: Limits) -> dict[str, Any]:
+    from .all_in_one.phys_sim import Robot, Target, norm, resolve_dynamic_collision
+
+    target = Target(cfg)
+    robot = Robot(cfg, target)
+    script = RandomWalk(seed, p_dive=lim.p_dive, p_flip=lim.p_flip)
+    dt = cfg.PHYSICS_DT
+    body = robot.body
+    pad = lim.escape_tol - body.r
+    left, right = cfg.SAFETY_MARGIN - pad, cfg.WIDTH - cfg.SAFETY_MARGIN + pad
+    top, bottom = cfg.SAFETY_MARGIN - pad, cfg.HEIGHT - cfg.SAFETY_MARGIN + pad
+    n_steps = int(lim.seconds / dt)
+
+    contact_run = contact_max = stun_time = 0.0
+    wall_hits = target_hits = 0
+    max_r_err = 0.0
+    status = "ok"
+    steps = 0
+    for steps in range(1, n_steps + 1):
+        cmd = script(steps - 1)
+        if cmd.dive:
+            robot.command_dive()
+        if cmd.flip:
+            robot.flip_orbit()
+        target.step(dt, cmd.ix, cmd.iy)
+        swept_wall, swept_target = robot.integrate(dt)
+        hit_wall = robot.resolve_walls() or swept_wall
+        hit_target = resolve_dynamic_collision(body, target.body, e=cfg.RESTITUTION, mu=cfg.FRICTION,
+                                               beta=cfg.BETA, slop=cfg.SLOP) or swept_target
+        robot.after_contacts(hit_wall or hit_target)
+
+        wall_hits += hit_wall
+        target_hits += hit_target
+        stun_time += dt if robot.stun > 0 else 0.0
+        touching = (body.x - body.r < cfg.SAFETY_MARGIN or body.x + body.r > cfg.WIDTH - cfg.SAFETY_MARGIN or
+                    body.y - body.r < cfg.SAFETY_MARGIN or body.y + body.r > cfg.HEIGHT - cfg.SAFETY_MARGIN)
+        contact_run = contact_run + dt if touching else 0.0
+        contact_max = max(contact_max, contact_run)
+        if robot.state == "ORBIT":
+            _, r_now = norm(body.x - target.body.x, body.y - target.body.y)
+            max_r_err = max(max_r_err, abs(r_now - cfg.ORBIT_RADIUS))
+
+        if not (math.isfinite(body.x) and math.isfinite(body.y)):
+            status = "violated:nonfinite"
+        elif not (left <= body.x <= right and top <= body.y <= bottom):
+            status = "violated:escaped_box"
+        elif contact_run > lim.max_glide_time:
+            status = "violated:stuck_on_wall"
+        if status != "ok":
+            break
+
+    return {"status": status, "sim_time": steps * dt, "steps": steps, "dives": robot.dives,
+            "wall_hits": wall_hits, "target_hits": target_hits, "stun_time": stun_time,
+            "max_contact_run": contact_max, "max_orbit_r_err": max_r_err}
+
+def run_point(backend: str, overrides: dict[str, Any], seeds: list[int], lim: Limits) -> list[dict[str, Any]]:
+    """All seeds of one grid point; stops at the first seed that breaks an invariant."""
+    cfg = dataclasses.replace(config_class(backend)(), **overrides)
+    runner = _run_kinematic if backend == "kinematic" else _run_phys
+    rows = []
+    for seed in seeds:
+        t0 = time.perf_counter()
+        metrics = runner(cfg, seed, lim)
+        rows.append({**overrides, "seed": seed, **metrics, "wall_time": time.perf_counter() - t0})
+        if metrics["status"] != "ok":
+            break
+    return rows
+
+# ---- results sinks ----
+
+class CsvSink:
+    def __init__(self, path: str, columns: list[str]):
+        self.f = open(path, "w", newline="")
+        self.w = csv.DictWriter(self.f, fieldnames=columns, extrasaction="ignore")
+        self.w.writeheader()
+
+    def write(self, rows: list[dict[str, Any]]):
+        self.w.writerows(rows)
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+class ParquetSink:
+    """Streams row groups with pyarrow (optional dependency)."""
+
+    def __init__(self, path: str, columns: list[str], batch: int = 256):
+        import pyarrow.parquet  # noqa: F401  (fail early if missing)
+        self.path, self.columns, self.batch = path, columns, batch
+        self.pending: list[dict[str, Any]] = []
+        self.writer = None
+
+    def write(self, rows: list[dict[str, Any]]):
+        self.pending.extend(rows)
+        if len(self.pending) >= self.batch:
+            self._flush()
+
+    def _flush(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if not self.pending:
+            return
+        table = pa.table({c: [r.get(c) for r in self.pending] for c in self.columns})
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+        self.pending = []
+
+    def close(self):
+        self._flush()
+        if self.writer is not None:
+            self.writer.close()
+
+KINEMATIC_METRICS = ["status", "sim_time", "steps", "dives", "bounces", "glide_entries", "glide_time",
+                     "max_glide_run", "max_orbit_r_err", "max_step_disp", "wall_time"]
+PHYS_METRICS = ["status", "sim_time", "steps", "dives", "wall_hits", "target_hits", "stun_time",
+                "max_contact_run", "max_orbit_r_err", "wall_time"]
+
+def sweep(backend: str, grid: list[dict[str, Any]], seeds: list[int], lim: Limits, out: str,
+          workers: int | None = None) -> Iterator[list[dict[str, Any]]]:
+    """Run the grid on a process pool, streaming rows to `out`; yields each grid point's rows."""
+    params = list(grid[0].keys()) if grid else []
+    columns = params + ["seed"] + (KINEMATIC_METRICS if backend == "kinematic" else PHYS_METRICS)
+    sink = ParquetSink(out, columns) if out.endswith(".parquet") else CsvSink(out, columns)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_point, backend, point, seeds, lim) for point in grid]
+            for fut in as_completed(futures):
+                rows = fut.result()
+                sink.write(rows)
+                yield rows
+    finally:
+        sink.close()
+
+def main():
+    ap = argparse.ArgumentParser(description="Parallel Config parameter sweep with early stopping.")
+    ap.add_argument("--backend", choices=("kinematic", "phys"), default="kinematic")
+    ap.add_argument("--param", action="append", default=[], metavar="FIELD=a:b:n|v1,v2",
+                    help="Config field range; repeat for a grid")
+    ap.add_argument("--seeds", type=int, default=3)
+    ap.add_argument("--seconds", type=float, default=60.0)
+    ap.add_argument("--max-glide-time", type=float, default=2.0)
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    ap.add_argument("--out", default="sweep_results.csv")
+    args = ap.parse_args()
+
+    grid = build_grid(args.backend, args.param) if args.param else [{}]
+    lim = Limits(seconds=args.seconds, max_glide_time=args.max_glide_time)
+    t0 = time.perf_counter()
+    n_runs = n_bad = 0
+    for k, rows in enumerate(sweep(args.backend, grid, list(range(args.seeds)), lim, args.out, args.workers), 1):
+        n_runs += len(rows)
+        bad = rows[-1]["status"] != "ok"
+        n_bad += bad
+        point = " ".join(f"{key}={rows[0][key]}" for key in grid[0])
+        print(f"[{k}/{len(grid)}] {point}  {rows[-1]['status']}" + ("  (dropped)" if bad else ""))
+    print(f"{len(grid)} points, {n_runs} runs, {n_bad} dropped early, "
+          f"{time.perf_counter() - t0:.1f}s -> {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""Headless tournament: rank bot policies on scripted target behaviours with Game v0 scoring.
+
+    python -m Simulation.tournament --policy idle --policy starter --policy random:0.02 \\
+        --policy planner:2 --policy linear:bot.npz --scenario all --seeds 4 --seconds 30
+
+A match is one policy driving one OrbitingAgent for `seconds` against one
+target scenario and seed, acting once per frame like `Game(policy=...)`.
+Matches go to a process pool in chunks; each worker builds a policy once per
+spec and keeps it warm for every later match, reset (and, for random bots,
+reseeded from the match seed) before each one. Chunks are folded in schedule
+order as soon as all earlier ones have arrived, so a fixed schedule gives the
+same ratings whatever the worker count or completion order (time-budgeted
+policies like the planner aside):
+
+- Game v0 score (README: Game plan): +1 per second in the orbit band, +HIT per
+  dive that reaches the target, MISS per dive that ends without reaching it,
+  GLIDE per WALL_GLIDE entry.
+- Elo: two policies that played the same (scenario, seed) are a game, won by
+  the higher score; ratings update the moment the second result lands.
+"""
+import argparse
+import csv
+import dataclasses
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any
+
+import numpy as np
+
+from .config import Config
+from .entities import OrbitingAgent, Target
+from .headless import IDLE, Command, Hold, RandomWalk
+
+@dataclasses.dataclass
+class Scoring:
+    band: float = 10.0        # |r - R| <= band counts as in the orbit band
+    per_second: float = 1.0
+    hit: float = 5.0
+    miss: float = -2.0
+    glide: float = -3.0
+
+# ---- target scenarios ----
+
+class Circle:
+    """Target drives a circle of period `period` seconds."""
+
+    def __init__(self, seed: int, dt: float, period: float = 6.0):
+        self.w = 2 * math.pi * dt / period
+        self.phase = random.Random(seed).uniform(0, 2 * math.pi)
+
+    def __call__(self, i: int) -> Command:
+        a = self.phase + self.w * i
+        return Command(math.cos(a), math.sin(a))
+
+class CornerPush:
+    """Target runs for a random corner, switching every `hold` seconds."""
+
+    def __init__(self, seed: int, dt: float, hold: float = 2.5):
+        self.rng = random.Random(seed)
+        self.hold = max(1, round(hold / dt))
+        self.cmd = IDLE
+
+    def __call__(self, i: int) -> Command:
+        if i % self.hold == 0:
+            self.cmd = Command(self.rng.choice((-1, 1)), self.rng.choice((-1, 1)))
+        return self.cmd
+
+class Zigzag:
+    """Target sweeps left and right, drifting vertically at random."""
+
+    def __init__(self, seed: int, dt: float, hold: float = 1.5):
+        self.rng = random.Random(seed)
+        self.hold = max(1, round(hold / dt))
+        self.cmd = IDLE
+
+    def __call__(self, i: int) -> Command:
+        if i % self.hold == 0:
+            self.cmd = Command(1 if (i // self.hold) % 2 else -1, self.rng.choice((-1, 0, 1)) * 0.5)
+        return self.cmd
+
+SCENARIOS = {
+    "still": lambda seed, dt: Hold(),
+    "random": lambda seed, dt: RandomWalk(seed, hold=max(1, round(0.5 / dt))),
+    "circle": Circle,
+    "corners": CornerPush,
+    "zigzag": Zigzag,
+}
+
+# ---- policies ----
+
+class RandomBot:
+    """Dives/flips at random, `p` per frame each."""
+
+    def __init__(self, p: float, seed: int = 0):
+        self.p = p
+        self.rng = random.Random()
+        self.reset(seed)
+
+    def reset(self, seed: int = 0):
+        """Reseed from the match seed (salted, so it doesn't replay the target script's stream)."""
+        self.rng.seed(f"random-bot:{seed}")
+
+    def choose_agent(self, agent) -> int:
+        from .env import DIVE, FLIP_DIR, KEEP
+        u = self.rng.random()
+        return DIVE if u < self.p else FLIP_DIR if u < 2 * self.p else KEEP
+
+    def act_agent(self, agent) -> int:
+        from .env import DIVE, FLIP_DIR
+        action = self.choose_agent(agent)
+        if action == DIVE:
+            agent.trigger_dive()
+        elif action == FLIP_DIR:
+            agent.flip_orbit_dir()
+        return action
+
+class IdleBot:
+    def choose_agent(self, agent) -> int:
+        return 0
+
+    def act_agent(self, agent) -> int:
+        return 0
+
+def make_policy(spec: str, cfg: Config):
+    """'idle' | 'starter' | 'random:P' | 'planner:MS' | 'linear:PATH.npz'."""
+    kind, _, arg = spec.partition(":")
+    if kind == "idle":
+        return IdleBot()
+    if kind == "starter":
+        from .policy import StarterBot
+        return StarterBot(cfg)
+    if kind == "random":
+        return RandomBot(float(arg or 0.01))
+    if kind == "planner":
+        from .planner import RolloutPlanner
+        return RolloutPlanner(cfg, budget_ms=float(arg or 2.0))
+    if kind == "linear":
+        from .policy import LinearPolicy, PolicyHook
+        return PolicyHook(LinearPolicy.load(arg), cfg)
+    raise ValueError(f"unknown policy spec {spec!r}")
+
+# ---- matches (executed in worker processes) ----
+
+_WARM: dict[str, Any] = {}  # per-worker policies by spec, built on first use
+
+def _policy(spec: str, cfg: Config):
+    if spec not in _WARM:
+        _WARM[spec] = make_policy(spec, cfg)
+    return _WARM[spec]
+
+def play(spec: str, scenario: str, seed: int, seconds: float, scoring: Scoring) -> dict[str, Any]:
+    """One match; returns its score and counters."""
+    cfg = Config()
+    policy = _policy(spec, cfg)
+    # Warm policy, fresh match: no cooldown, target history or RNG state carried over.
+    if isinstance(policy, RandomBot):
+        policy.reset(seed)
+    elif hasattr(policy, "reset"):
+        policy.reset()
+    agent = OrbitingAgent(cfg, Target(cfg))
+    script = SCENARIOS[scenario](seed, cfg.PHYSICS_DT)
+    dt = cfg.PHYSICS_DT
+    substeps = max(1, round(cfg.PHYSICS_HZ / cfg.FPS))
+    band_time = 0.0
+    hits = misses = glides = 0
+    diving = False
+    step = 0
+    for _ in range(round(seconds * cfg.FPS)):
+        policy.act_agent(agent)
+        for _ in range(substeps):
+            cmd = script(step)
+            step += 1
+            before = agent.state
+            agent.target.step(dt, cmd.ix, cmd.iy)
+            agent.update(dt)
+            state = agent.state
+            if state == "INWARD" or before == "INWARD":
+                diving = True
+            if before == "INWARD" and state == "OUTWARD":
+                hits += 1
+                diving = False
+            elif diving and state in ("ORBIT", "WALL_GLIDE") and before != "OUTWARD":
+                misses += 1
+                diving = False
+            elif state == "ORBIT":
+                diving = False
+            glides += state == "WALL_GLIDE" and before != "WALL_GLIDE"
+            if state == "ORBIT" and abs(agent.radial_distance - cfg.ORBIT_RADIUS) <= scoring.band:
+                band_time += dt
+    score = (scoring.per_second * band_time + scoring.hit * hits + scoring.miss * misses + scoring.glide * glides)
+    return {"policy": spec, "scenario": scenario, "seed": seed, "score": score, "band_time": band_time,
+            "hits": hits, "misses": misses, "glides": glides}
+
+def play_chunk(matches: list[tuple[str, str, int]], seconds: float, scoring: Scoring) -> list[dict[str, Any]]:
+    rows = []
+    for spec, scenario, seed in matches:
+        t0 = time.perf_counter()
+        row = play(spec, scenario, seed, seconds, scoring)
+        row["wall_time"] = time.perf_counter() - t0
+        rows.append(row)
+    return rows
+
+# ---- ratings (main process) ----
+
+class Ratings:
+    """Elo from head-to-head results on identical (scenario, seed) conditions, plus score statistics."""
+
+    def __init__(self, policies: list[str], k: float = 16.0, base: float = 1500.0):
+        self.k = k
+        self.elo = dict.fromkeys(policies, base)
+        self.games = dict.fromkeys(policies, 0)
+        self.scores: dict[str, list[float]] = {p: [] for p in policies}
+        self._by_key: dict[tuple[str, int], dict[str, float]] = {}
+
+    def add(self, row: dict[str, Any]):
+        p, score = row["policy"], row["score"]
+        self.scores[p].append(score)
+        played = self._by_key.setdefault((row["scenario"], row["seed"]), {})
+        for q, other in played.items():
+            expect = 1.0 / (1.0 + 10 ** ((self.elo[q] - self.elo[p]) / 400.0))
+            result = 1.0 if score > other else 0.0 if score < other else 0.5
+            delta = self.k * (result - expect)
+            self.elo[p] += delta
+            self.elo[q] -= delta
+            self.games[p] += 1
+            self.games[q] += 1
+        played[p] = score
+
+    def table(self) -> list[tuple[str, float, float, float, int]]:
+        """(policy, elo, mean score, std error, matches), best first."""
+        rows = []
+        for p, elo in self.elo.items():
+            s = np.asarray(self.scores[p])
+            se = float(s.std(ddof=1) / math.sqrt(len(s))) if len(s) > 1 else float("nan")
+            rows.append((p, elo, float(s.mean()) if len(s) else float("nan"), se, len(s)))
+        return sorted(rows, key=lambda r: -r[1])
+
+def schedule(policies: list[str], scenarios: list[str], seeds: int, chunk: int) -> list[list[tuple[str, str, int]]]:
+    """Matches in chunks; seed-major so every (scenario, seed) completes for all policies early."""
+    matches = [(p, sc, seed) for seed in range(seeds) for sc in scenarios for p in policies]
+    return [matches[i:i + chunk] for i in range(0, len(matches), chunk)]
+
+def run(policies: list[str], scenarios: list[str], seeds: int, seconds: float, scoring: Scoring,
+        workers: int | None = None, chunk: int = 4, out: str | None = None, on_result=None) -> Ratings:
+    ratings = Ratings(policies)
+    f = writer = None
+    if out:
+        f = open(out, "w", newline="")
+        writer = csv.DictWriter(f, fieldnames=["policy", "scenario", "seed", "score", "band_time", "hits", "misses",
+                                               "glides", "wall_time"])
+        writer.writeheader()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(play_chunk, c, seconds, scoring): i
+                       for i, c in enumerate(schedule(policies, scenarios, seeds, chunk))}
+            done: dict[int, list[dict[str, Any]]] = {}
+            next_chunk = 0
+            for fut in as_completed(futures):
+                done[futures[fut]] = fut.result()
+                if next_chunk not in done:
+                    continue  # Elo is order-dependent: wait for the earlier chunks
+                while next_chunk in done:
+                    for row in done.pop(next_chunk):
+                        ratings.add(row)
+                        if writer:
+                            writer.writerow(row)
+                    next_chunk += 1
+                if f:
+                    f.flush()
+                if on_result:
+                    on_result(ratings)
+    finally:
+        if f:
+            f.close()
+    return ratings
+
+def main():
+    ap = argparse.ArgumentParser(description="Rank bot policies against scripted target scenarios.")
+    ap.add_argument("--policy", action="append", default=[], metavar="SPEC",
+                    help="idle | starter | random:P | planner:MS | linear:PATH.npz; repeat")
+    ap.add_argument("--scenario", action="append", default=[], metavar="NAME",
+                    help=f"one of {', '.join(SCENARIOS)} or 'all'; repeat")
+    ap.add_argument("--seeds", type=int, default=4)
+    ap.add_argument("--seconds", type=float, default=30.0)
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    ap.add_argument("--chunk", type=int, default=4, help="matches per task sent to a worker")
+    ap.add_argument("--out", help="per-match CSV")
+    args = ap.parse_args()
+
+    policies = args.policy or ["idle", "starter", "random:0.02"]
+    scenarios = list(SCENARIOS) if not args.scenario or "all" in args.scenario else args.scenario
+    total = len(policies) * len(scenarios) * args.seeds
+    t0 = time.perf_counter()
+
+    def progress(r: Ratings):
+        done = sum(len(s) for s in r.scores.values())
+        lead = max(r.elo, key=r.elo.get)
+        print(f"\r{done}/{total} matches  leader {lead} ({r.elo[lead]:.0f})", end="", flush=True)
+
+    ratings = run(policies, scenarios, args.seeds, args.seconds, Scoring(), args.workers, args.chunk, args.out,
+                  progress)
+    print(f"\n{total} matches in {time.perf_counter() - t0:.1f}s\n")
+    print(f"{'policy':24s} {'elo':>7s} {'score':>8s} {'± se':>6s} {'n':>4s}")
+    for p, elo, mean, se, n in ratings.table():
+        print(f"{p:24s} {elo:7.0f} {mean:8.1f} {se:6.1f} {n:4d}")
+
+if __name__ == "__main__":
+    main()
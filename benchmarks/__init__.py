@@ -0,0 +1 @@
+"""Micro-benchmarks for the simulation hot paths (python -m benchmarks.hot_paths)."""
@@ -0,0 +1,275 @@
+"""Steps/sec and per-call latency for the update-loop hot paths, checked against a stored baseline.
+
+    python -m benchmarks.hot_paths                      # run, write bench_results.json, compare to baseline
+    python -m benchmarks.hot_paths --save-baseline      # refresh benchmarks/baseline.json
+    python -m benchmarks.hot_paths --only orbit --threshold 0.15
+
+Each case is timed `--repeat` times over `--calls` calls; the best run is the
+reported figure (least scheduler noise). A case regresses when its best
+ns/call exceeds the baseline by more than `--threshold`; the exit code is then 1.
+The `regime` field records how much of the run was actually spent in the
+state the case is meant to exercise, so a behaviour change that silently
+moves a case out of its regime is visible too.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+from Simulation.config import Config
+from Simulation.entities import OrbitingAgent, Target
+from Simulation.headless import RandomWalk
+from Simulation.utils import normalize, reflect_point
+from Simulation.all_in_one import phys_sim
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+# name -> factory returning (op, regime_probe); op(n) performs n calls, regime_probe() -> fraction in regime
+CASES: dict[str, Callable[[], tuple[Callable[[int], None], Callable[[], float]]]] = {}
+
+def case(name: str):
+    def register(fn):
+        CASES[name] = fn
+        return fn
+    return register
+
+def _always() -> float:
+    return 1.0
+
+# ---- utils ----
+
+@case("utils.normalize")
+def _normalize():
+    def op(n):
+        for i in range(n):
+            normalize(3.0 + i, 4.0)
+    return op, _always
+
+@case("utils.reflect_point")
+def _reflect():
+    def op(n):
+        for _ in range(n):
+            reflect_point(-3.0, 250.0, left=12, right=788, top=12, bottom=588)
+    return op, _always
+
+# ---- regime replay ----
+#
+# Bounces, corner glides and contacts are rare per step in free play, so the
+# update cases first record pre-step snapshots whose step lands in the regime
+# (driving the target with a RandomWalk script), then time update() replayed
+# from those snapshots in a cycle. Restoring a snapshot is a few dict.update
+# calls and is included in every update case alike.
+
+def _snapshot(objs) -> list[dict]:
+    return [dict(o.__dict__) for o in objs]
+
+def _replay_case(objs, prepare, step, in_regime, n_states: int = 256, search: int = 400_000):
+    """prepare(k) applies step k's scripted input, step() is the timed call, in_regime() is checked after it."""
+    snaps = []
+    for k in range(search):
+        prepare(k)
+        snap = _snapshot(objs)
+        step()
+        if in_regime():
+            snaps.append(snap)
+            if len(snaps) == n_states:
+                break
+    if not snaps:
+        raise RuntimeError("regime never reached while recording states")
+    counts = {"hit": 0, "total": 0}
+    dicts = [o.__dict__ for o in objs]
+
+    def op(n):
+        hit = 0
+        m = len(snaps)
+        for i in range(n):
+            for d, saved in zip(dicts, snaps[i % m]):
+                d.update(saved)
+            step()
+            hit += in_regime()
+        counts["hit"] += hit
+        counts["total"] += n
+
+    return op, lambda: counts["hit"] / max(counts["total"], 1)
+
+def _agent_case(regime: str, dive: bool = False, hold: int = 240):
+    """regime is a state name, or BOUNCE for steps where a wall reversed the sweep."""
+    cfg = Config()
+    script = RandomWalk(0, hold=hold, p_dive=0.02 if dive else 0.0)
+    target = Target(cfg)
+    agent = OrbitingAgent(cfg, target)
+    dt = cfg.PHYSICS_DT
+    before = {"dir": agent.orbit_direction, "state": agent.state}
+
+    def prepare(k):
+        cmd = script(k)
+        if cmd.dive:
+            agent.trigger_dive()
+        target.step(dt, cmd.ix, cmd.iy)
+
+    def step():
+        before["dir"], before["state"] = agent.orbit_direction, agent.state
+        agent.update(dt)
+
+    def in_regime() -> bool:
+        if regime == "BOUNCE":
+            return agent.orbit_direction != before["dir"] and agent.state != "WALL_GLIDE"
+        if regime == "ORBIT":
+            return agent.state == "ORBIT" and agent.orbit_direction == before["dir"]
+        if regime == "DIVE":
+            return agent.state in ("INWARD", "OUTWARD")
+        return agent.state == regime
+
+    return _replay_case([agent, target], prepare, step, in_regime)
+
+@case("OrbitingAgent.update/free_orbit")
+def _free_orbit():
+    return _agent_case("ORBIT")
+
+@case("OrbitingAgent.update/wall_bounce")
+def _wall_bounce():
+    return _agent_case("BOUNCE")
+
+@case("OrbitingAgent.update/corner_glide")
+def _corner_glide():
+    return _agent_case("WALL_GLIDE")
+
+@case("OrbitingAgent.update/dive_cycles")
+def _dive_cycles():
+    return _agent_case("DIVE", dive=True)
+
+# ---- phys_sim ----
+
+def _robot(tx: float, ty: float) -> tuple[phys_sim.Robot, float]:
+    cfg = phys_sim.Config()
+    target = phys_sim.Target(cfg)
+    target.body.x, target.body.y = tx, ty
+    robot = phys_sim.Robot(cfg, target)
+    robot.body.x, robot.body.y = tx + cfg.ORBIT_RADIUS, ty
+    return robot, cfg.PHYSICS_DT
+
+@case("phys.orbit_dive_force")
+def _force():
+    robot, _ = _robot(450.0, 325.0)
+    cfg = robot.cfg
+
+    def op(n):
+        body, tbody = robot.body, robot.target.body
+        for _ in range(n):
+            phys_sim.orbit_dive_force(body, tbody, "ORBIT", 1, cfg.ORBIT_RADIUS, cfg.TANGENTIAL_SPEED,
+                                      k_pr=cfg.K_PR, k_dr=cfg.K_DR, k_pt=cfg.K_PT, Fmax=cfg.FMAX)
+    return op, _always
+
+@case("phys.resolve_wall_collision/contact")
+def _walls():
+    cfg = phys_sim.Config()
+    m = cfg.SAFETY_MARGIN
+    body = phys_sim.Body(m + 2.0, 300.0, vx=-50.0, vy=20.0, r=cfg.DOT_RADIUS)
+
+    def op(n):
+        for _ in range(n):
+            body.x, body.vx, body.vy = m + 2.0, -50.0, 20.0
+            phys_sim.resolve_wall_collision(body, m, cfg.WIDTH - m, m, cfg.HEIGHT - m, e=cfg.RESTITUTION,
+                                            mu=cfg.FRICTION, beta=cfg.BETA, slop=cfg.SLOP)
+    return op, _always
+
+def _robot_case(tx: float, ty: float, stunned: bool):
+    robot, dt = _robot(tx, ty)
+
+    def step():
+        robot.update(dt)
+
+    def in_regime() -> bool:
+        return (robot.stun > 0) == stunned
+
+    return _replay_case([robot, robot.body, robot.target.body], lambda k: None, step, in_regime)
+
+@case("phys.Robot.update/free_orbit")
+def _robot_free():
+    return _robot_case(450.0, 325.0, stunned=False)
+
+@case("phys.Robot.update/stunned_contact")
+def _robot_stunned():
+    # Target pinned near a corner: the orbit keeps striking the walls.
+    return _robot_case(40.0, 40.0, stunned=True)
+
+# ---- runner ----
+
+def run_case(name: str, calls: int, repeat: int) -> dict:
+    op, regime = CASES[name]()
+    op(min(calls, 1000))  # warm-up, and settle into the regime
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        op(calls)
+        times.append(time.perf_counter() - t0)
+    best = min(times)
+    return {
+        "ns_per_call": best / calls * 1e9,
+        "median_ns_per_call": statistics.median(times) / calls * 1e9,
+        "calls_per_sec": calls / best,
+        "regime": round(regime(), 3),
+    }
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    failures = []
+    for name, base in baseline.get("results", {}).items():
+        cur = results.get(name)
+        if cur is None:
+            continue
+        ratio = cur["ns_per_call"] / base["ns_per_call"]
+        flag = "REGRESSION" if ratio > 1.0 + threshold else "ok"
+        print(f"  {name:40s} {base['ns_per_call']:10.0f} -> {cur['ns_per_call']:10.0f} ns  x{ratio:5.2f}  {flag}")
+        if flag != "ok":
+            failures.append(name)
+    return failures
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--calls", type=int, default=20_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--only", default="", help="substring filter on case names")
+    ap.add_argument("--out", default="bench_results.json")
+    ap.add_argument("--baseline", default=str(BASELINE))
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, as a fraction")
+    args = ap.parse_args(argv)
+
+    results = {}
+    for name in CASES:
+        if args.only and args.only not in name:
+            continue
+        res = run_case(name, args.calls, args.repeat)
+        results[name] = res
+        print(f"{name:42s} {res['ns_per_call']:10.0f} ns/call  {res['calls_per_sec']:12,.0f}/s  "
+              f"regime={res['regime']:.2f}")
+
+    doc = {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(),
+                 "platform": platform.platform(), "calls": args.calls, "repeat": args.repeat},
+        "results": results,
+    }
+    Path(args.out).write_text(json.dumps(doc, indent=2) + "\n")
+
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(doc, indent=2) + "\n")
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    base_path = Path(args.baseline)
+    if not base_path.exists():
+        print(f"no baseline at {base_path}; run with --save-baseline")
+        return 0
+    print(f"compare against {base_path} (threshold +{args.threshold:.0%}):")
+    failures = compare(results, json.loads(base_path.read_text()), args.threshold)
+    if failures:
+        print(f"{len(failures)} regression(s): {', '.join(failures)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Accuracy vs cost of the phys_sim integrators (Config.INTEGRATOR) across physics rates.
+
+    python -m benchmarks.integrators
+    python -m benchmarks.integrators --seconds 1.0 --hz 240,60,15
+
+Every run starts from the default orbit with no input. Error is the largest
+distance from a tight-tolerance rk45 reference at 240 Hz, sampled at each
+physics step; cost is controller evaluations per simulated second, from
+Robot.stats. The default controller slowly spirals onto the target after a
+couple of seconds, so keep --seconds short to compare free-orbit accuracy.
+
+The "dive" case commands a dive once per second for --dive-seconds, so the
+robot hits and then rests against the target: it measures contact handling
+(events, substeps, worst single step) rather than accuracy.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from Simulation.all_in_one.phys_sim import INTEGRATORS, Config, Robot, Target
+
+def trajectory(cfg: Config, seconds: float, dive_every: float = 0.0) -> tuple[Robot, np.ndarray]:
+    """(robot, rows of t, x, y, step wall time after every physics step); dives every dive_every seconds if > 0."""
+    robot = Robot(cfg, Target(cfg))
+    dt = cfg.PHYSICS_DT
+    every = round(dive_every / dt) if dive_every > 0 else 0
+    rows = np.empty((round(seconds / dt), 4))
+    for k in range(len(rows)):
+        if every and k % every == every - 1:
+            robot.command_dive()
+        t0 = time.perf_counter()
+        robot.update(dt)
+        rows[k] = ((k + 1) * dt, robot.body.x, robot.body.y, time.perf_counter() - t0)
+    return robot, rows
+
+def max_error(rows: np.ndarray, ref: np.ndarray) -> float:
+    x = np.interp(rows[:, 0], ref[:, 0], ref[:, 1])
+    y = np.interp(rows[:, 0], ref[:, 0], ref[:, 2])
+    return float(np.max(np.hypot(rows[:, 1] - x, rows[:, 2] - y)))
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--seconds", type=float, default=1.5)
+    ap.add_argument("--hz", default="240,120,60,30,15", help="comma-separated PHYSICS_HZ values")
+    ap.add_argument("--dive-seconds", type=float, default=6.0, help="length of the dive case (0 skips it)")
+    args = ap.parse_args()
+
+    _, ref = trajectory(Config(INTEGRATOR="rk45", RTOL=1e-10, ATOL=1e-8, PHYSICS_HZ=240), args.seconds)
+    print(f"{'integrator':10s} {'Hz':>5s} {'max err px':>11s} {'evals/s':>9s} {'substeps':>9s} "
+          f"{'rejected':>9s} {'events':>7s} {'wall ms':>8s}")
+    for name in INTEGRATORS:
+        for hz in (int(h) for h in args.hz.split(",")):
+            t0 = time.perf_counter()
+            robot, rows = trajectory(Config(INTEGRATOR=name, PHYSICS_HZ=hz), args.seconds)
+            wall = time.perf_counter() - t0
+            st = robot.stats
+            print(f"{name:10s} {hz:5d} {max_error(rows, ref):11.4f} {st.force_evals / args.seconds:9.0f} "
+                  f"{st.substeps:9d} {st.rejected:9d} {st.events:7d} {wall * 1e3:8.1f}")
+
+    if args.dive_seconds > 0:
+        print(f"\ndive once per second for {args.dive_seconds:g}s")
+        print(f"{'integrator':10s} {'Hz':>5s} {'dives':>6s} {'evals/s':>9s} {'substeps':>9s} "
+              f"{'events':>7s} {'worst step ms':>14s} {'wall ms':>8s}")
+        for name in INTEGRATORS:
+            for hz in (int(h) for h in args.hz.split(",")):
+                robot, rows = trajectory(Config(INTEGRATOR=name, PHYSICS_HZ=hz), args.dive_seconds, dive_every=1.0)
+                st = robot.stats
+                print(f"{name:10s} {hz:5d} {robot.dives:6d} {st.force_evals / args.dive_seconds:9.0f} "
+                      f"{st.substeps:9d} {st.events:7d} {rows[:, 3].max() * 1e3:14.2f} {rows[:, 3].sum() * 1e3:8.1f}")
+
+if __name__ == "__main__":
+    main()